@@ -3,36 +3,108 @@
 #
 # SPDX-License-Identifier: MIT
 
+import gzip
+import hashlib
 import json
 import logging
-from typing import List
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, FastAPI
+from fastapi import APIRouter, FastAPI, Request, Response, status
 from fastapi.openapi.utils import get_openapi
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover -- optional
+    brotli = None
 
 from repository_service_tuf_api import (
     __version__,
     settings,
     settings_repository,
 )
+from repository_service_tuf_api.admission import (
+    ADMISSION_CACHE_SECONDS,
+    queue_depth_sampler,
+)
 from repository_service_tuf_api.api.artifacts import router as artifacts_v1
 from repository_service_tuf_api.api.bootstrap import router as bootstrap_v1
 from repository_service_tuf_api.api.config import router as config_v1
 from repository_service_tuf_api.api.delegations import router as delegations_v1
 from repository_service_tuf_api.api.metadata import router as metadata_v1
 from repository_service_tuf_api.api.tasks import router as tasks_v1
+from repository_service_tuf_api.artifacts import artifacts_coalescer
+from repository_service_tuf_api.bootstrap import bootstrap_watcher
+from repository_service_tuf_api.idempotency import (
+    IdempotencyMiddleware,
+    register_idempotent_route,
+)
+from repository_service_tuf_api.metrics import (
+    MetricsMiddleware,
+    metrics,
+    register_route_template,
+)
+from repository_service_tuf_api.responses import default_response_class
+from repository_service_tuf_api.tasks import (
+    ARTIFACTS_INDEX_INTERVAL,
+    artifacts_indexer,
+)
+from repository_service_tuf_api.tracing import (
+    TracingMiddleware,
+    configure_tracing,
+)
 
 TITLE = "Repository Service for TUF API"
 DESCRITPTION = "Repository Service for TUF Rest API"
 DOCS_URL = "/"
 OPENAPI_VERSION = "3.0.0"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Any replica can take over the watch of a pending bootstrap
+    bootstrap_watcher.start()
+    if settings.get("ARTIFACTS_INDEX", False):
+        artifacts_indexer.start(
+            settings.get("ARTIFACTS_INDEX_INTERVAL", ARTIFACTS_INDEX_INTERVAL)
+        )
+    if (
+        settings.get("ADMISSION_QUEUE_SOFT_LIMIT", 0) > 0
+        or settings.get("ADMISSION_QUEUE_HARD_LIMIT", 0) > 0
+    ):
+        queue_depth_sampler.start(
+            settings.get("ADMISSION_CACHE_SECONDS", ADMISSION_CACHE_SECONDS)
+        )
+    # Generate the OpenAPI document before serving requests
+    openapi_document()
+    yield
+    # Send the artifacts of the accepted requests still being coalesced
+    await run_in_threadpool(artifacts_coalescer.flush)
+    await artifacts_indexer.stop()
+    bootstrap_watcher.stop()
+    queue_depth_sampler.stop()
+
+
 rstuf_app = FastAPI(
     title=TITLE,
     version=__version__.version,
     openapi_version=OPENAPI_VERSION,
     docs_url="/",
+    lifespan=lifespan,
+    default_response_class=default_response_class(
+        settings.get("ORJSON_RESPONSES", False)
+    ),
+)
+rstuf_app.add_middleware(IdempotencyMiddleware)
+rstuf_app.add_middleware(MetricsMiddleware)
+configure_tracing(
+    settings.get("OTEL_EXPORTER"),
+    settings.get("OTEL_EXPORTER_FILE", "rstuf-api-spans.json"),
 )
+rstuf_app.add_middleware(TracingMiddleware)
+rstuf_app.add_route("/metrics", metrics, include_in_schema=False)
 
 
 def _custom_openapi():  # pragma: no cover -- not used by RSTUF logic
@@ -52,9 +124,92 @@ def _custom_openapi():  # pragma: no cover -- not used by RSTUF logic
 rstuf_app.openapi = _custom_openapi
 
 
+@dataclass(frozen=True)
+class OpenAPIDocument:
+    # strong ETag and body by content coding (``identity``, ``gzip``, ``br``)
+    etags: Dict[str, str]
+    bodies: Dict[str, bytes]
+
+
+_openapi_document: Optional[OpenAPIDocument] = None
+
+
+def openapi_document() -> OpenAPIDocument:
+    """
+    OpenAPI document serialized and compressed once.
+    """
+    global _openapi_document
+    if _openapi_document is None:
+        body = json.dumps(
+            rstuf_app.openapi(), ensure_ascii=False, separators=(",", ":")
+        ).encode()
+        bodies = {"identity": body, "gzip": gzip.compress(body, mtime=0)}
+        if brotli is not None:  # pragma: no cover -- optional
+            bodies["br"] = brotli.compress(body)
+
+        digest = hashlib.sha256(body).hexdigest()
+        etags = {
+            coding: (
+                f'"{digest}"'
+                if coding == "identity"
+                else f'"{digest}-{coding}"'
+            )
+            for coding in bodies
+        }
+        _openapi_document = OpenAPIDocument(etags=etags, bodies=bodies)
+
+    return _openapi_document
+
+
+def _content_coding(accept_encoding: str, available: List[str]) -> str:
+    accepted = set()
+    for value in accept_encoding.split(","):
+        coding, _, params = value.partition(";")
+        if params.replace(" ", "").rstrip("0.") != "q=":
+            accepted.add(coding.strip().lower())
+
+    for coding in ["br", "gzip"]:
+        if coding in available and coding in accepted:
+            return coding
+
+    return "identity"
+
+
+async def openapi(request: Request) -> Response:
+    document = openapi_document()
+    coding = _content_coding(
+        request.headers.get("accept-encoding", ""), list(document.bodies)
+    )
+    headers = {"ETag": document.etags[coding], "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or document.etags[coding] in [
+        etag.strip() for etag in if_none_match.split(",")
+    ]:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+
+    return Response(
+        document.bodies[coding], media_type="application/json", headers=headers
+    )
+
+
+# Serve the precomputed OpenAPI document instead of the FastAPI default
+rstuf_app.router.routes = [
+    route
+    for route in rstuf_app.router.routes
+    if getattr(route, "path", None) != rstuf_app.openapi_url
+]
+rstuf_app.add_route(rstuf_app.openapi_url, openapi, include_in_schema=False)
+
+
 api_v1 = APIRouter(
     prefix="/api/v1",
     responses={404: {"description": "Not found"}},
+    default_response_class=rstuf_app.router.default_response_class,
 )
 
 v1_endpoints = [
@@ -89,6 +244,9 @@ def load_endpoints():
             )
         else:
             api_v1.include_router(v1_endpoint)
+            for endpoint_route in v1_endpoint.routes:
+                register_route_template(endpoint_route, api_v1.prefix)
+                register_idempotent_route(endpoint_route, api_v1.prefix)
 
     rstuf_app.include_router(api_v1)
 
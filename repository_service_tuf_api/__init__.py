@@ -5,13 +5,27 @@
 
 import logging
 import os
-from dataclasses import dataclass
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
-from celery import Celery
+import redis
+import redis.asyncio
+from celery import Celery, Task
 from dynaconf import Dynaconf
-from dynaconf.loaders import redis_loader
+from dynaconf.utils.parse_conf import parse_conf_data, unparse_conf_data
+from kombu import compression
+from kombu.utils import json as kombu_json
+
+from repository_service_tuf_api.metrics import CELERY_PUBLISH_DURATION
+from repository_service_tuf_api.redis_pool import RedisPoolConfig, RedisPools
+from repository_service_tuf_api.tracing import (
+    publish_span,
+    redis_span,
+    settings_read,
+)
 
 _log_level = getattr(
     logging,
@@ -34,13 +48,18 @@ class BootstrapState:
 
 settings = Dynaconf(envvar_prefix="RSTUF")
 
+REDIS_DB_REPO_SETTINGS: int = settings.get("REDIS_SERVER_DB_REPO_SETTINGS", 1)
+REDIS_DB_RESULT: int = settings.get("REDIS_SERVER_DB_RESULT", 0)
+
+# Redis connection pools shared by all the Redis clients
+redis_pools = RedisPools(RedisPoolConfig.from_settings(settings))
+
 settings_repository = Dynaconf(
     redis_enabled=True,
     redis={
-        "host": settings.REDIS_SERVER.split("redis://")[1],
-        "port": settings.get("REDIS_SERVER_PORT", 6379),
-        "db": settings.get("REDIS_SERVER_DB_REPO_SETTINGS", 1),
-        "decode_responses": True,
+        "connection_pool": redis_pools.pool(
+            REDIS_DB_REPO_SETTINGS, decode_responses=True
+        ),
     },
 )
 secrets_settings = Dynaconf(
@@ -51,10 +70,12 @@ secrets_settings = Dynaconf(
 # Celery setup
 celery = Celery(__name__)
 celery.conf.broker_url = settings.BROKER_SERVER
+# The Result Backend uses the ``redis_pools`` pool of the result DB
 celery.conf.result_backend = (
+    "repository_service_tuf_api.redis_pool:PooledRedisBackend+"
     f"{settings.REDIS_SERVER}"
     f":{settings.get('REDIS_SERVER_PORT', 6379)}"
-    f"/{settings.get('REDIS_SERVER_DB_RESULT', 0)}"
+    f"/{REDIS_DB_RESULT}"
 )
 celery.conf.accept_content = ["json", "application/json"]
 celery.conf.task_serializer = "json"
@@ -67,34 +88,459 @@ celery.conf.broker_pool_limit = None
 # celery.conf.broker_use_ssl
 # https://github.com/repository-service-tuf/repository-service-tuf-api/issues/91
 
+# Maximum priority of the task queues (RabbitMQ ``x-max-priority``), ``0`` if
+# the tasks priority is disabled
+task_queue_max_priority: int = settings.get("TASK_QUEUE_MAX_PRIORITY", 0)
+if task_queue_max_priority > 0:
+    celery.conf.task_queue_max_priority = task_queue_max_priority
+
+# Default priority of the tasks by action, higher is consumed first. The
+# signing and metadata tasks are not starved by the queued artifacts tasks.
+TASK_PRIORITIES: Dict[str, int] = {
+    "bootstrap": 9,
+    "sign_metadata": 9,
+    "delete_sign_metadata": 9,
+    "metadata_update": 8,
+    "force_online_metadata_update": 7,
+    "metadata_delegation": 6,
+    "update_settings": 6,
+    "add_artifacts": 3,
+    "remove_artifacts": 3,
+    "publish_artifacts": 1,
+}
+TASK_DEFAULT_PRIORITY = 5
+
+
+def task_priority(action: str) -> int:
+    """
+    Priority of a task by action, overridden by ``RSTUF_TASK_PRIORITIES``.
+    """
+    priorities = {**TASK_PRIORITIES, **settings.get("TASK_PRIORITIES", {})}
+
+    return min(
+        priorities.get(action, TASK_DEFAULT_PRIORITY), task_queue_max_priority
+    )
+
+
+def _broker_compression() -> Optional[str]:
+    method = settings.get("BROKER_COMPRESSION")
+    if not method:
+        return None
+
+    try:
+        compression.get_encoder(method)
+    except KeyError:
+        logging.error(f"Broker compression '{method}' not supported. Disabled")
+        return None
+
+    return method
+
+
+# Compression method of the broker messages (kombu), ``None`` if disabled
+broker_compression = _broker_compression()
+
+
+class BrokerTask(Task):
+    """
+    Task measuring and tracing the publish and compressing the large messages.
+
+    The publish time is observed in ``CELERY_PUBLISH_DURATION`` by the task
+    ``action``, and the trace context is injected in the message headers.
+
+    With ``RSTUF_TASK_QUEUE_MAX_PRIORITY``, the tasks are sent with the
+    ``action`` priority (see ``task_priority``).
+
+    The messages with serialized arguments of at least
+    ``RSTUF_BROKER_COMPRESSION_THRESHOLD`` bytes are compressed with the
+    ``RSTUF_BROKER_COMPRESSION`` method (e.g. ``zlib``). The workers
+    decompress the messages using the message ``compression`` header.
+    """
+
+    def apply_async(self, args=None, kwargs=None, **options):
+        if broker_compression is not None and "compression" not in options:
+            threshold = settings.get("BROKER_COMPRESSION_THRESHOLD", 1024)
+            if threshold <= 0 or (
+                len(kombu_json.dumps([args, kwargs])) >= threshold
+            ):
+                options["compression"] = broker_compression
+
+        action = (kwargs or {}).get("action", "unknown")
+        if task_queue_max_priority > 0 and "priority" not in options:
+            options["priority"] = task_priority(action)
+
+        with CELERY_PUBLISH_DURATION.labels(action=action).time():
+            with publish_span(self.name, action, options):
+                return super().apply_async(args, kwargs, **options)
+
+
+def settings_repository_async() -> redis.asyncio.Redis:
+    """
+    ``redis.asyncio`` client for the repository settings DB.
+    """
+    return redis_pools.async_client(
+        REDIS_DB_REPO_SETTINGS, decode_responses=True
+    )
+
+
+def result_backend_redis() -> redis.Redis:
+    """
+    Redis client for the Celery Result Backend DB.
+    """
+    return redis_pools.client(REDIS_DB_RESULT)
+
+
+def result_backend_async() -> redis.asyncio.Redis:
+    """
+    ``redis.asyncio`` client for the Celery Result Backend DB.
+    """
+    return redis_pools.async_client(REDIS_DB_RESULT)
+
+
+# Seconds to wait before trying to start again the bootstrap state cache
+# subscriber after a failure.
+BOOTSTRAP_STATE_CACHE_RETRY = 5
+# Keyspace events required by the bootstrap state cache: `K` keyspace channel,
+# `g` generic commands (DEL, EXPIRE, ...) and `h` hash commands (HSET, ...).
+KEYSPACE_EVENTS = "Kgh"
+
+
+def settings_repository_key() -> str:
+    """
+    Redis key (hash) where Dynaconf stores the repository settings.
+    """
+    prefix = settings_repository.get("ENVVAR_PREFIX_FOR_DYNACONF")
+    return f"{prefix}_{settings_repository.current_env}".upper()
+
+
+def settings_repository_redis() -> redis.Redis:
+    """
+    Redis client for the repository settings DB.
+    """
+    return redis_pools.client(REDIS_DB_REPO_SETTINGS, decode_responses=True)
+
+
+# Redis counter of the repository settings version, incremented by the
+# writers of the repository settings on every change.
+SETTINGS_VERSION_KEY = "RSTUF_SETTINGS_VERSION"
+
+
+def repository_settings_version() -> int:
+    """
+    Current repository settings version (``SETTINGS_VERSION_KEY``).
+    """
+    return int(settings_repository_redis().get(SETTINGS_VERSION_KEY) or 0)
+
 
-def pre_lock_bootstrap(task_id):
+@dataclass(frozen=True)
+class RepositorySettingsSnapshot:
+    """
+    Repository settings read from Redis at ``version``.
+
+    The values are parsed as the Dynaconf Redis loader does, by the upper
+    case setting name.
+    """
+
+    version: int
+    values: Dict[str, Any] = field(default_factory=dict)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.values.get(key.upper(), default)
+
+    @property
+    def bootstrap(self) -> Optional[str]:
+        return self.get("BOOTSTRAP")
+
+    @property
+    def targets_online_key(self) -> bool:
+        return self.get("TARGETS_ONLINE_KEY", True)
+
+    @property
+    def delegated_roles_names(self) -> Optional[List[str]]:
+        return self.get("DELEGATED_ROLES_NAMES")
+
+
+def _load_repository_settings() -> RepositorySettingsSnapshot:
+    # version and settings in one round trip (MULTI/EXEC)
+    pipeline = settings_repository_redis().pipeline()
+    pipeline.get(SETTINGS_VERSION_KEY)
+    pipeline.hgetall(settings_repository_key())
+    version, values = pipeline.execute()
+
+    return RepositorySettingsSnapshot(
+        version=int(version or 0),
+        values={
+            key: parse_conf_data(value, tomlfy=True)
+            for key, value in values.items()
+        },
+    )
+
+
+class RepositorySettingsCache:
+    """
+    Process-local ``RepositorySettingsSnapshot``, reused while the
+    ``SETTINGS_VERSION_KEY`` counter is unchanged.
+
+    It requires all the writers of the repository settings (including the
+    RSTUF Workers) to increment the counter.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[RepositorySettingsSnapshot] = None
+
+    def get(self) -> RepositorySettingsSnapshot:
+        version = repository_settings_version()
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        snapshot = _load_repository_settings()
+        with self._lock:
+            if (
+                self._snapshot is None
+                or snapshot.version >= self._snapshot.version
+            ):
+                self._snapshot = snapshot
+
+        return snapshot
+
+
+repository_settings_cache = RepositorySettingsCache()
+
+
+def repository_settings(read: str) -> RepositorySettingsSnapshot:
+    """
+    Snapshot of the repository settings.
+
+    Loads the settings with a single Redis round trip. When
+    ``RSTUF_SETTINGS_SNAPSHOT_CACHE`` is enabled, the snapshot is reused
+    across requests until the settings version changes.
+
+    Args:
+        read: name of the read, for the metrics and traces
+    """
+    with settings_read(read):
+        if settings.get("SETTINGS_SNAPSHOT_CACHE", False):
+            return repository_settings_cache.get()
+
+        return _load_repository_settings()
+
+
+# Sets ``BOOTSTRAP`` to ARGV[1] unless the bootstrap is locked: finished
+# (``<task_id>``), ``pre-<task_id>`` or ``signing-<task_id>``. Returns the
+# current value if locked. ARGV[2] is the Dynaconf representation of ``None``.
+# KEYS[2] is the settings version counter.
+_LOCK_BOOTSTRAP = """
+local current = redis.call("HGET", KEYS[1], "BOOTSTRAP")
+if current and current ~= ARGV[2] then
+    local _, dashes = string.gsub(current, "-", "")
+    local state = string.match(current, "^([^-]*)-")
+    if dashes == 0 or (
+        dashes == 1 and (state == "pre" or state == "signing")
+    ) then
+        return current
+    end
+end
+redis.call("HSET", KEYS[1], "BOOTSTRAP", ARGV[1])
+redis.call("INCR", KEYS[2])
+return false
+"""
+
+# Sets ``BOOTSTRAP`` to ARGV[1] if it is an intermediate state of the task
+# ARGV[2] (``<state>-<task_id>``), or unconditionally if ARGV[2] is empty.
+# KEYS[2] is the settings version counter.
+_RELEASE_BOOTSTRAP = """
+local current = redis.call("HGET", KEYS[1], "BOOTSTRAP")
+if ARGV[2] ~= "" then
+    local suffix = "-" .. ARGV[2]
+    if not current or string.sub(current, -#suffix) ~= suffix then
+        return 0
+    end
+end
+redis.call("HSET", KEYS[1], "BOOTSTRAP", ARGV[1])
+redis.call("INCR", KEYS[2])
+return 1
+"""
+
+
+class BootstrapStateCache:
+    """
+    Process-local cache of the ``BootstrapState``.
+
+    The cached state is only used while a subscriber is listening to the
+    Redis keyspace notifications of the repository settings. Any change in
+    the repository settings, by any API replica or RSTUF Worker, invalidates
+    it. If the subscriber is not listening, the cache is bypassed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: Optional[BootstrapState] = None
+        self._generation = 0
+        self._listening = False
+        self._thread: Optional[redis.client.PubSubWorkerThread] = None
+        self._next_start = 0.0
+
+    @property
+    def listening(self) -> bool:
+        return self._listening
+
+    def start(self) -> bool:
+        """
+        Start the keyspace notifications subscriber if not running.
+
+        Returns:
+            ``True`` if the subscriber is listening, otherwise ``False``.
+        """
+        if self._listening:
+            return True
+
+        with self._lock:
+            if self._listening:
+                return True
+            if time.monotonic() < self._next_start:
+                return False
+
+            self._next_start = time.monotonic() + BOOTSTRAP_STATE_CACHE_RETRY
+            try:
+                client = settings_repository_redis()
+                if not _enable_keyspace_events(client):
+                    return False
+
+                channel = (
+                    f"__keyspace@{REDIS_DB_REPO_SETTINGS}__"
+                    f":{settings_repository_key()}"
+                )
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{channel: self._on_message})
+                self._thread = pubsub.run_in_thread(
+                    sleep_time=1,
+                    daemon=True,
+                    exception_handler=self._on_error,
+                )
+            except redis.RedisError as err:
+                logging.warning(f"Bootstrap state cache not started: {err}")
+                return False
+
+            self._state = None
+            self._generation += 1
+            self._listening = True
+            logging.info(f"Bootstrap state cache listening on {channel}")
+
+        return True
+
+    def get(self) -> Tuple[Optional[BootstrapState], int]:
+        """
+        Get the cached state and the current cache generation.
+
+        The generation must be given back to ``set`` so a state read before
+        an invalidation is never cached.
+        """
+        with self._lock:
+            if self._state is None:
+                return None, self._generation
+
+            return replace(self._state), self._generation
+
+    def set(self, state: BootstrapState, generation: int):
+        with self._lock:
+            if self._listening and generation == self._generation:
+                self._state = replace(state)
+
+    def invalidate(self):
+        with self._lock:
+            self._state = None
+            self._generation += 1
+
+    def _on_message(self, message):
+        self.invalidate()
+
+    def _on_error(self, err, pubsub, thread):
+        logging.warning(f"Bootstrap state cache subscriber failed: {err}")
+        with self._lock:
+            self._listening = False
+            self._state = None
+            self._generation += 1
+        thread.stop()
+
+
+def _enable_keyspace_events(client: redis.Redis) -> bool:
+    """
+    Make sure the Redis Server publishes the keyspace events required by
+    the ``BootstrapStateCache``.
+    """
+    current = client.config_get("notify-keyspace-events").get(
+        "notify-keyspace-events", ""
+    )
+    # `A` is an alias for all events classes
+    if all(e in current for e in KEYSPACE_EVENTS) or (
+        "K" in current and "A" in current
+    ):
+        return True
+
+    events = "".join(sorted(set(current + KEYSPACE_EVENTS)))
+    try:
+        client.config_set("notify-keyspace-events", events)
+    except redis.ResponseError as err:
+        logging.warning(
+            "Bootstrap state cache requires Redis 'notify-keyspace-events' "
+            f"with '{KEYSPACE_EVENTS}': {err}"
+        )
+        return False
+
+    return True
+
+
+bootstrap_state_cache = BootstrapStateCache()
+
+
+def pre_lock_bootstrap(task_id: str) -> bool:
     """
     Add a pre-lock to the bootstrap repository settings.
 
     Add to the repository settings in Redis the lock as `pre-<task_id>`.
+    The check and the lock are atomic (single Redis script), so only one of
+    concurrent bootstraps gets the lock.
 
     Args:
         task_id: Task id generated by bootstrap
+
+    Returns:
+        ``True`` if locked, ``False`` if the bootstrap is already locked
+        (finished, ``pre`` or ``signing``)
     """
-    settings_data = settings_repository.as_dict(
-        env=settings_repository.current_env
-    )
-    settings_data["BOOTSTRAP"] = f"pre-{task_id}"
-    redis_loader.write(settings_repository, settings_data)
+    lock = settings_repository_redis().register_script(_LOCK_BOOTSTRAP)
+    with redis_span("lock_bootstrap"):
+        current = lock(
+            keys=[settings_repository_key(), SETTINGS_VERSION_KEY],
+            args=[f"pre-{task_id}", unparse_conf_data(None)],
+        )
+    bootstrap_state_cache.invalidate()
+    if current is not None:
+        logging.info(f"Bootstrap already locked: {current}")
+        return False
 
+    return True
 
-def release_bootstrap_lock():
+
+def release_bootstrap_lock(task_id: Optional[str] = None):
     """
     Remove the pre-lock from repository settings.
 
     Move the repository settings BOOTSTRAP to None if not finished.
+
+    Args:
+        task_id: Release only the lock of this bootstrap task, if it is still
+            in an intermediate state (``pre`` or ``signing``)
     """
-    settings_data = settings_repository.as_dict(
-        env=settings_repository.current_env
-    )
-    settings_data["BOOTSTRAP"] = None
-    redis_loader.write(settings_repository, settings_data)
+    release = settings_repository_redis().register_script(_RELEASE_BOOTSTRAP)
+    with redis_span("release_bootstrap"):
+        release(
+            keys=[settings_repository_key(), SETTINGS_VERSION_KEY],
+            args=[unparse_conf_data(None), task_id or ""],
+        )
+    bootstrap_state_cache.invalidate()
 
 
 def bootstrap_state() -> BootstrapState:
@@ -104,16 +550,68 @@ def bootstrap_state() -> BootstrapState:
     The bootstrap state is registered in Redis.
     Detailed definitions are available in
     https://repository-service-tuf.readthedocs.io/en/stable/devel/design.html#tuf-repository-settings  # noqa
+
+    When ``RSTUF_BOOTSTRAP_STATE_CACHE`` is enabled, the state is served from
+    the process-local ``bootstrap_state_cache`` until the repository settings
+    change in Redis.
     """
+    if not settings.get("BOOTSTRAP_STATE_CACHE", False):
+        return _load_bootstrap_state()
+
+    if not bootstrap_state_cache.start():
+        return _load_bootstrap_state()
+
+    cached_state, generation = bootstrap_state_cache.get()
+    if cached_state is not None:
+        return cached_state
+
+    state = _load_bootstrap_state()
+    bootstrap_state_cache.set(state, generation)
+
+    return state
+
+
+async def bootstrap_state_async() -> BootstrapState:
+    """
+    Bootstrap state (asyncio)
+
+    Same as ``bootstrap_state``, but reads only the ``BOOTSTRAP`` field from
+    the repository settings in Redis using ``redis.asyncio``.
+    """
+    if not settings.get("BOOTSTRAP_STATE_CACHE", False):
+        return await _load_bootstrap_state_async()
+
+    if not bootstrap_state_cache.start():
+        return await _load_bootstrap_state_async()
+
+    cached_state, generation = bootstrap_state_cache.get()
+    if cached_state is not None:
+        return cached_state
+
+    state = await _load_bootstrap_state_async()
+    bootstrap_state_cache.set(state, generation)
+
+    return state
+
+
+def _load_bootstrap_state() -> BootstrapState:
+    return _parse_bootstrap_state(
+        repository_settings("bootstrap_state").bootstrap
+    )
+
+
+async def _load_bootstrap_state_async() -> BootstrapState:
+    with settings_read("bootstrap_state"):
+        value = await settings_repository_async().hget(
+            settings_repository_key(), "BOOTSTRAP"
+        )
+    # same parsing used by the Dynaconf Redis loader
+    bootstrap = None if value is None else parse_conf_data(value, tomlfy=True)
+
+    return _parse_bootstrap_state(bootstrap)
 
-    # Reload the settings
-    # The reload is required because the settings object is created in the
-    # `app.py`'s initialization. The `settings_repository.get_fresh() doesn't
-    # correctly reload because of that the settings_repository.reload() do
-    # the job.
-    settings_repository.reload()
-    bootstrap = settings_repository.get_fresh("BOOTSTRAP")
 
+def _parse_bootstrap_state(bootstrap: Optional[str]) -> BootstrapState:
     bootstrap_state = BootstrapState(bootstrap=False, state=None, task_id=None)
     if bootstrap is None:
         return bootstrap_state
@@ -145,7 +643,7 @@ def get_task_id():
     return uuid4().hex
 
 
-@celery.task(name="app.repository_service_tuf_worker")
+@celery.task(name="app.repository_service_tuf_worker", base=BrokerTask)
 def repository_metadata(action, payload):
     logging.debug(f"New tasks action submitted {action}")
     return True
@@ -0,0 +1,145 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Admission control of the task submissions by the broker queue depth.
+
+The ``metadata_repository`` queue depth is sampled with a passive
+``queue_declare`` every ``RSTUF_ADMISSION_CACHE_SECONDS`` by a background
+thread, started with the application if a limit is set. Above
+``RSTUF_ADMISSION_QUEUE_SOFT_LIMIT`` messages the bulk artifacts tasks are
+rejected with ``429 Too Many Requests``, and above
+``RSTUF_ADMISSION_QUEUE_HARD_LIMIT`` messages all the tasks are rejected with
+``503 Service Unavailable``. Both responses have a ``Retry-After`` header.
+
+The other tasks (metadata update and signing, delegations, settings and
+bootstrap) are the priority lane: they are only rejected above the hard
+limit, so they are still accepted while the bulk artifacts tasks back off.
+"""
+
+import logging
+import threading
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from repository_service_tuf_api import celery, settings
+
+ADMISSION_QUEUE = "metadata_repository"
+# Seconds between the samples of the queue depth
+ADMISSION_CACHE_SECONDS = 2
+# Default ``Retry-After`` seconds
+ADMISSION_RETRY_AFTER = 30
+# Tasks rejected above the soft limit
+BULK_ACTIONS = ("add_artifacts", "remove_artifacts", "publish_artifacts")
+
+
+class QueueDepthSampler:
+    """
+    Depth (number of messages ready) of a broker queue, sampled by a
+    background thread.
+
+    The requests only read the last sample and never talk to the broker. The
+    thread samples the broker every ``interval`` seconds with a connection of
+    the Celery broker connection pool. If the broker cannot be sampled, or
+    the thread is not running, the depth is unknown (``None``).
+    """
+
+    def __init__(self, queue: str):
+        self.queue = queue
+        self._lock = threading.Lock()
+        self._depth: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def depth(self) -> Optional[int]:
+        return self._depth
+
+    def start(self, interval: float):
+        """Start the sampler thread, if not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(interval,),
+                name="admission-queue-depth",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the sampler thread."""
+        self._stop.set()
+        self._depth = None
+
+    def _run(self, interval: float):
+        while not self._stop.is_set():
+            self._depth = self._sample()
+            self._stop.wait(interval)
+
+        self._depth = None
+
+    def _sample(self) -> Optional[int]:
+        try:
+            with celery.pool.acquire(block=True) as connection:
+                _, depth, _ = connection.default_channel.queue_declare(
+                    queue=self.queue, passive=True
+                )
+        except Exception as err:
+            logging.warning(f"Queue {self.queue} depth not available: {err}")
+            return None
+
+        return depth
+
+
+queue_depth_sampler = QueueDepthSampler(ADMISSION_QUEUE)
+
+
+def admission_control(action: str) -> Callable[[], None]:
+    """
+    FastAPI dependency rejecting the ``action`` task submission when the
+    queue is saturated.
+    """
+
+    def check_admission():
+        soft_limit = settings.get("ADMISSION_QUEUE_SOFT_LIMIT", 0)
+        hard_limit = settings.get("ADMISSION_QUEUE_HARD_LIMIT", 0)
+        is_bulk = action in BULK_ACTIONS
+        if hard_limit <= 0 and (soft_limit <= 0 or not is_bulk):
+            return
+
+        depth = queue_depth_sampler.depth()
+        if depth is None:
+            return
+
+        if hard_limit > 0 and depth >= hard_limit:
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        elif is_bulk and soft_limit > 0 and depth >= soft_limit:
+            status_code = status.HTTP_429_TOO_MANY_REQUESTS
+        else:
+            return
+
+        logging.info(f"Task {action} not accepted, queue depth {depth}")
+        raise HTTPException(
+            status_code,
+            detail={
+                "message": "Task not accepted.",
+                "error": (
+                    f"Queue {ADMISSION_QUEUE} is saturated ({depth} tasks). "
+                    "Retry later."
+                ),
+            },
+            headers={
+                "Retry-After": str(
+                    settings.get(
+                        "ADMISSION_RETRY_AFTER", ADMISSION_RETRY_AFTER
+                    )
+                )
+            },
+        )
+
+    return check_admission
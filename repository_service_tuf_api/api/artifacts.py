@@ -3,9 +3,13 @@
 #
 # SPDX-License-Identifier: MIT
 
-from fastapi import APIRouter, status
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
 from repository_service_tuf_api import artifacts
+from repository_service_tuf_api.admission import admission_control
+from repository_service_tuf_api.idempotency import store_response
 
 router = APIRouter(
     prefix="/artifacts",
@@ -25,6 +29,7 @@ router = APIRouter(
     response_model=artifacts.ResponsePostAdd,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("add_artifacts"))],
 )
 def post(payload: artifacts.AddPayload) -> artifacts.ResponsePostAdd:
     response = artifacts.post(payload)
@@ -32,6 +37,46 @@ def post(payload: artifacts.AddPayload) -> artifacts.ResponsePostAdd:
     return response
 
 
+@router.post(
+    "/stream",
+    summary="Post tasks to add a stream of artifacts to Metadata.",
+    description=(
+        "Submit asynchronous tasks to add artifacts to Metadata from a NDJSON "
+        "body (one artifact per line), for very large number of artifacts. "
+        "The artifacts are split in multiple tasks. "
+        "Use the task IDs to retrieve the tasks status in the endpoint "
+        "/api/v1/task."
+    ),
+    response_model=artifacts.ResponsePostStream,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("add_artifacts"))],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/x-ndjson": {
+                    "schema": {"$ref": "#/components/schemas/Artifact"}
+                }
+            },
+            "required": True,
+        }
+    },
+)
+async def post_stream(
+    request: Request,
+    params: Annotated[artifacts.StreamParameters, Query()],
+) -> artifacts.ResponsePostStream:
+    try:
+        response = await artifacts.post_stream(request.stream(), params)
+    except HTTPException as err:
+        if err.detail.get("task_ids"):
+            # tasks of the previous lines are submitted, keep the response
+            store_response(request)
+        raise
+
+    return response
+
+
 @router.post(
     "/delete",
     summary="Post a task to remove artifacts from Metadata.",
@@ -44,6 +89,7 @@ def post(payload: artifacts.AddPayload) -> artifacts.ResponsePostAdd:
     response_model=artifacts.ResponsePostDelete,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("remove_artifacts"))],
 )
 def post_delete(
     payload: artifacts.DeletePayload,
@@ -65,6 +111,7 @@ def post_delete(
     response_model=artifacts.ResponsePostPublish,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("publish_artifacts"))],
 )
 def post_publish_artifacts() -> artifacts.ResponsePostPublish:
     response = artifacts.post_publish_artifacts()
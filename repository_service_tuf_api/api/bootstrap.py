@@ -3,9 +3,10 @@
 #
 # SPDX-License-Identifier: MIT
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 
 from repository_service_tuf_api import bootstrap
+from repository_service_tuf_api.admission import admission_control
 
 router = APIRouter(
     prefix="/bootstrap",
@@ -21,8 +22,8 @@ router = APIRouter(
     response_model=bootstrap.BootstrapGetResponse,
     response_model_exclude_none=True,
 )
-def get():
-    return bootstrap.get_bootstrap()
+async def get():
+    return await bootstrap.get_bootstrap()
 
 
 @router.post(
@@ -38,6 +39,7 @@ def get():
     response_model=bootstrap.BootstrapPostResponse,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("bootstrap"))],
 )
 def post(
     payload: bootstrap.BootstrapPayload,
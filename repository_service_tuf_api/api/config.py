@@ -3,9 +3,14 @@
 #
 # SPDX-License-Identifier: MIT
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, Request, status
 
 from repository_service_tuf_api import config
+from repository_service_tuf_api.admission import admission_control
+from repository_service_tuf_api.conditional import (
+    NOT_MODIFIED_RESPONSE,
+    conditional_response,
+)
 
 router = APIRouter(
     prefix="/config",
@@ -25,6 +30,7 @@ router = APIRouter(
     response_model=config.PutResponse,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("update_settings"))],
 )
 def put(payload: config.PutPayload):
     return config.put(payload)
@@ -33,9 +39,13 @@ def put(payload: config.PutPayload):
 @router.get(
     "/",
     summary="List settings.",
-    description="Returns the configuration settings",
+    description=(
+        "Returns the configuration settings. The response has an ETag, "
+        "requests with a matching If-None-Match get 304 Not Modified."
+    ),
     response_model=config.GetResponse,
     response_model_exclude_none=True,
+    responses=NOT_MODIFIED_RESPONSE,
 )
-def get():
-    return config.get()
+def get(request: Request):
+    return conditional_response(request, "config", config.get)
@@ -2,9 +2,10 @@
 #
 # SPDX-License-Identifier: MIT
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 
 from repository_service_tuf_api import delegations
+from repository_service_tuf_api.admission import admission_control
 
 router = APIRouter(
     prefix="/delegations",
@@ -24,6 +25,7 @@ router = APIRouter(
     response_model=delegations.DelegationsResponse,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("metadata_delegation"))],
 )
 def post_delegation(payload: delegations.MetadataDelegationsPayload):
     return delegations.metadata_delegation(payload, action="add")
@@ -40,6 +42,7 @@ def post_delegation(payload: delegations.MetadataDelegationsPayload):
     response_model=delegations.DelegationsResponse,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("metadata_delegation"))],
 )
 def put_delegation(payload: delegations.MetadataDelegationsPayload):
     return delegations.metadata_delegation(payload, action="update")
@@ -56,6 +59,7 @@ def put_delegation(payload: delegations.MetadataDelegationsPayload):
     response_model=delegations.DelegationsResponse,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("metadata_delegation"))],
 )
 def delete_delegation(payload: delegations.MetadataDelegationDeletePayload):
     return delegations.metadata_delegation(payload, action="delete")
@@ -3,9 +3,14 @@
 #
 # SPDX-License-Identifier: MIT
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, Request, status
 
 from repository_service_tuf_api import metadata
+from repository_service_tuf_api.admission import admission_control
+from repository_service_tuf_api.conditional import (
+    NOT_MODIFIED_RESPONSE,
+    conditional_response,
+)
 
 router = APIRouter(
     prefix="/metadata",
@@ -26,6 +31,7 @@ router = APIRouter(
     response_model=metadata.MetadataPostResponse,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("metadata_update"))],
 )
 def post(payload: metadata.MetadataPostPayload):
     return metadata.post_metadata(payload)
@@ -46,6 +52,7 @@ def post(payload: metadata.MetadataPostPayload):
     response_model=metadata.MetadataOnlinePostResponse,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("force_online_metadata_update"))],
 )
 def post_online(payload: metadata.MetadataOnlinePostPayload):
     return metadata.post_metadata_online(payload)
@@ -59,14 +66,19 @@ def post_online(payload: metadata.MetadataOnlinePostPayload):
     ),
     description=(
         "Get all metadata roles that need more signatures before they can be "
-        "used and their corresponding latest trusted versions."
+        "used and their corresponding latest trusted versions. The response "
+        "has an ETag, requests with a matching If-None-Match get 304 Not "
+        "Modified."
     ),
     response_model=metadata.MetadataSignGetResponse,
     response_model_exclude_none=True,
     status_code=status.HTTP_200_OK,
+    responses=NOT_MODIFIED_RESPONSE,
 )
-def get_sign():
-    return metadata.get_metadata_sign()
+def get_sign(request: Request):
+    return conditional_response(
+        request, "metadata-sign", metadata.get_metadata_sign
+    )
 
 
 @router.post(
@@ -81,6 +93,7 @@ def get_sign():
     response_model=metadata.MetadataPostResponse,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("sign_metadata"))],
 )
 def post_sign(payload: metadata.MetadataSignPostPayload):
     return metadata.post_metadata_sign(payload)
@@ -98,6 +111,7 @@ def post_sign(payload: metadata.MetadataSignPostPayload):
     response_model=metadata.MetadataSignDeleteResponse,
     response_model_exclude_none=True,
     status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(admission_control("delete_sign_metadata"))],
 )
 def post_delete_sign(payload: metadata.MetadataSignDeletePayload):
     return metadata.delete_metadata_sign(payload)
@@ -3,7 +3,10 @@
 #
 # SPDX-License-Identifier: MIT
 
-from fastapi import APIRouter, Depends
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 
 from repository_service_tuf_api import tasks
 
@@ -17,9 +20,48 @@ router = APIRouter(
 @router.get(
     "/",
     summary="Get task state.",
-    description="Get RSTUF tasks information.",
+    description=(
+        "Get RSTUF tasks information. "
+        "Use `wait` to hold the request until the task is ready instead of "
+        "polling."
+    ),
     response_model=tasks.Response,
     response_model_exclude_none=True,
 )
-def get(params: tasks.GetParameters = Depends()):
-    return tasks.get(params.task_id)
+async def get(params: tasks.GetParameters = Depends()):
+    return await tasks.get(params.task_id, params.wait)
+
+
+@router.get(
+    "/stream",
+    summary="Stream tasks state changes.",
+    description=(
+        "Stream RSTUF tasks state changes as Server-Sent Events "
+        "(`task_state` events with the task data). "
+        "For the given task IDs, the stream starts with the current state "
+        "and ends when all the tasks are ready. Without task IDs, the state "
+        "changes of all tasks are streamed."
+    ),
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream(params: Annotated[tasks.StreamParameters, Query()]):
+    return StreamingResponse(
+        tasks.stream(params.task_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post(
+    "/bulk",
+    summary="Get many tasks state.",
+    description=(
+        "Get RSTUF tasks information for a list of task IDs in a single "
+        "request. Unknown task IDs are reported as `PENDING`."
+    ),
+    response_model=tasks.BulkResponse,
+    response_model_exclude_none=True,
+)
+async def post_bulk(payload: tasks.BulkPayload):
+    return await tasks.get_bulk(payload.task_ids)
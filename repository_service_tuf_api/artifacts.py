@@ -3,18 +3,33 @@
 #
 # SPDX-License-Identifier: MIT
 
-import json
+import atexit
+import logging
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from celery import group
 from fastapi import HTTPException, status
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from starlette.concurrency import run_in_threadpool
 
 from repository_service_tuf_api import (
+    artifacts_index,
     bootstrap_state,
+    bootstrap_state_async,
     get_task_id,
     repository_metadata,
+    settings,
 )
+from repository_service_tuf_api.common_models import (
+    BasePayload,
+    example_schema,
+)
+
+# Maximum size (bytes) of an artifact line in the NDJSON stream
+STREAM_MAX_LINE = 1024 * 1024
 
 
 class ResponseData(BaseModel):
@@ -23,6 +38,16 @@ class ResponseData(BaseModel):
     last_update: datetime
 
 
+class ResponseAddData(ResponseData):
+    task_id: str | None = Field(
+        default=None, description="Task ID, if any artifact is submitted"
+    )
+    skipped: List[str] | None = Field(
+        default=None,
+        description="Artifacts skipped, already added with identical info",
+    )
+
+
 class ResponsePostAdd(BaseModel):
     """
     Artifacts post new artifacts response
@@ -41,7 +66,7 @@ class ResponsePostAdd(BaseModel):
         }
     )
 
-    data: ResponseData | None = None
+    data: ResponseAddData | None = None
     message: str | None = None
 
 
@@ -105,17 +130,14 @@ class Artifact(BaseModel):
     path: str
 
 
-with open("tests/data_examples/artifacts/add_payload.json") as f:
-    content = f.read()
-add_payload = json.loads(content)
-
-
-class AddPayload(BaseModel):
+class AddPayload(BasePayload):
     """
     POST method required Payload.
     """
 
-    model_config = ConfigDict(json_schema_extra={"example": add_payload})
+    model_config = ConfigDict(
+        json_schema_extra=example_schema("artifacts/add_payload.json")
+    )
     artifacts: List[Artifact]
     add_task_id_to_custom: bool = Field(
         default=False,
@@ -124,9 +146,64 @@ class AddPayload(BaseModel):
     publish_artifacts: bool = Field(
         default=True, description="Whether to publish the artifacts"
     )
+    skip_existing: bool = Field(
+        default=False,
+        description=(
+            "Whether to skip the artifacts already added with identical info "
+            "(length, hashes and custom). Requires `RSTUF_ARTIFACTS_INDEX`"
+        ),
+    )
+
+    def task_payload(self) -> Dict[str, Any]:
+        """Payload of the ``add_artifacts`` task."""
+        return self.model_dump(
+            by_alias=True, exclude_none=True, exclude={"skip_existing"}
+        )
+
+
+class StreamParameters(BaseModel):
+    add_task_id_to_custom: bool = Field(
+        default=False,
+        description="Whether to add the id of the task in custom",
+    )
+    publish_artifacts: bool = Field(
+        default=True, description="Whether to publish the artifacts"
+    )
+
+
+class ResponseStreamData(BaseModel):
+    artifacts: int = Field(description="Number of artifacts submitted")
+    task_ids: List[str]
+    last_update: datetime
+
+
+class ResponsePostStream(BaseModel):
+    """
+    Artifacts post stream of new artifacts response
+    """
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "data": {
+                    "artifacts": 2500,
+                    "task_ids": [
+                        "06ee6db3cbab4b26be505352c2f2e2c3",
+                        "ad85d5d0aa5e4dd69ac5b0fbd9e0bfa1",
+                        "3a1b7ad2da4c4b0e8c0d1b9a8ef21b0a",
+                    ],
+                    "last_update": "2022-12-01T12:10:00.578086",
+                },
+                "message": "New Artifact(s) successfully submitted.",
+            }
+        }
+    )
+
+    data: ResponseStreamData | None = None
+    message: str | None = None
 
 
-class DeletePayload(BaseModel):
+class DeletePayload(BasePayload):
     """
     DELETE method required Payload.
     """
@@ -148,6 +225,151 @@ class DeletePayload(BaseModel):
     )
 
 
+def _artifact_digests(artifacts: List[Artifact]) -> Dict[str, str]:
+    return {
+        artifact.path: artifacts_index.artifact_digest(
+            artifact.info.model_dump(by_alias=True, exclude_none=True)
+        )
+        for artifact in artifacts
+    }
+
+
+def _add_task_id_to_custom(
+    artifacts: List[Artifact], task_id: str
+) -> List[Artifact]:
+    new_artifacts: List[Artifact] = []
+    for artifact in artifacts:
+        if artifact.info.custom:
+            artifact.info.custom = {
+                "added_by_task_id": task_id,
+                **artifact.info.custom,
+            }
+        else:
+            artifact.info.custom = {"added_by_task_id": task_id}
+
+        new_artifacts.append(artifact)
+
+    return new_artifacts
+
+
+@dataclass
+class _CoalescedBatch:
+    task_id: str
+    publish_artifacts: bool
+    artifacts: List[Dict[str, Any]] = field(default_factory=list)
+    timer: Optional[threading.Timer] = None
+
+
+class ArtifactsCoalescer:
+    """
+    Coalesce the artifacts of many ``AddPayload`` in one ``add_artifacts``
+    task.
+
+    Artifacts are buffered, grouped by ``publish_artifacts``, for up to
+    ``window`` seconds or until ``size`` artifacts, whichever comes first.
+    All the payloads in the same batch share the batch task id, so each
+    caller can follow the merged task in the ``/api/v1/task`` endpoint.
+
+    The batches are only in the process memory: the pending batches are
+    flushed on the application shutdown (and at exit), but the artifacts of
+    accepted requests are lost if the process is killed before the batch is
+    sent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._batches: Dict[bool, _CoalescedBatch] = {}
+
+    def add(self, payload: AddPayload, window: float, size: int) -> str:
+        """
+        Add the payload artifacts to the current batch.
+
+        Returns:
+            The task id of the batch.
+        """
+        with self._lock:
+            batch = self._batches.get(payload.publish_artifacts)
+            if batch is None:
+                batch = _CoalescedBatch(
+                    task_id=get_task_id(),
+                    publish_artifacts=payload.publish_artifacts,
+                )
+                batch.timer = threading.Timer(window, self._expire, (batch,))
+                batch.timer.daemon = True
+                batch.timer.start()
+                self._batches[payload.publish_artifacts] = batch
+
+            if payload.add_task_id_to_custom is True:
+                payload.artifacts = _add_task_id_to_custom(
+                    payload.artifacts, batch.task_id
+                )
+
+            batch.artifacts.extend(
+                artifact.model_dump(by_alias=True, exclude_none=True)
+                for artifact in payload.artifacts
+            )
+            full = len(batch.artifacts) >= size
+            if full:
+                batch.timer.cancel()
+                del self._batches[payload.publish_artifacts]
+
+        if full:
+            self._publish(batch)
+
+        return batch.task_id
+
+    def flush(self):
+        """Publish all the pending batches."""
+        with self._lock:
+            batches = list(self._batches.values())
+            self._batches.clear()
+
+        for batch in batches:
+            batch.timer.cancel()
+            self._publish(batch)
+
+    def _expire(self, batch: _CoalescedBatch):
+        with self._lock:
+            if self._batches.get(batch.publish_artifacts) is not batch:
+                # already published because it is full or flushed
+                return
+            del self._batches[batch.publish_artifacts]
+
+        self._publish(batch)
+
+    def _publish(self, batch: _CoalescedBatch):
+        try:
+            repository_metadata.apply_async(
+                kwargs={
+                    "action": "add_artifacts",
+                    "payload": {
+                        "artifacts": batch.artifacts,
+                        # task id already added in the artifacts custom
+                        "add_task_id_to_custom": False,
+                        "publish_artifacts": batch.publish_artifacts,
+                    },
+                },
+                task_id=batch.task_id,
+                queue="metadata_repository",
+                acks_late=True,
+            )
+        except Exception as err:
+            # The callers already have the task id, register the failure in
+            # the Result Backend instead of leaving the task as PENDING.
+            logging.error(f"Failed to submit coalesced task: {err}")
+            repository_metadata.backend.mark_as_failure(batch.task_id, err)
+            return
+
+        logging.debug(
+            f"Coalesced task {batch.task_id} sent with "
+            f"{len(batch.artifacts)} artifact(s)"
+        )
+
+
+artifacts_coalescer = ArtifactsCoalescer()
+atexit.register(artifacts_coalescer.flush)
+
+
 def post(payload: AddPayload) -> ResponsePostAdd:
     """
     Post new artifact(s)s.
@@ -155,6 +377,18 @@ def post(payload: AddPayload) -> ResponsePostAdd:
     ``metadata_repository`` broker queue.
     It generates a new task id, syncs with the Redis server, and posts the new
     task.
+
+    If ``RSTUF_ARTIFACTS_COALESCE_WINDOW`` is set, the artifacts are coalesced
+    with other payloads by the ``artifacts_coalescer`` and the returned task
+    id is the id of the coalesced task.
+
+    If ``RSTUF_ARTIFACTS_CHUNK_SIZE`` is set, the artifacts are split in tasks
+    of up to this size, sent as a Celery group. The returned task id is the
+    group id, and its state aggregates the tasks (see ``tasks.get``).
+
+    If ``RSTUF_ARTIFACTS_INDEX`` is enabled, the artifacts are registered in
+    the ``artifacts_index``, and with ``skip_existing`` the artifacts already
+    added with identical info are not sent (only listed as skipped).
     """
     bs_state = bootstrap_state()
     if bs_state.bootstrap is False:
@@ -168,42 +402,234 @@ def post(payload: AddPayload) -> ResponsePostAdd:
             },
         )
 
-    task_id = get_task_id()
-    if payload.add_task_id_to_custom is True:
-        new_artifacts: List[Artifact] = []
-        for artifact in payload.artifacts:
-            if artifact.info.custom:
-                artifact.info.custom = {
-                    "added_by_task_id": task_id,
-                    **artifact.info.custom,
-                }
-            else:
-                artifact.info.custom = {"added_by_task_id": task_id}
+    index_enabled = settings.get("ARTIFACTS_INDEX", False)
+    if payload.skip_existing is True and not index_enabled:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": "Task not accepted.",
+                "error": "skip_existing requires RSTUF_ARTIFACTS_INDEX",
+            },
+        )
 
-            new_artifacts.append(artifact)
+    digests: Dict[str, str] = {}
+    skipped: Optional[List[str]] = None
+    if index_enabled:
+        # before the task id is added to custom
+        digests = _artifact_digests(payload.artifacts)
+    if payload.skip_existing is True:
+        existing = artifacts_index.indexed(digests)
+        skipped = [a.path for a in payload.artifacts if a.path in existing]
+        payload.artifacts = [
+            a for a in payload.artifacts if a.path not in existing
+        ]
+        if len(payload.artifacts) == 0 and len(skipped) > 0:
+            data = {
+                "artifacts": [],
+                "skipped": skipped,
+                "last_update": datetime.now(timezone.utc),
+            }
+            return ResponsePostAdd(
+                data=data,
+                message="No new Artifact(s), all already added.",
+            )
+        for path in existing:
+            digests.pop(path)
+
+    coalesce_window = settings.get("ARTIFACTS_COALESCE_WINDOW", 0)
+    chunk_size = settings.get("ARTIFACTS_CHUNK_SIZE", 0)
+    if coalesce_window > 0:
+        task_id = artifacts_coalescer.add(
+            payload,
+            window=coalesce_window,
+            size=settings.get("ARTIFACTS_COALESCE_SIZE", 1000),
+        )
+    elif chunk_size > 0 and len(payload.artifacts) > chunk_size:
+        task_id = _submit_add_artifacts_group(payload, chunk_size)
+    else:
+        task_id = _submit_add_artifacts(payload)
 
-        payload.artifacts = new_artifacts
+    artifacts_index.add_pending(task_id, digests)
+
+    message = "New Artifact(s) successfully submitted."
+    if payload.publish_artifacts is False:
+        message += " Publishing will be skipped."
+
+    data = {
+        "artifacts": [artifact.path for artifact in payload.artifacts],
+        "task_id": task_id,
+        "skipped": skipped,
+        "last_update": datetime.now(timezone.utc),
+    }
+    return ResponsePostAdd(data=data, message=message)
+
+
+def _submit_add_artifacts(payload: AddPayload) -> str:
+    task_id = get_task_id()
+    if payload.add_task_id_to_custom is True:
+        payload.artifacts = _add_task_id_to_custom(payload.artifacts, task_id)
 
     repository_metadata.apply_async(
         kwargs={
             "action": "add_artifacts",
-            "payload": payload.dict(by_alias=True, exclude_none=True),
+            "payload": payload.task_payload(),
         },
         task_id=task_id,
         queue="metadata_repository",
         acks_late=True,
     )
 
+    return task_id
+
+
+def _submit_add_artifacts_group(payload: AddPayload, chunk_size: int) -> str:
+    group_id = get_task_id()
+    if payload.add_task_id_to_custom is True:
+        # the group id is the task id known by the user
+        payload.artifacts = _add_task_id_to_custom(payload.artifacts, group_id)
+
+    signatures = []
+    for start in range(0, len(payload.artifacts), chunk_size):
+        end = start + chunk_size
+        chunk = AddPayload(
+            artifacts=payload.artifacts[start:end],
+            # group id already added in the artifacts custom, as the
+            # coalesced tasks (the workers would add the task id instead)
+            add_task_id_to_custom=False,
+            publish_artifacts=payload.publish_artifacts,
+        )
+        signatures.append(
+            repository_metadata.signature(
+                kwargs={
+                    "action": "add_artifacts",
+                    "payload": chunk.task_payload(),
+                },
+                task_id=get_task_id(),
+                queue="metadata_repository",
+                acks_late=True,
+            )
+        )
+
+    # The group result (tasks ids) is stored in the Result Backend to
+    # aggregate the tasks state by the group id
+    group(signatures).apply_async(task_id=group_id).save()
+    logging.debug(f"Group task {group_id} sent with {len(signatures)} tasks")
+
+    return group_id
+
+
+async def _ndjson_lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Split the NDJSON body in lines, yielding the non empty lines and numbers.
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+
+        if len(buffer) > STREAM_MAX_LINE:
+            raise ValueError(
+                f"Line {line_number + 1}: exceeds {STREAM_MAX_LINE} bytes"
+            )
+
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+async def post_stream(
+    chunks: AsyncIterator[bytes], params: StreamParameters
+) -> ResponsePostStream:
+    """
+    Post new artifact(s) from a NDJSON stream (one ``Artifact`` per line).
+
+    The artifacts are validated while the body is received and sent in
+    ``add_artifacts`` tasks of up to ``RSTUF_ARTIFACTS_STREAM_CHUNK_SIZE``
+    artifacts, so only one chunk is kept in memory.
+
+    If an artifact is invalid, the artifacts of the previous lines are
+    already submitted and their task ids are in the error detail.
+    """
+    bs_state = await bootstrap_state_async()
+    if bs_state.bootstrap is False:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            detail={
+                "message": "Task not accepted.",
+                "error": (
+                    f"It requires bootstrap finished. State: {bs_state.state}"
+                ),
+            },
+        )
+
+    chunk_size = settings.get("ARTIFACTS_STREAM_CHUNK_SIZE", 1000)
+    index_enabled = settings.get("ARTIFACTS_INDEX", False)
+    task_ids: List[str] = []
+    total = 0
+    artifacts: List[Artifact] = []
+
+    async def submit():
+        nonlocal artifacts, total
+        payload = AddPayload(
+            artifacts=artifacts,
+            add_task_id_to_custom=params.add_task_id_to_custom,
+            publish_artifacts=params.publish_artifacts,
+        )
+        digests = _artifact_digests(artifacts) if index_enabled else {}
+        task_id = await run_in_threadpool(_submit_add_artifacts, payload)
+        task_ids.append(task_id)
+        if index_enabled:
+            await run_in_threadpool(
+                artifacts_index.add_pending, task_id, digests
+            )
+        total += len(artifacts)
+        artifacts = []
+
+    try:
+        async for line_number, line in _ndjson_lines(chunks):
+            try:
+                artifacts.append(Artifact.model_validate_json(line))
+            except ValidationError as err:
+                raise ValueError(f"Line {line_number}: {err}")
+
+            if len(artifacts) >= chunk_size:
+                await submit()
+
+    except ValueError as err:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "message": "Invalid artifact.",
+                "error": str(err),
+                "task_ids": task_ids,
+            },
+        )
+
+    if len(artifacts) > 0:
+        await submit()
+
+    if total == 0:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"message": "Invalid artifact.", "error": "No artifacts"},
+        )
+
     message = "New Artifact(s) successfully submitted."
-    if payload.publish_artifacts is False:
+    if params.publish_artifacts is False:
         message += " Publishing will be skipped."
 
     data = {
-        "artifacts": [artifact.path for artifact in payload.artifacts],
-        "task_id": task_id,
+        "artifacts": total,
+        "task_ids": task_ids,
         "last_update": datetime.now(timezone.utc),
     }
-    return ResponsePostAdd(data=data, message=message)
+    return ResponsePostStream(data=data, message=message)
 
 
 def delete(payload: DeletePayload) -> ResponsePostDelete:
@@ -226,6 +652,9 @@ def delete(payload: DeletePayload) -> ResponsePostDelete:
             },
         )
 
+    if settings.get("ARTIFACTS_INDEX", False):
+        artifacts_index.remove(payload.artifacts)
+
     task_id = get_task_id()
     repository_metadata.apply_async(
         kwargs={
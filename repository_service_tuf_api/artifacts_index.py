@@ -0,0 +1,199 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Index of the artifacts added to the repository.
+
+The index is a Redis hash (repository settings DB) of artifact path -> digest
+of the artifact info (``length``, ``hashes`` and ``custom``), used to skip
+the artifacts resubmitted with identical info.
+
+The artifacts of an ``add_artifacts`` task are registered as pending by the
+task id (``ARTIFACTS_PENDING_TASKS_KEY`` lists the task ids), and moved to the
+index when the task succeeds (see ``tasks.ArtifactsIndexer``). The removed
+artifacts are dropped from the index and from the pending artifacts when the
+removal is submitted, so a task finishing later does not index them again.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Set
+
+from repository_service_tuf_api import (
+    settings_repository_async,
+    settings_repository_redis,
+)
+from repository_service_tuf_api.tracing import redis_span
+
+ARTIFACTS_INDEX_KEY = "RSTUF_API_ARTIFACTS_INDEX"
+ARTIFACTS_PENDING_KEY_PREFIX = "RSTUF_API_ARTIFACTS_PENDING_"
+ARTIFACTS_PENDING_TASKS_KEY = "RSTUF_API_ARTIFACTS_PENDING_TASKS"
+# Seconds to keep the pending artifacts of a task (Celery result expiration)
+ARTIFACTS_PENDING_TTL = 24 * 60 * 60
+
+# Move the pending artifacts (KEYS[2]) of the task ARGV[1] to the index
+# (KEYS[1]), except the paths in ARGV[2:], and drop the task from the pending
+# tasks (KEYS[3]). HSET in batches to not exceed the Lua stack.
+_COMMIT_PENDING = """
+local entries = redis.call("HGETALL", KEYS[2])
+local excluded = {}
+for i = 2, #ARGV do
+    excluded[ARGV[i]] = true
+end
+local batch = {}
+local total = 0
+for i = 1, #entries, 2 do
+    if not excluded[entries[i]] then
+        table.insert(batch, entries[i])
+        table.insert(batch, entries[i + 1])
+        total = total + 1
+    end
+    if #batch >= 1000 or (i + 1 >= #entries and #batch > 0) then
+        redis.call("HSET", KEYS[1], unpack(batch))
+        batch = {}
+    end
+end
+redis.call("DEL", KEYS[2])
+redis.call("SREM", KEYS[3], ARGV[1])
+return total
+"""
+# Remove the paths ARGV[2:] from the index (KEYS[1]) and from the pending
+# artifacts of the pending tasks (KEYS[2], keys prefixed by ARGV[1]). The
+# tasks with expired pending artifacts are dropped. HDEL in batches to not
+# exceed the Lua stack.
+_REMOVE = """
+local function hdel(key)
+    for i = 2, #ARGV, 1000 do
+        redis.call("HDEL", key, unpack(ARGV, i, math.min(i + 999, #ARGV)))
+    end
+end
+hdel(KEYS[1])
+for _, task_id in ipairs(redis.call("SMEMBERS", KEYS[2])) do
+    local key = ARGV[1] .. task_id
+    if redis.call("EXISTS", key) == 1 then
+        hdel(key)
+    else
+        redis.call("SREM", KEYS[2], task_id)
+    end
+end
+return redis.status_reply("OK")
+"""
+# Pending tasks (KEYS[1]) with pending artifacts (keys prefixed by ARGV[1]).
+# The tasks with expired pending artifacts are dropped.
+_PENDING_TASKS = """
+local task_ids = {}
+for _, task_id in ipairs(redis.call("SMEMBERS", KEYS[1])) do
+    if redis.call("EXISTS", ARGV[1] .. task_id) == 1 then
+        table.insert(task_ids, task_id)
+    else
+        redis.call("SREM", KEYS[1], task_id)
+    end
+end
+return task_ids
+"""
+
+
+def artifact_digest(info: Dict[str, Any]) -> str:
+    """Digest of the artifact info, independent of the keys order."""
+    canonical = json.dumps(info, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def pending_key(task_id: str) -> str:
+    return f"{ARTIFACTS_PENDING_KEY_PREFIX}{task_id}"
+
+
+def indexed(digests: Dict[str, str]) -> Set[str]:
+    """
+    Get the artifacts already in the index with identical info.
+
+    Args:
+        digests: artifact path -> artifact info digest
+
+    Returns:
+        The paths indexed with the same digest.
+    """
+    if len(digests) == 0:
+        return set()
+
+    paths = list(digests)
+    with redis_span("artifacts_index_get"):
+        current = settings_repository_redis().hmget(ARTIFACTS_INDEX_KEY, paths)
+
+    return {
+        path for path, digest in zip(paths, current) if digest == digests[path]
+    }
+
+
+def add_pending(task_id: str, digests: Dict[str, str]):
+    """Register the artifacts of an ``add_artifacts`` task as pending."""
+    if len(digests) == 0:
+        return
+
+    key = pending_key(task_id)
+    with redis_span("artifacts_index_add_pending"):
+        pipeline = settings_repository_redis().pipeline()
+        pipeline.hset(key, mapping=digests)
+        pipeline.expire(key, ARTIFACTS_PENDING_TTL)
+        pipeline.sadd(ARTIFACTS_PENDING_TASKS_KEY, task_id)
+        pipeline.execute()
+
+
+def remove(paths: List[str]):
+    """Remove artifacts from the index and from the pending artifacts."""
+    if len(paths) == 0:
+        return
+
+    remove_paths = settings_repository_redis().register_script(_REMOVE)
+    with redis_span("artifacts_index_remove"):
+        remove_paths(
+            keys=[ARTIFACTS_INDEX_KEY, ARTIFACTS_PENDING_TASKS_KEY],
+            args=[ARTIFACTS_PENDING_KEY_PREFIX, *paths],
+        )
+
+
+async def pending_tasks() -> List[str]:
+    """Task ids (or group ids) with pending artifacts."""
+    get_pending_tasks = settings_repository_async().register_script(
+        _PENDING_TASKS
+    )
+    with redis_span("artifacts_index_pending_tasks"):
+        return await get_pending_tasks(
+            keys=[ARTIFACTS_PENDING_TASKS_KEY],
+            args=[ARTIFACTS_PENDING_KEY_PREFIX],
+        )
+
+
+async def discard(task_id: str):
+    """Drop the pending artifacts of a failed task."""
+    with redis_span("artifacts_index_discard"):
+        pipeline = settings_repository_async().pipeline()
+        pipeline.delete(pending_key(task_id))
+        pipeline.srem(ARTIFACTS_PENDING_TASKS_KEY, task_id)
+        await pipeline.execute()
+
+
+async def commit(task_id: str, invalid_paths: Iterable[str] = ()) -> int:
+    """
+    Move the pending artifacts of a succeeded task to the index.
+
+    Args:
+        task_id: ``add_artifacts`` task id (or group id)
+        invalid_paths: paths not added by the task
+
+    Returns:
+        Number of artifacts indexed.
+    """
+    commit_pending = settings_repository_async().register_script(
+        _COMMIT_PENDING
+    )
+    with redis_span("artifacts_index_commit"):
+        return await commit_pending(
+            keys=[
+                ARTIFACTS_INDEX_KEY,
+                pending_key(task_id),
+                ARTIFACTS_PENDING_TASKS_KEY,
+            ],
+            args=[task_id, *invalid_paths],
+        )
@@ -3,37 +3,71 @@
 #
 # SPDX-License-Identifier: MIT
 
-import json
 import logging
+import os
 import re
+import socket
+import threading
 import time
 from datetime import datetime, timezone
-from threading import Thread
 from typing import Any, Dict, List, Optional
+from uuid import uuid4
 
+import redis
+from celery import states
 from fastapi import HTTPException, status
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from repository_service_tuf_api import (
+    BootstrapState,
     bootstrap_state,
+    bootstrap_state_async,
     get_task_id,
     pre_lock_bootstrap,
     release_bootstrap_lock,
     repository_metadata,
+    result_backend_redis,
+    settings_repository_redis,
 )
 from repository_service_tuf_api.common_models import (
     BaseErrorResponse,
+    BasePayload,
     TUFDelegations,
     TUFSigned,
+    example_schema,
+)
+from repository_service_tuf_api.metrics import (
+    BOOTSTRAP_WATCHER_ERRORS,
+    BOOTSTRAP_WATCHER_LEADER,
+    BOOTSTRAP_WATCHER_NEXT_DEADLINE,
+    BOOTSTRAP_WATCHER_RUNNING,
+    BOOTSTRAP_WATCHER_WATCHED_TASKS,
 )
 
 # Pattern of allowed names to be used by custom target delegated roles
 DELEGATED_NAMES_PATTERN = "[a-zA-Z0-9_-]+"
-
-
-with open("tests/data_examples/bootstrap/payload_bins.json") as f:
-    content = f.read()
-payload_example = json.loads(content)
+# Default bootstrap timeout in seconds
+BOOTSTRAP_TIMEOUT = 300
+# Maximum seconds between the checks of a watched bootstrap task
+BOOTSTRAP_CHECK_INTERVAL = 5
+# Seconds the bootstrap watcher lease is valid without renewal
+BOOTSTRAP_WATCHER_LEASE = 3 * BOOTSTRAP_CHECK_INTERVAL
+# Redis keys (repository settings DB) used by the bootstrap watcher
+BOOTSTRAP_WATCHES_KEY = "RSTUF_API_BOOTSTRAP_WATCHES"
+BOOTSTRAP_WATCHER_LEASE_KEY = "RSTUF_API_BOOTSTRAP_WATCHER_LEASE"
+
+_RENEW_LEASE = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_LEASE = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
 
 
 class Role(BaseModel):
@@ -106,13 +140,17 @@ class Settings(BaseModel):
     roles: RolesData
 
 
-class BootstrapPayload(BaseModel):
-    model_config = ConfigDict(json_schema_extra={"example": payload_example})
+class BootstrapPayload(BasePayload):
+    model_config = ConfigDict(
+        json_schema_extra=example_schema("bootstrap/payload_bins.json")
+    )
     settings: Settings
     # Accept metadata as raw dicts to preserve canonical JSON
     # Don't parse into TUFMetadata model which would reorder keys
     metadata: Dict[str, Dict[str, Any]]
-    timeout: int | None = Field(default=300, description="Timeout in seconds")
+    timeout: int | None = Field(
+        default=BOOTSTRAP_TIMEOUT, description="Timeout in seconds"
+    )
 
     @model_validator(mode="before")
     @classmethod
@@ -185,27 +223,216 @@ class BootstrapGetResponse(BaseModel):
     message: str
 
 
-def _check_bootstrap_status(task_id, timeout):
-    time_timeout = time.time() + timeout
+class BootstrapWatcher:
+    """
+    Watch the bootstrap tasks until they finish or the timeout expires.
+
+    The watched tasks and their deadlines are stored in Redis
+    (``BOOTSTRAP_WATCHES_KEY``), so any API replica can enforce them. Each
+    replica runs one watcher thread, but only the replica holding the lease
+    (``BOOTSTRAP_WATCHER_LEASE_KEY``) watches the tasks. The lease expires if
+    the holder stops renewing it (i.e. the replica is gone) and another
+    replica takes over.
+
+    The lease holder waits for the task state changes published by Celery in
+    the Result Backend (Redis Pub/Sub) and checks the task state only when a
+    change is received or every ``BOOTSTRAP_CHECK_INTERVAL`` seconds.
+
+    If the task fails, the bootstrap lock is released. If the timeout
+    expires, the task is revoked and the bootstrap lock is released.
+    Errors talking to Redis are logged and the watch continues.
+
+    The watcher state (running, lease, watched tasks, next deadline and
+    errors) is exposed in the ``BOOTSTRAP_WATCHER_*`` metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._id = f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:8]}"
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._pubsub: Optional[redis.client.PubSub] = None
+        # task id -> deadline (epoch), as last read from Redis
+        self._watches: Dict[str, float] = {}
+        self._leader = False
+
+    def start(self):
+        """Start the watcher thread, if not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
 
-    while True:
-        task = repository_metadata.AsyncResult(task_id)
-        if task.status == "SUCCESS":
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="bootstrap-watcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the watcher thread and give up the lease."""
+        self._stop.set()
+
+    def watch(self, task_id: str, timeout: int):
+        """
+        Watch a bootstrap task.
+
+        Args:
+            task_id: Bootstrap task id
+            timeout: Seconds until the bootstrap task is revoked
+        """
+        settings_repository_redis().hset(
+            BOOTSTRAP_WATCHES_KEY, task_id, time.time() + timeout
+        )
+        self.start()
+
+    def _acquire_lease(self) -> bool:
+        client = settings_repository_redis()
+        lease_ms = BOOTSTRAP_WATCHER_LEASE * 1000
+        if client.set(
+            BOOTSTRAP_WATCHER_LEASE_KEY, self._id, nx=True, px=lease_ms
+        ):
+            logging.info(f"Bootstrap watcher {self._id} acquired the lease")
+            return True
+
+        renew = client.register_script(_RENEW_LEASE)
+        return bool(
+            renew(
+                keys=[BOOTSTRAP_WATCHER_LEASE_KEY], args=[self._id, lease_ms]
+            )
+        )
+
+    def _release_lease(self):
+        release = settings_repository_redis().register_script(_RELEASE_LEASE)
+        release(keys=[BOOTSTRAP_WATCHER_LEASE_KEY], args=[self._id])
+
+    def _close_pubsub(self):
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def _set_state(self, watches: Dict[str, float], leader: bool):
+        with self._lock:
+            self._watches = watches
+            self._leader = leader
+        BOOTSTRAP_WATCHER_LEADER.set(1 if leader else 0)
+        BOOTSTRAP_WATCHER_WATCHED_TASKS.set(len(watches))
+        BOOTSTRAP_WATCHER_NEXT_DEADLINE.set(min(watches.values(), default=0))
+
+    def _run(self):
+        BOOTSTRAP_WATCHER_RUNNING.set(1)
+        while not self._stop.is_set():
+            try:
+                self._step()
+            except Exception as err:
+                logging.error(f"Bootstrap watcher error: {err}")
+                BOOTSTRAP_WATCHER_ERRORS.inc()
+                self._close_pubsub()
+                self._stop.wait(BOOTSTRAP_CHECK_INTERVAL)
+
+        self._close_pubsub()
+        try:
+            if self._leader:
+                self._release_lease()
+        except Exception as err:
+            logging.error(f"Bootstrap watcher failed to release lease: {err}")
+        self._set_state({}, False)
+        BOOTSTRAP_WATCHER_RUNNING.set(0)
+
+    def _step(self):
+        client = settings_repository_redis()
+        watches = {
+            task_id: float(deadline)
+            for task_id, deadline in client.hgetall(
+                BOOTSTRAP_WATCHES_KEY
+            ).items()
+        }
+        if len(watches) == 0:
+            if self._leader:
+                self._release_lease()
+            self._set_state({}, False)
+            self._close_pubsub()
+            self._stop.wait(BOOTSTRAP_CHECK_INTERVAL)
             return
-        elif task.status == "FAILURE":
-            release_bootstrap_lock()
+
+        if not self._acquire_lease():
+            # Another replica is watching
+            self._set_state(watches, False)
+            self._close_pubsub()
+            self._stop.wait(BOOTSTRAP_CHECK_INTERVAL)
             return
-        else:
-            if time.time() > time_timeout:
-                task.revoke(terminate=True)
-                release_bootstrap_lock()
-                return
 
-            continue
+        self._set_state(watches, True)
+        if self._pubsub is None:
+            self._pubsub = result_backend_redis().pubsub(
+                ignore_subscribe_messages=True
+            )
+
+        backend = repository_metadata.backend
+        channels = {backend.get_key_for_task(task_id) for task_id in watches}
+        new_channels = channels - set(self._pubsub.channels)
+        if new_channels:
+            self._pubsub.subscribe(*new_channels)
+        old_channels = set(self._pubsub.channels) - channels
+        if old_channels:
+            self._pubsub.unsubscribe(*old_channels)
+
+        for task_id, deadline in list(watches.items()):
+            if self._check(task_id, deadline):
+                client.hdel(BOOTSTRAP_WATCHES_KEY, task_id)
+                del watches[task_id]
+
+        self._set_state(watches, True)
+        if len(watches) == 0:
+            return
 
+        # Wait for any state change or the next check. It must be shorter
+        # than the lease to renew it in time.
+        next_deadline = min(watches.values()) - time.time()
+        self._pubsub.get_message(
+            timeout=max(0.1, min(BOOTSTRAP_CHECK_INTERVAL, next_deadline))
+        )
 
-def get_bootstrap() -> BootstrapGetResponse:
-    bs_state = bootstrap_state()
+    def _check(self, task_id: str, deadline: float) -> bool:
+        """
+        Check the bootstrap task.
+
+        Returns:
+            ``True`` if the task does not require to be watched anymore.
+        """
+        task = repository_metadata.AsyncResult(task_id)
+        if task.status == states.SUCCESS:
+            logging.info(f"Bootstrap task {task_id} finished")
+            return True
+
+        elif task.status == states.FAILURE:
+            logging.info(f"Bootstrap task {task_id} failed")
+            release_bootstrap_lock(task_id)
+            return True
+
+        elif time.time() > deadline:
+            logging.info(f"Bootstrap task {task_id} timeout")
+            task.revoke(terminate=True)
+            release_bootstrap_lock(task_id)
+            return True
+
+        return False
+
+
+bootstrap_watcher = BootstrapWatcher()
+
+
+def _check_bootstrap_status(task_id: str, timeout: Optional[int]):
+    """
+    Watch the bootstrap task with the ``bootstrap_watcher`` of any replica.
+    """
+    if timeout is None:
+        timeout = BOOTSTRAP_TIMEOUT
+
+    bootstrap_watcher.watch(task_id, timeout)
+
+
+async def get_bootstrap() -> BootstrapGetResponse:
+    bs_state = await bootstrap_state_async()
     # If bootstrap ceremony has completed, is executed in the moment ("pre")
     # or is in the process of DAS signing ("signing") we consider it as locked.
     if bs_state.bootstrap is True or bs_state.state in ["pre", "signing"]:
@@ -226,23 +453,27 @@ def get_bootstrap() -> BootstrapGetResponse:
     return response
 
 
+def _bootstrap_locked_error(bs_state: BootstrapState) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=BaseErrorResponse(
+            error=f"System already has a Metadata. State: {bs_state.state}"
+        ).dict(exclude_none=True),
+    )
+
+
 def post_bootstrap(payload: BootstrapPayload) -> BootstrapPostResponse:
     bs_state = bootstrap_state()
     # If bootstrap ceremony has completed, is executed in the moment ("pre")
     # or is in the process of DAS signing ("signing") we consider it as locked.
     if bs_state.bootstrap is True or bs_state.state in ["pre", "signing"]:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=BaseErrorResponse(
-                error=(
-                    "System already has a Metadata. "
-                    f"State: {bs_state.state}"
-                )
-            ).dict(exclude_none=True),
-        )
+        raise _bootstrap_locked_error(bs_state)
 
     task_id = get_task_id()
-    pre_lock_bootstrap(task_id)
+    if not pre_lock_bootstrap(task_id):
+        # another bootstrap got the lock after the state check
+        raise _bootstrap_locked_error(bootstrap_state())
+
     repository_metadata.apply_async(
         kwargs={
             "action": "bootstrap",
@@ -254,16 +485,9 @@ def post_bootstrap(payload: BootstrapPayload) -> BootstrapPostResponse:
     )
     logging.info(f"Bootstrap task {task_id} sent")
 
-    # start a thread to check the bootstrap process
+    # watch the bootstrap process
     logging.info(f"Bootstrap process timeout: {payload.timeout} seconds")
-    Thread(
-        None,
-        _check_bootstrap_status,
-        kwargs={
-            "task_id": task_id,
-            "timeout": payload.timeout,
-        },
-    ).start()
+    _check_bootstrap_status(task_id=task_id, timeout=payload.timeout)
 
     data = {
         "task_id": task_id,
@@ -3,12 +3,73 @@
 #
 # SPDX-License-Identifier: MIT
 
+import json
+import logging
 from enum import Enum
-from typing import Any, Dict, List, Literal, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
-from repository_service_tuf_api import settings_repository
+from repository_service_tuf_api import (
+    RepositorySettingsSnapshot,
+    repository_settings,
+)
+from repository_service_tuf_api.metrics import VALIDATION_DURATION
+
+# The OpenAPI examples are the payloads used by the tests
+EXAMPLES_DIR = Path(__file__).parent.parent / "tests" / "data_examples"
+
+
+@lru_cache
+def load_example(name: str) -> Optional[Dict[str, Any]]:
+    """
+    Load an example payload from ``EXAMPLES_DIR``.
+
+    Returns ``None`` if the examples are not available (i.e. not shipped).
+    """
+    try:
+        with open(EXAMPLES_DIR / name) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logging.warning(f"OpenAPI example {name} not available")
+        return None
+
+
+def example_schema(
+    name: str, build: Optional[Callable[[Dict[str, Any]], Any]] = None
+) -> Callable[[Dict[str, Any]], None]:
+    """
+    Model ``json_schema_extra`` adding the example payload ``name``.
+
+    The example is loaded only when the OpenAPI schema is generated.
+
+    Args:
+        name: Example file, relative to ``EXAMPLES_DIR``
+        build: Builds the ``example`` from the loaded payload
+    """
+
+    def json_schema_extra(schema: Dict[str, Any]):
+        example = load_example(name)
+        if example is not None:
+            schema["example"] = example if build is None else build(example)
+
+    return json_schema_extra
+
+
+class BasePayload(BaseModel):
+    """
+    Base of the request payloads.
+
+    The validation time is observed in ``VALIDATION_DURATION`` by model.
+    """
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _observe_validation(cls, data: Any, handler):
+        with VALIDATION_DURATION.labels(model=cls.__name__).time():
+            return handler(data)
 
 
 class Roles(Enum):
@@ -34,14 +95,17 @@ class Roles(Enum):
         return Literal["root", "targets", "snapshot", "timestamp", "bins"]
 
     @staticmethod
-    def online_roles_values() -> List[str]:
+    def online_roles_values(
+        repository: Optional[RepositorySettingsSnapshot] = None,
+    ) -> List[str]:
+        if repository is None:
+            repository = repository_settings("online_roles")
+
         online_roles: List[str] = ["snapshot", "timestamp"]
-        if settings_repository.get_fresh("TARGETS_ONLINE_KEY", True):
+        if repository.targets_online_key:
             online_roles.append("targets")
 
-        delegated_roles: List[str] = settings_repository.get_fresh(
-            "DELEGATED_ROLES_NAMES"
-        )
+        delegated_roles: List[str] = repository.delegated_roles_names
         # All delegated roles names should start with "bins" if we are using
         # hash bin delegation and none of the delegated roles should start with
         # "bins" if we are using custom target delegation.
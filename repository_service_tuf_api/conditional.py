@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Conditional responses (``ETag`` / ``If-None-Match``).
+
+A request with a matching ``If-None-Match`` gets a ``304 Not Modified``
+response without body.
+
+When ``RSTUF_SETTINGS_SNAPSHOT_CACHE`` is enabled, the responses built from
+the repository settings have the settings version (``RSTUF_SETTINGS_VERSION``)
+as ``ETag``: a matching ``If-None-Match`` is answered after reading the
+version, without building the response, and the serialized body is reused
+while the version is unchanged. Otherwise, the ``ETag`` is a digest of the
+response body.
+"""
+
+import hashlib
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+from repository_service_tuf_api import repository_settings_version, settings
+from repository_service_tuf_api.tracing import settings_read
+
+NOT_MODIFIED_RESPONSE = {
+    status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"}
+}
+
+
+def etag(content: bytes) -> str:
+    """Strong ``ETag`` of the content."""
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], tag: str) -> bool:
+    """
+    ``If-None-Match`` comparison (weak, RFC 9110), ``*`` matches any tag.
+    """
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == tag:
+            return True
+
+    return False
+
+
+def _serialize(model: BaseModel) -> bytes:
+    return model.model_dump_json(by_alias=True, exclude_none=True).encode()
+
+
+class ResponseBodyCache:
+    """
+    Process-local serialized response bodies by name and settings version.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bodies: Dict[str, Tuple[int, bytes]] = {}
+
+    def get(
+        self, name: str, version: int, build: Callable[[], BaseModel]
+    ) -> bytes:
+        with self._lock:
+            cached = self._bodies.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        body = _serialize(build())
+        with self._lock:
+            cached = self._bodies.get(name)
+            if cached is None or version >= cached[0]:
+                self._bodies[name] = (version, body)
+
+        return body
+
+
+response_body_cache = ResponseBodyCache()
+
+
+def _response(request: Request, body: bytes, tag: str) -> Response:
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), tag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def conditional_response(
+    request: Request, name: str, build: Callable[[], BaseModel]
+) -> Response:
+    """
+    JSON response of the model (without ``None`` values) with ``ETag``, or
+    ``304 Not Modified`` if the request ``If-None-Match`` matches it.
+
+    Args:
+        request: the request, with the ``If-None-Match`` header
+        name: name of the response, part of the version ``ETag``
+        build: builds the response model from the repository settings
+    """
+    if not settings.get("SETTINGS_SNAPSHOT_CACHE", False):
+        body = _serialize(build())
+        return _response(request, body, etag(body))
+
+    # the version is read before the settings, the body is never older
+    with settings_read("etag"):
+        version = repository_settings_version()
+    tag = f'"{name}-{version}"'
+    if etag_matches(request.headers.get("if-none-match"), tag):
+        return _response(request, b"", tag)
+
+    return _response(
+        request, response_body_cache.get(name, version, build), tag
+    )
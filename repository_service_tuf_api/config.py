@@ -3,7 +3,6 @@
 #
 # SPDX-License-Identifier: MIT
 
-import json
 from datetime import datetime, timezone
 from typing import Any, Dict
 
@@ -14,7 +13,11 @@ from repository_service_tuf_api import (
     bootstrap_state,
     get_task_id,
     repository_metadata,
-    settings_repository,
+    repository_settings,
+)
+from repository_service_tuf_api.common_models import (
+    BasePayload,
+    example_schema,
 )
 
 
@@ -45,16 +48,9 @@ class Settings(BaseModel):
     expiration: Dict[str, int]
 
 
-with open("tests/data_examples/config/update_settings.json") as f:
-    content = f.read()
-put_payload = json.loads(content)
-
-
-class PutPayload(BaseModel):
+class PutPayload(BasePayload):
     model_config = ConfigDict(
-        json_schema_extra={
-            "example": put_payload,
-        }
+        json_schema_extra=example_schema("config/update_settings.json")
     )
 
     settings: Settings
@@ -91,19 +87,12 @@ def put(payload: PutPayload):
     return PutResponse(data=data, message="Settings successfully submitted.")
 
 
-with open("tests/data_examples/config/settings.json") as f:
-    content = f.read()
-example_settings = json.loads(content)
-
-
 class GetResponse(BaseModel):
     model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "data": example_settings,
-                "message": "Current Settings",
-            }
-        }
+        json_schema_extra=example_schema(
+            "config/settings.json",
+            lambda settings: {"data": settings, "message": "Current Settings"},
+        )
     )
     data: Dict[str, Any]
     message: str
@@ -120,10 +109,8 @@ def get() -> GetResponse:
             },
         )
 
-    # Forces all values to be refreshed
-    settings_repository.fresh()
     lower_case_settings = {}
-    for k, v in settings_repository.to_dict().items():
+    for k, v in repository_settings("settings").values.items():
         if isinstance(v, str):
             v = v.lower()
 
@@ -2,7 +2,6 @@
 #
 # SPDX-License-Identifier: MIT
 
-import json
 from datetime import datetime, timezone
 from typing import List
 
@@ -14,11 +13,11 @@ from repository_service_tuf_api import (
     get_task_id,
     repository_metadata,
 )
-from repository_service_tuf_api.common_models import TUFDelegations
-
-with open("tests/data_examples/metadata/delegation-payload.json") as f:
-    content = f.read()
-delegation_payload_example = json.loads(content)
+from repository_service_tuf_api.common_models import (
+    BasePayload,
+    TUFDelegations,
+    example_schema,
+)
 
 
 class ResponseData(BaseModel):
@@ -54,16 +53,16 @@ class DelegationsData(BaseModel):
     roles: List[DelegationRolesData]
 
 
-class MetadataDelegationsPayload(BaseModel):
+class MetadataDelegationsPayload(BasePayload):
     model_config = ConfigDict(
-        json_schema_extra={"example": delegation_payload_example}
+        json_schema_extra=example_schema("metadata/delegation-payload.json")
     )
 
     delegations: TUFDelegations
 
 
 # Metadata Delegation (Delete)
-class MetadataDelegationDeletePayload(BaseModel):
+class MetadataDelegationDeletePayload(BasePayload):
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -0,0 +1,236 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+
+"""
+``Idempotency-Key`` support for the endpoints creating tasks.
+
+Only the endpoints creating tasks (``202 Accepted``), registered with
+``register_idempotent_route``, handle the key.
+
+The first request with a key reserves it in the repository settings Redis
+for ``RSTUF_IDEMPOTENCY_LOCK_TTL`` seconds, renewed while the request is
+processed. Its response, if the task was accepted (``202 Accepted``) or the
+endpoint submitted tasks before failing (``store_response``), is stored with
+the ``RSTUF_IDEMPOTENCY_TTL`` and the retries with the same key get the
+original response (and task ids) without sending new tasks. Other responses
+release the key, so the request can be retried.
+
+The stored response has the digest of the request body, hashed while the
+endpoint reads it (the streamed bodies are not buffered). A retry with the
+same key and a different body gets ``422 Unprocessable Entity``.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+from typing import Set, Tuple
+
+from fastapi import Request, status
+
+from repository_service_tuf_api import settings, settings_repository_async
+from repository_service_tuf_api.tracing import redis_span
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+IDEMPOTENCY_KEY_PREFIX = "RSTUF_API_IDEMPOTENCY_"
+# Seconds to store the accepted responses
+IDEMPOTENCY_TTL = 24 * 60 * 60
+# Seconds to keep the key reserved by a request still being processed,
+# renewed every third of it
+IDEMPOTENCY_LOCK_TTL = 60
+# Request state flag to store a response other than ``202 Accepted``
+IDEMPOTENCY_STORE_STATE = "idempotency_store"
+
+# Methods and full paths of the endpoints creating tasks
+IDEMPOTENT_ROUTES: Set[Tuple[str, str]] = set()
+
+
+def register_idempotent_route(route, prefix: str):
+    """
+    Register the route included with prefix if it creates tasks
+    (``202 Accepted``).
+    """
+    if getattr(route, "status_code", None) != status.HTTP_202_ACCEPTED:
+        return
+
+    for method in route.methods:
+        IDEMPOTENT_ROUTES.add((method, f"{prefix}{route.path}"))
+
+
+def store_response(request: Request):
+    """
+    Store the response of the request even if not ``202 Accepted``, as the
+    endpoint already submitted tasks (e.g. a stream failing after the first
+    chunks).
+    """
+    request.state.idempotency_store = True
+
+
+def idempotency_key(method: str, path: str, key: str) -> str:
+    """Redis key of an ``Idempotency-Key`` in an endpoint."""
+    digest = hashlib.sha256(f"{method} {path} {key}".encode()).hexdigest()
+    return f"{IDEMPOTENCY_KEY_PREFIX}{digest}"
+
+
+async def _send_json(send, status_code: int, body: bytes, headers=None):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *(headers or []),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _renew_lock(client, redis_key: str, lock_ttl: int):
+    """Renew the reservation of the key while the request is processed."""
+    while True:
+        await asyncio.sleep(lock_ttl / 3)
+        try:
+            with redis_span("idempotency_renew"):
+                await client.expire(redis_key, lock_ttl)
+        except Exception as err:
+            logging.warning(f"Idempotency-Key not renewed {redis_key}: {err}")
+
+
+class _BodyDigest:
+    """SHA-256 of the request body, updated by the ``receive`` calls."""
+
+    def __init__(self, receive):
+        self._receive = receive
+        self._digest = hashlib.sha256()
+        self.complete = False
+
+    async def receive(self):
+        message = await self._receive()
+        if message["type"] == "http.request":
+            self._digest.update(message.get("body", b""))
+            if not message.get("more_body", False):
+                self.complete = True
+        elif message["type"] == "http.disconnect":
+            self.complete = True
+
+        return message
+
+    async def hexdigest(self) -> str:
+        """Digest of the whole body, reading the body not read yet."""
+        while not self.complete:
+            await self.receive()
+
+        return self._digest.hexdigest()
+
+
+def _error(message: str, error: str) -> bytes:
+    return json.dumps(
+        {"detail": {"message": message, "error": error}}
+    ).encode()
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware handling the ``Idempotency-Key`` header.
+
+    A retry while the original request is still processed gets
+    ``409 Conflict``, and a retry with a different body gets
+    ``422 Unprocessable Entity``. The replayed responses have the header
+    ``Idempotent-Replayed: true``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or (scope["method"], scope["path"]) not in IDEMPOTENT_ROUTES
+        ):
+            return await self.app(scope, receive, send)
+
+        key = dict(scope["headers"]).get(IDEMPOTENCY_HEADER, b"").strip()
+        if not key:
+            return await self.app(scope, receive, send)
+
+        redis_key = idempotency_key(
+            scope["method"], scope["path"], key.decode("latin-1")
+        )
+        client = settings_repository_async()
+        lock_ttl = settings.get("IDEMPOTENCY_LOCK_TTL", IDEMPOTENCY_LOCK_TTL)
+        with redis_span("idempotency_reserve"):
+            reserved = await client.set(redis_key, b"", nx=True, ex=lock_ttl)
+
+        if not reserved:
+            with redis_span("idempotency_get"):
+                stored = await client.get(redis_key)
+            if not stored:
+                body = _error(
+                    "Request not accepted.",
+                    "A request with the same Idempotency-Key is in progress",
+                )
+                return await _send_json(send, status.HTTP_409_CONFLICT, body)
+
+            response = json.loads(stored)
+            digest = await _BodyDigest(receive).hexdigest()
+            if response.get("digest", digest) != digest:
+                body = _error(
+                    "Request not accepted.",
+                    "Idempotency-Key already used with a different body",
+                )
+                return await _send_json(
+                    send, status.HTTP_422_UNPROCESSABLE_ENTITY, body
+                )
+
+            return await _send_json(
+                send,
+                response["status"],
+                response["body"].encode(),
+                [(b"idempotent-replayed", b"true")],
+            )
+
+        response = {"status": None, "body": b""}
+        body_digest = _BodyDigest(receive)
+        state = scope.setdefault("state", {})
+        renew = asyncio.create_task(_renew_lock(client, redis_key, lock_ttl))
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+
+            await send(message)
+
+        try:
+            await self.app(scope, body_digest.receive, send_wrapper)
+        finally:
+            renew.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await renew
+
+            if response["status"] == status.HTTP_202_ACCEPTED or (
+                response["status"] is not None
+                and state.get(IDEMPOTENCY_STORE_STATE)
+            ):
+                stored = json.dumps(
+                    {
+                        "status": response["status"],
+                        "body": response["body"].decode(),
+                        "digest": await body_digest.hexdigest(),
+                    }
+                )
+                with redis_span("idempotency_store"):
+                    await client.set(
+                        redis_key,
+                        stored,
+                        ex=settings.get("IDEMPOTENCY_TTL", IDEMPOTENCY_TTL),
+                    )
+            else:
+                logging.debug(f"Idempotency-Key released: {redis_key}")
+                with redis_span("idempotency_release"):
+                    await client.delete(redis_key)
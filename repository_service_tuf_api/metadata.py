@@ -3,10 +3,10 @@
 #
 # SPDX-License-Identifier: MIT
 
-import json
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
+from dynaconf.utils.parse_conf import parse_conf_data
 from fastapi import HTTPException, status
 from pydantic import BaseModel, ConfigDict
 
@@ -14,34 +14,27 @@ from repository_service_tuf_api import (
     bootstrap_state,
     get_task_id,
     repository_metadata,
-    settings_repository,
+    repository_settings,
+    settings_repository_key,
+    settings_repository_redis,
 )
 from repository_service_tuf_api.common_models import (
+    BasePayload,
     Roles,
     TUFDelegations,
     TUFMetadata,
     TUFSignatures,
+    example_schema,
 )
-
-with open("tests/data_examples/metadata/update-root-payload.json") as f:
-    content = f.read()
-update_payload_example = json.loads(content)
-
-with open("tests/data_examples/bootstrap/das-payload.json") as f:
-    content = f.read()
-das_payload_example = json.loads(content)
-
-with open("tests/data_examples/metadata/delegation-payload.json") as f:
-    content = f.read()
-delegation_payload_example = json.loads(content)
+from repository_service_tuf_api.tracing import settings_read
 
 
 #
 # Metadata Update
 #
-class MetadataPostPayload(BaseModel):
+class MetadataPostPayload(BasePayload):
     model_config = ConfigDict(
-        json_schema_extra={"example": update_payload_example}
+        json_schema_extra=example_schema("metadata/update-root-payload.json")
     )
 
     metadata: Dict[Literal[Roles.ROOT.value], TUFMetadata]
@@ -113,16 +106,16 @@ class DelegationsData(BaseModel):
     roles: List[DelegationRolesData]
 
 
-class MetadataDelegationsPayload(BaseModel):
+class MetadataDelegationsPayload(BasePayload):
     model_config = ConfigDict(
-        json_schema_extra={"example": delegation_payload_example}
+        json_schema_extra=example_schema("metadata/delegation-payload.json")
     )
 
     delegations: TUFDelegations
 
 
 # Metadata Delegation (Delete)
-class MetadataDelegationDeletePayload(BaseModel):
+class MetadataDelegationDeletePayload(BasePayload):
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -137,7 +130,7 @@ class MetadataDelegationDeletePayload(BaseModel):
 #
 # Metadata Online Bump
 #
-class MetadataOnlinePostPayload(BaseModel):
+class MetadataOnlinePostPayload(BasePayload):
     roles: List[str]
 
     model_config = ConfigDict(
@@ -179,9 +172,8 @@ def post_metadata_online(
 
     roles = payload.roles
     targets_in = "targets" in roles
-    settings_repository.reload()
-    targets_online = settings_repository.get_fresh("TARGETS_ONLINE_KEY", True)
-    if targets_in and not targets_online:
+    repository = repository_settings("metadata_online")
+    if targets_in and not repository.targets_online_key:
         raise HTTPException(
             status.HTTP_404_NOT_FOUND,
             detail={
@@ -192,7 +184,7 @@ def post_metadata_online(
             },
         )
 
-    delegated_roles = settings_repository.get_fresh("DELEGATED_ROLES_NAMES")
+    delegated_roles = repository.delegated_roles_names
     # All delegated roles names should start with "bins" if we are using
     # hash bin delegation and none of the delegated roles should start with
     # "bins" if we are using custom target delegation.
@@ -225,7 +217,7 @@ def post_metadata_online(
 
     # If no roles are provided, then bump all.
     if len(payload.roles) == 0:
-        payload.roles = Roles.online_roles_values()
+        payload.roles = Roles.online_roles_values(repository)
 
     task_id = get_task_id()
     repository_metadata.apply_async(
@@ -261,20 +253,85 @@ class SigningData(BaseModel):
 
 class MetadataSignGetResponse(BaseModel):
     model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "data": {
-                    "metadata": {
-                        "root": das_payload_example["metadata"]["root"]
-                    }
-                }
-            }
-        }
+        json_schema_extra=example_schema(
+            "bootstrap/das-payload.json",
+            lambda das_payload: {
+                "data": {"metadata": {"root": das_payload["metadata"]["root"]}}
+            },
+        )
     )
     data: SigningData | None = None
     message: str
 
 
+# Gets the roles pending signing, the ``<ROLE>_SIGNING`` fields of the
+# settings KEYS[1], with their metadata. Adds ``TRUSTED_ROOT`` if root is
+# pending, and ``TRUSTED_TARGETS`` if other roles are pending.
+_PENDING_SIGNING = """
+local roles = {}
+for _, field in ipairs(redis.call("HKEYS", KEYS[1])) do
+    local role = string.match(field, "^(.+)_SIGNING$")
+    if role then
+        table.insert(roles, string.lower(role))
+    end
+end
+if #roles == 0 then
+    return {}
+end
+local fields = {}
+local root, others = false, false
+for i, role in ipairs(roles) do
+    fields[i] = string.upper(role) .. "_SIGNING"
+    if role == "root" then root = true else others = true end
+end
+local trusted = {false, false}
+if root then
+    trusted[1] = redis.call("HGET", KEYS[1], "TRUSTED_ROOT")
+end
+if others then
+    trusted[2] = redis.call("HGET", KEYS[1], "TRUSTED_TARGETS")
+end
+return {roles, redis.call("HMGET", KEYS[1], unpack(fields)), trusted}
+"""
+
+
+def _parse_setting(value: Optional[str]) -> Any:
+    # same parsing used by the Dynaconf Redis loader
+    return None if value is None else parse_conf_data(value, tomlfy=True)
+
+
+def pending_signing() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Metadata pending signing, in one Redis round trip.
+
+    Returns:
+        The metadata pending signing by role, and the trusted root and
+        trusted targets metadata (if available) required to sign them.
+    """
+    pending = settings_repository_redis().register_script(_PENDING_SIGNING)
+    with settings_read("metadata_sign"):
+        result = pending(keys=[settings_repository_key()])
+    if len(result) == 0:
+        return {}, {}
+
+    roles, values, (trusted_root, trusted_targets) = result
+    signing = {}
+    for role, value in zip(roles, values):
+        metadata = _parse_setting(value)
+        if metadata is not None:
+            signing[role] = metadata
+    trusted = {
+        name: _parse_setting(value)
+        for name, value in [
+            ("trusted_root", trusted_root),
+            ("trusted_targets", trusted_targets),
+        ]
+        if value
+    }
+
+    return signing, trusted
+
+
 def get_metadata_sign() -> MetadataSignGetResponse:
     bs_state = bootstrap_state()
     # Adds support only when bootstrap is signing state
@@ -289,31 +346,18 @@ def get_metadata_sign() -> MetadataSignGetResponse:
             },
         )
 
-    settings_repository.reload()
-    pending_signing = list(
-        filter(lambda var: "SIGNING" in var, dir(settings_repository))
-    )
-
-    md_response = {}
-    for role_setting in pending_signing:
-        signing_role_obj = settings_repository.get(role_setting)
-        if signing_role_obj is not None:
-            signing_role_dict = signing_role_obj.to_dict()
-            role = role_setting.split("_")[0].lower()
-            md_response[role] = signing_role_dict
+    md_response, trusted = pending_signing()
 
     if len(md_response) > 0:
         # Add trusted_root and trusted_targets only when they are pending.
-        trusted_root = settings_repository.get("TRUSTED_ROOT")
-        trusted_targets = settings_repository.get("TRUSTED_TARGETS")
-        if trusted_root and "root" in md_response:
-            md_response["trusted_root"] = trusted_root.to_dict()
+        if trusted.get("trusted_root") and "root" in md_response:
+            md_response["trusted_root"] = trusted["trusted_root"]
 
         if any(
             role["signed"]["_type"] == "targets"
             for role in md_response.values()
         ):
-            md_response["trusted_targets"] = trusted_targets.to_dict()
+            md_response["trusted_targets"] = trusted.get("trusted_targets")
 
         data = {"metadata": md_response}
         msg = "Metadata role(s) pending signing"
@@ -339,7 +383,7 @@ class MetadataSignPostResponse(BaseModel):
     message: str
 
 
-class MetadataSignPostPayload(BaseModel):
+class MetadataSignPostPayload(BasePayload):
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -407,7 +451,7 @@ def post_metadata_sign(
 
 
 # Metadata Sign (Delete)
-class MetadataSignDeletePayload(BaseModel):
+class MetadataSignDeletePayload(BasePayload):
     model_config = ConfigDict(json_schema_extra={"example": {"role": "root"}})
     role: str
 
@@ -430,8 +474,9 @@ class MetadataSignDeleteResponse(BaseModel):
 
 def delete_metadata_sign(payload: MetadataSignDeletePayload):
     role = payload.role
-    settings_repository.reload()
-    signing_status = settings_repository.get_fresh(f"{role.upper()}_SIGNING")
+    signing_status = repository_settings("metadata_sign").get(
+        f"{role.upper()}_SIGNING"
+    )
     if signing_status is None:
         raise HTTPException(
             status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Prometheus metrics.
+
+With several processes (i.e. ``uvicorn --workers``), set the environment
+variable ``PROMETHEUS_MULTIPROC_DIR`` to an empty directory shared by the
+processes, and the metrics are aggregated from all of them.
+"""
+
+import os
+import time
+from typing import Dict
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+
+REQUEST_DURATION = Histogram(
+    "rstuf_api_request_duration_seconds",
+    "Time to start the response of a request, by route",
+    ["method", "route", "status"],
+)
+REDIS_SETTINGS_READ_DURATION = Histogram(
+    "rstuf_api_redis_settings_read_duration_seconds",
+    "Time to read the repository settings from Redis, by read",
+    ["read"],
+)
+CELERY_PUBLISH_DURATION = Histogram(
+    "rstuf_api_celery_publish_duration_seconds",
+    "Time to publish a task to the broker, by task action",
+    ["action"],
+)
+VALIDATION_DURATION = Histogram(
+    "rstuf_api_validation_duration_seconds",
+    "Time to validate a payload, by payload model",
+    ["model"],
+)
+REDIS_POOL_CONNECTIONS = Gauge(
+    "rstuf_api_redis_pool_connections",
+    "Connections of the Redis pools, by pool and state (open, in_use)",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+REDIS_POOL_WAIT_DURATION = Histogram(
+    "rstuf_api_redis_pool_wait_duration_seconds",
+    "Time to get a connection from a Redis pool, by pool",
+    ["pool"],
+)
+BOOTSTRAP_WATCHER_RUNNING = Gauge(
+    "rstuf_api_bootstrap_watcher_running",
+    "Processes running the bootstrap watcher",
+    multiprocess_mode="livesum",
+)
+BOOTSTRAP_WATCHER_LEADER = Gauge(
+    "rstuf_api_bootstrap_watcher_leader",
+    "Processes holding the bootstrap watcher lease",
+    multiprocess_mode="livesum",
+)
+BOOTSTRAP_WATCHER_WATCHED_TASKS = Gauge(
+    "rstuf_api_bootstrap_watcher_watched_tasks",
+    "Bootstrap tasks watched, as last read from Redis",
+    multiprocess_mode="livemax",
+)
+BOOTSTRAP_WATCHER_NEXT_DEADLINE = Gauge(
+    "rstuf_api_bootstrap_watcher_next_deadline_timestamp_seconds",
+    "Deadline of the next watched bootstrap task (0 if none)",
+    multiprocess_mode="livemax",
+)
+BOOTSTRAP_WATCHER_ERRORS = Counter(
+    "rstuf_api_bootstrap_watcher_errors",
+    "Errors of the bootstrap watcher",
+)
+
+# Path templates of the routes included with a prefix, by route object id
+ROUTE_TEMPLATES: Dict[int, str] = {}
+
+
+def register_route_template(route, prefix: str):
+    """Register the full path template of a route included with prefix."""
+    ROUTE_TEMPLATES[id(route)] = f"{prefix}{route.path}"
+
+
+def route_template(scope) -> str:
+    """Path template of the route matched by the request, or ``unmatched``"""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+
+    return ROUTE_TEMPLATES.get(id(route), route.path)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware measuring the requests in ``REQUEST_DURATION``.
+
+    The route is the path template of the matched route (e.g.
+    ``/api/v1/task/``), or ``unmatched``, to keep the labels bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                REQUEST_DURATION.labels(
+                    method=scope["method"],
+                    route=route_template(scope),
+                    status=message["status"],
+                ).observe(time.perf_counter() - start)
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def metrics(request: Request) -> Response:
+    """``/metrics`` endpoint, in the Prometheus text format."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
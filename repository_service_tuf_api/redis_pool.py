@@ -0,0 +1,237 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Shared Redis connection pools.
+
+All the Redis clients of the API (repository settings with Dynaconf, Celery
+Result Backend, locks, indexes and subscribers) use the pools of
+``RedisPools``: one blocking pool by Redis DB and responses decoding, and for
+``redis.asyncio`` one by event loop. A client waits up to
+``RSTUF_REDIS_POOL_TIMEOUT`` seconds for a connection when the
+``RSTUF_REDIS_POOL_MAX_CONNECTIONS`` of the pool are in use.
+
+The pools connections and the waits are measured in
+``REDIS_POOL_CONNECTIONS`` and ``REDIS_POOL_WAIT_DURATION`` by pool
+(``db<DB>``, ``db<DB>-async``).
+"""
+
+import asyncio
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+import redis
+import redis.asyncio
+from celery.backends.redis import RedisBackend
+
+from repository_service_tuf_api.metrics import (
+    REDIS_POOL_CONNECTIONS,
+    REDIS_POOL_WAIT_DURATION,
+)
+
+
+@dataclass
+class RedisPoolConfig:
+    host: str
+    port: int = 6379
+    unix_socket_path: Optional[str] = None
+    max_connections: int = 50
+    timeout: Optional[float] = 5
+    socket_timeout: Optional[float] = None
+    socket_connect_timeout: Optional[float] = 5
+    health_check_interval: int = 30
+
+    @classmethod
+    def from_settings(cls, settings) -> "RedisPoolConfig":
+        return cls(
+            host=settings.REDIS_SERVER.split("redis://")[1],
+            port=settings.get("REDIS_SERVER_PORT", 6379),
+            unix_socket_path=settings.get("REDIS_UNIX_SOCKET") or None,
+            max_connections=settings.get("REDIS_POOL_MAX_CONNECTIONS", 50),
+            timeout=settings.get("REDIS_POOL_TIMEOUT", 5),
+            socket_timeout=settings.get("REDIS_SOCKET_TIMEOUT"),
+            socket_connect_timeout=settings.get(
+                "REDIS_SOCKET_CONNECT_TIMEOUT", 5
+            ),
+            health_check_interval=settings.get(
+                "REDIS_HEALTH_CHECK_INTERVAL", 30
+            ),
+        )
+
+    def pool_kwargs(self, db: int, decode_responses: bool) -> Dict[str, Any]:
+        """Connection pool arguments, except the connection class."""
+        kwargs: Dict[str, Any] = {
+            "max_connections": self.max_connections,
+            "timeout": self.timeout,
+            "db": db,
+            "decode_responses": decode_responses,
+            "socket_timeout": self.socket_timeout,
+            "socket_connect_timeout": self.socket_connect_timeout,
+            "health_check_interval": self.health_check_interval,
+        }
+        if self.unix_socket_path:
+            kwargs["path"] = self.unix_socket_path
+        else:
+            kwargs["host"] = self.host
+            kwargs["port"] = self.port
+
+        return kwargs
+
+
+class MeteredBlockingConnectionPool(redis.BlockingConnectionPool):
+    """``redis.BlockingConnectionPool`` measuring its connections."""
+
+    def __init__(self, name: str, **kwargs):
+        self.name = name
+        # connections given by ``get_connection`` and not released yet. The
+        # connections failing to connect are released without being given.
+        self._given: Set[Any] = set()
+        super().__init__(**kwargs)
+
+    def get_connection(self, *args, **kwargs):
+        with REDIS_POOL_WAIT_DURATION.labels(pool=self.name).time():
+            connection = super().get_connection(*args, **kwargs)
+        self._given.add(connection)
+        REDIS_POOL_CONNECTIONS.labels(pool=self.name, state="in_use").inc()
+
+        return connection
+
+    def release(self, connection):
+        if connection in self._given:
+            self._given.discard(connection)
+            REDIS_POOL_CONNECTIONS.labels(pool=self.name, state="in_use").dec()
+        super().release(connection)
+
+    def make_connection(self):
+        REDIS_POOL_CONNECTIONS.labels(pool=self.name, state="open").inc()
+        return super().make_connection()
+
+    def reset(self):
+        # the connections are dropped (i.e. after a fork)
+        opened = len(getattr(self, "_connections", []))
+        REDIS_POOL_CONNECTIONS.labels(pool=self.name, state="open").dec(opened)
+        super().reset()
+
+
+class MeteredAsyncBlockingConnectionPool(redis.asyncio.BlockingConnectionPool):
+    """``redis.asyncio.BlockingConnectionPool`` measuring its connections."""
+
+    def __init__(self, name: str, **kwargs):
+        self.name = name
+        # connections given by ``get_connection`` and not released yet. The
+        # connections failing to connect are released without being given.
+        self._given: Set[Any] = set()
+        super().__init__(**kwargs)
+
+    async def get_connection(self, *args, **kwargs):
+        with REDIS_POOL_WAIT_DURATION.labels(pool=self.name).time():
+            connection = await super().get_connection(*args, **kwargs)
+        self._given.add(connection)
+        REDIS_POOL_CONNECTIONS.labels(pool=self.name, state="in_use").inc()
+
+        return connection
+
+    async def release(self, connection):
+        if connection in self._given:
+            self._given.discard(connection)
+            REDIS_POOL_CONNECTIONS.labels(pool=self.name, state="in_use").dec()
+        await super().release(connection)
+
+    def make_connection(self):
+        REDIS_POOL_CONNECTIONS.labels(pool=self.name, state="open").inc()
+        return super().make_connection()
+
+    def reset(self):
+        opened = len(getattr(self, "_available_connections", [])) + len(
+            getattr(self, "_in_use_connections", [])
+        )
+        REDIS_POOL_CONNECTIONS.labels(pool=self.name, state="open").dec(opened)
+        super().reset()
+
+
+class RedisPools:
+    """
+    Redis connection pools and clients shared by the process.
+
+    The pools are created on first use, by Redis DB and responses decoding.
+    The ``redis.asyncio`` connections can only be used by the event loop that
+    created them, so the asyncio pools are also by event loop.
+    """
+
+    def __init__(self, config: RedisPoolConfig):
+        self.config = config
+        self._lock = threading.Lock()
+        self._pools: Dict[Tuple[int, bool], redis.BlockingConnectionPool] = {}
+        self._clients: Dict[Tuple[int, bool], redis.Redis] = {}
+        self._async_clients: weakref.WeakKeyDictionary = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def pool(
+        self, db: int, decode_responses: bool = False
+    ) -> redis.BlockingConnectionPool:
+        """Connection pool of the Redis ``db``."""
+        key = (db, decode_responses)
+        with self._lock:
+            if key not in self._pools:
+                kwargs = self.config.pool_kwargs(db, decode_responses)
+                if "path" in kwargs:
+                    kwargs["connection_class"] = (
+                        redis.UnixDomainSocketConnection
+                    )
+                self._pools[key] = MeteredBlockingConnectionPool(
+                    name=f"db{db}", **kwargs
+                )
+
+            return self._pools[key]
+
+    def client(self, db: int, decode_responses: bool = False) -> redis.Redis:
+        """Redis client of the Redis ``db`` pool."""
+        key = (db, decode_responses)
+        pool = self.pool(db, decode_responses)
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = redis.Redis(connection_pool=pool)
+
+            return self._clients[key]
+
+    def async_client(
+        self, db: int, decode_responses: bool = False
+    ) -> redis.asyncio.Redis:
+        """``redis.asyncio`` client of the Redis ``db`` running loop pool."""
+        clients: Dict[Tuple[int, bool], redis.asyncio.Redis] = (
+            self._async_clients.setdefault(asyncio.get_running_loop(), {})
+        )
+        key = (db, decode_responses)
+        if key not in clients:
+            kwargs = self.config.pool_kwargs(db, decode_responses)
+            if "path" in kwargs:
+                kwargs["connection_class"] = (
+                    redis.asyncio.UnixDomainSocketConnection
+                )
+            pool = MeteredAsyncBlockingConnectionPool(
+                name=f"db{db}-async", **kwargs
+            )
+            clients[key] = redis.asyncio.Redis(connection_pool=pool)
+
+        return clients[key]
+
+
+class PooledRedisBackend(RedisBackend):
+    """
+    Celery Redis Result Backend using the shared ``RedisPools`` pool.
+
+    Configured as ``result_backend`` with the
+    ``repository_service_tuf_api.redis_pool:PooledRedisBackend+redis://...``
+    URL. The URL only selects the DB, the connection parameters are the
+    ``RedisPoolConfig``.
+    """
+
+    def _get_pool(self, **params):
+        # the package creates the pools from the settings
+        from repository_service_tuf_api import redis_pools
+
+        return redis_pools.pool(int(params.get("db") or 0))
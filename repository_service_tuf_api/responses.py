@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+
+"""
+JSON responses of the API routes.
+
+By default FastAPI serializes the ``response_model`` of a route with Pydantic
+directly to JSON bytes. A custom default response class disables it: the
+response model is dumped to Python objects and rendered by the response
+class. ``ORJSONResponse`` renders them with ``orjson`` and is used as default
+response class if ``RSTUF_ORJSON_RESPONSES`` is enabled, which requires the
+``orjson`` package.
+
+Compare the serialization of the large responses with
+``python -m tests.benchmarks.serialization``.
+"""
+
+import logging
+from typing import Any
+
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover -- optional
+    orjson = None
+
+
+class ORJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with ``orjson``."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def default_response_class(enabled: bool) -> type | DefaultPlaceholder:
+    """
+    Default response class of the API routes.
+
+    Args:
+        enabled: use ``ORJSONResponse`` (``RSTUF_ORJSON_RESPONSES``).
+
+    Returns:
+        ``ORJSONResponse`` if enabled and ``orjson`` is installed, otherwise
+        the FastAPI default (Pydantic serialization).
+    """
+    if enabled:
+        if orjson is not None:
+            return ORJSONResponse
+
+        logging.error("ORJSON responses requires 'orjson', disabled")
+
+    return Default(JSONResponse)
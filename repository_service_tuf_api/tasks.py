@@ -3,14 +3,23 @@
 #
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import contextlib
 import enum
+import logging
+import weakref
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
 from celery import states
 from pydantic import BaseModel, ConfigDict, Field
 
-from repository_service_tuf_api import repository_metadata
+from repository_service_tuf_api import (
+    artifacts_index,
+    repository_metadata,
+    result_backend_async,
+)
+from repository_service_tuf_api.common_models import BasePayload
 
 
 class TaskState(str, enum.Enum):
@@ -41,8 +50,62 @@ class TaskName(str, enum.Enum):
     DELETE_SIGN_METADATA = "delete_sign_metadata"
 
 
+# States of a ready task (a Celery SUCCESS task can be ERRORED)
+READY_STATES = [
+    TaskState.SUCCESS,
+    TaskState.FAILURE,
+    TaskState.REVOKED,
+    TaskState.ERRORED,
+]
+# Maximum number of task ids in a bulk request
+BULK_MAX_TASKS = 1000
+# Maximum number of seconds to wait for a task to be ready
+MAX_WAIT = 60
+# Seconds between keep-alive comments in the tasks state stream
+STREAM_KEEP_ALIVE = 15
+# Maximum of task state messages buffered by subscriber
+TASK_STATE_QUEUE_SIZE = 1000
+# Default seconds between the updates of the artifacts index
+ARTIFACTS_INDEX_INTERVAL = 5
+
+
 class GetParameters(BaseModel):
     task_id: str
+    wait: int = Field(
+        default=0,
+        ge=0,
+        le=MAX_WAIT,
+        description=(
+            "Seconds to wait for the task to be ready (`SUCCESS`, `FAILURE` "
+            "or `REVOKED`) before responding. The response is sent as soon as "
+            "the task is ready or when the time expires. Default: 0 (no wait)"
+        ),
+    )
+
+
+class StreamParameters(BaseModel):
+    task_id: List[str] = Field(
+        default=[],
+        max_length=BULK_MAX_TASKS,
+        description=(
+            "Task ID to stream. Use it multiple times for many tasks. "
+            "If not given, all tasks are streamed."
+        ),
+    )
+
+
+class BulkPayload(BasePayload):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "task_ids": [
+                    "33e66671dcc84cdfa2535a1eb030104c",
+                    "06ee6db3cbab4b26be505352c2f2e2c3",
+                ]
+            }
+        }
+    )
+    task_ids: List[str] = Field(min_length=1, max_length=BULK_MAX_TASKS)
 
 
 class TaskResult(BaseModel):
@@ -120,30 +183,584 @@ class Response(BaseModel):
     message: str | None = None
 
 
-def get(task_id: str) -> Response:
+class BulkResponse(BaseModel):
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "data": {
+                    "33e66671dcc84cdfa2535a1eb030104c": {
+                        "task_id": "33e66671dcc84cdfa2535a1eb030104c",
+                        "state": TaskState.SUCCESS,
+                        "result": {
+                            "task": TaskName.ADD_ARTIFACTS,
+                            "status": True,
+                            "last_update": "2023-11-17T09:54:15.762882",
+                            "message": "Artifact(s) Added",
+                            "details": {
+                                "added_artifacts": ["file1.tar.gz"],
+                                "invalid_paths": [],
+                                "target_roles": ["bins-3"],
+                            },
+                        },
+                    },
+                    "06ee6db3cbab4b26be505352c2f2e2c3": {
+                        "task_id": "06ee6db3cbab4b26be505352c2f2e2c3",
+                        "state": TaskState.PENDING,
+                    },
+                },
+                "message": "Tasks state.",
+            }
+        }
+    )
+    data: Dict[str, TasksData]
+    message: str | None = None
+
+
+def _decode_meta(meta: bytes | None) -> Dict[str, Any]:
+    if meta is None:
+        return {"status": states.PENDING, "result": None}
+
+    return repository_metadata.backend.decode_result(meta)
+
+
+async def get_task_meta(task_id: str) -> Dict[str, Any]:
+    """
+    Get the task meta (``status`` and ``result``) from Result Backend Server.
+
+    Reads the Celery Redis Result Backend key of the task using
+    ``redis.asyncio`` and decodes it using the Celery backend of
+    ``repository_service_tuf_api.repository_metadata``.
+
+    Args:
+        task_id: Task ID
+
+    Returns:
+        Task meta. Unknown tasks are ``PENDING``, as in Celery ``AsyncResult``
+    """
+    backend = repository_metadata.backend
+    meta = await result_backend_async().get(backend.get_key_for_task(task_id))
+
+    return _decode_meta(meta)
+
+
+async def get_task_metas(task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get many tasks meta from Result Backend Server in one ``MGET``.
+
+    Args:
+        task_ids: List of Task IDs
+
+    Returns:
+        Task meta by task id, as in ``get_task_meta``
+    """
+    backend = repository_metadata.backend
+    metas = await result_backend_async().mget(
+        [backend.get_key_for_task(task_id) for task_id in task_ids]
+    )
+
+    return {
+        task_id: _decode_meta(meta) for task_id, meta in zip(task_ids, metas)
+    }
+
+
+async def get_group_tasks(group_id: str) -> Optional[List[str]]:
+    """
+    Get the tasks ids of a group from Result Backend Server.
+
+    Args:
+        group_id: Group ID, as sent by ``celery.group``
+
+    Returns:
+        Tasks IDs of the group or ``None`` if it is not a (known) group
+    """
+    backend = repository_metadata.backend
+    meta = await result_backend_async().get(
+        backend.get_key_for_group(group_id)
+    )
+    if meta is None:
+        return None
+
+    # GroupResult.as_tuple(): ((group id, parent), [((task id, parent), _)])
+    group_tuple = backend.decode(meta)["result"]
+    return [task_tuple[0][0] for task_tuple in group_tuple[1]]
+
+
+class TaskStateQueue(asyncio.Queue):
+    """
+    Bounded queue of task meta messages of a ``TaskStateWatcher`` subscriber.
+
+    When full, the oldest message is dropped and counted in ``dropped``, so a
+    slow subscriber does not buffer the messages without limit. The
+    subscriber must read the current state again if messages were dropped.
+    """
+
+    def __init__(self, maxsize: int = TASK_STATE_QUEUE_SIZE):
+        super().__init__(maxsize)
+        self.dropped = 0
+
+    def put_latest(self, item: Any):
+        if self.full():
+            self.get_nowait()
+            self.dropped += 1
+
+        self.put_nowait(item)
+
+    def clear(self) -> bool:
+        """
+        Discard the buffered messages.
+
+        Returns:
+            ``True`` if messages were dropped since the last clear.
+        """
+        while not self.empty():
+            self.get_nowait()
+        dropped, self.dropped = self.dropped > 0, 0
+
+        return dropped
+
+
+class TaskStateWatcher:
+    """
+    Watch the tasks state changes in the Result Backend.
+
+    Celery publishes the task meta in a channel named as the task key every
+    time the task state is stored. The watcher multiplexes a single Redis
+    Pub/Sub connection to all the subscribers in the event loop.
+    """
+
+    def __init__(self, client):
+        self._pubsub = client.pubsub()
+        self._queues: Dict[bytes, Set[TaskStateQueue]] = {}
+        self._patterns: Set[bytes] = set()
+        self._reader: Optional[asyncio.Task] = None
+
+    async def subscribe(
+        self,
+        channel: bytes,
+        queue: Optional[TaskStateQueue] = None,
+        pattern: bool = False,
+    ) -> TaskStateQueue:
+        """
+        Subscribe to a channel or to a channel pattern.
+
+        Args:
+            channel: Channel name or pattern
+            queue: Queue to use. A new queue is created if not given.
+            pattern: ``channel`` is a glob-style pattern
+
+        Returns:
+            Queue receiving the task meta published in the channel(s)
+        """
+        if queue is None:
+            queue = TaskStateQueue()
+
+        if channel not in self._queues:
+            self._queues[channel] = set()
+            if pattern:
+                self._patterns.add(channel)
+                await self._pubsub.psubscribe(channel)
+            else:
+                await self._pubsub.subscribe(channel)
+
+        self._queues[channel].add(queue)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read())
+
+        return queue
+
+    async def unsubscribe(self, channels: List[bytes], queue: TaskStateQueue):
+        """
+        Unsubscribe the queue from the channels (or channel patterns).
+
+        The queue is detached from all the channels before any ``await``, and
+        the channels without subscribers are unsubscribed in one call
+        shielded from cancellation, so a disconnected client (cancelled
+        request) does not leave any subscription behind.
+        """
+        released = []
+        for channel in channels:
+            queues = self._queues.get(channel, set())
+            queues.discard(queue)
+            if len(queues) == 0 and channel in self._queues:
+                del self._queues[channel]
+                released.append(channel)
+
+        if len(released) > 0:
+            await asyncio.shield(self._release(released))
+
+    async def _release(self, channels: List[bytes]):
+        # subscribed again while waiting to run
+        channels = [c for c in channels if c not in self._queues]
+        patterns = [c for c in channels if c in self._patterns]
+        plain = [c for c in channels if c not in self._patterns]
+        self._patterns.difference_update(patterns)
+        if len(patterns) > 0:
+            await self._pubsub.punsubscribe(*patterns)
+        if len(plain) > 0:
+            await self._pubsub.unsubscribe(*plain)
+
+    async def _read(self):
+        while self._queues:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except Exception as err:
+                # The Pub/Sub reconnects and subscribes again in the next
+                # read. Subscribers use timeouts, so nobody waits forever.
+                logging.warning(f"Task state watcher failed to read: {err}")
+                await asyncio.sleep(1)
+                continue
+
+            if message is None:
+                continue
+
+            # pattern subscriptions receive the pattern in the message
+            channel = message.get("pattern") or message["channel"]
+            for queue in self._queues.get(channel, set()):
+                queue.put_latest(message["data"])
+
+
+_watchers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def task_state_watcher() -> TaskStateWatcher:
+    """
+    ``TaskStateWatcher`` of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _watchers:
+        _watchers[loop] = TaskStateWatcher(result_backend_async())
+
+    return _watchers[loop]
+
+
+async def wait_task_meta(task_id: str, timeout: float) -> Dict[str, Any]:
+    """
+    Wait for the task to be ready and get the task meta.
+
+    The task state changes are received from the ``task_state_watcher``,
+    without polling the Result Backend.
+
+    Args:
+        task_id: Task ID
+        timeout: Maximum of seconds to wait
+
+    Returns:
+        Task meta, as in ``get_task_meta``. The task is not ready if the
+        timeout expired.
+    """
+    watcher = task_state_watcher()
+    channel = repository_metadata.backend.get_key_for_task(task_id)
+    # Subscribe before reading the current state to not lose any change
+    queue = await watcher.subscribe(channel)
+    try:
+        meta = await get_task_meta(task_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while meta["status"] not in states.READY_STATES:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                message = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+
+            if queue.clear():
+                # state changes lost, read the current state
+                meta = await get_task_meta(task_id)
+            else:
+                meta = _decode_meta(message)
+    finally:
+        await watcher.unsubscribe([channel], queue)
+
+    return meta
+
+
+def _sse_event(task_data: TasksData) -> str:
+    return (
+        "event: task_state\n"
+        f"data: {task_data.model_dump_json(exclude_none=True)}\n\n"
+    )
+
+
+async def stream(task_ids: List[str]) -> AsyncIterator[str]:
+    """
+    Stream the tasks state changes as Server-Sent Events.
+
+    The stream uses the ``task_state_watcher`` shared by all the streams in
+    the event loop. For a list of task ids, the stream starts with the
+    current state of the tasks and ends when all of them are ready. Without
+    task ids, all the tasks state changes are streamed until the client
+    disconnects.
+
+    If a task id is a group id, the state aggregates the tasks of the group
+    (see ``_group_data``) and is sent again on every change of its tasks.
+
+    If the client is too slow and state changes are dropped (see
+    ``TaskStateQueue``), the current state of the pending tasks is read again
+    and sent. The stream of all the tasks is closed instead, as their state
+    cannot be read again.
+
+    Args:
+        task_ids: List of Task IDs. Empty for all the tasks.
+
+    Yields:
+        ``task_state`` events with ``TasksData`` as data
+    """
+    watcher = task_state_watcher()
+    backend = repository_metadata.backend
+    task_ids = list(dict.fromkeys(task_ids))
+    if len(task_ids) > 0:
+        channels = {
+            backend.get_key_for_task(task_id): False for task_id in task_ids
+        }
+    else:
+        channels = {backend.get_key_for_task("*"): True}
+
+    queue = TaskStateQueue()
+    # Subscribe before reading the current state to not lose any change
+    for channel, pattern in channels.items():
+        await watcher.subscribe(channel, queue, pattern)
+
+    try:
+        pending = set()
+        # group task id -> group id, and group id -> tasks meta
+        task_groups: Dict[str, str] = {}
+        group_metas: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if len(task_ids) > 0:
+            metas = await get_task_metas(task_ids)
+            groups = await _get_groups(metas)
+            for group_id, group_tasks in groups.items():
+                for task_id in group_tasks:
+                    task_groups[task_id] = group_id
+                    channel = backend.get_key_for_task(task_id)
+                    channels[channel] = False
+                    await watcher.subscribe(channel, queue, False)
+            if len(task_groups) > 0:
+                tasks_metas = await get_task_metas(list(task_groups))
+                for task_id, meta in tasks_metas.items():
+                    group_metas.setdefault(task_groups[task_id], {})
+                    group_metas[task_groups[task_id]][task_id] = meta
+
+            for task_id, meta in metas.items():
+                if task_id in group_metas:
+                    task_data = _group_data(task_id, group_metas[task_id])
+                else:
+                    task_data = _task_data(
+                        task_id, meta["status"], meta["result"]
+                    )
+                yield _sse_event(task_data)
+                if task_data.state not in READY_STATES:
+                    pending.add(task_id)
+
+            if len(pending) == 0:
+                return
+
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), STREAM_KEEP_ALIVE
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if queue.clear():
+                if len(task_ids) == 0:
+                    logging.warning("Tasks state stream too slow, closed")
+                    return
+
+                # state changes lost, send the current state of the tasks
+                tasks_data = await _current_data(
+                    list(pending), task_groups, group_metas
+                )
+                for task_data in tasks_data:
+                    yield _sse_event(task_data)
+                    if task_data.state in READY_STATES:
+                        pending.discard(task_data.task_id)
+                if len(pending) == 0:
+                    return
+                continue
+
+            meta = _decode_meta(message)
+            task_id = meta.get("task_id")
+            if task_id in task_groups:
+                group_id = task_groups[task_id]
+                group_metas[group_id][task_id] = meta
+                task_data = _group_data(group_id, group_metas[group_id])
+            else:
+                task_data = _task_data(task_id, meta["status"], meta["result"])
+            yield _sse_event(task_data)
+            if len(task_ids) > 0 and task_data.state in READY_STATES:
+                pending.discard(task_data.task_id)
+                if len(pending) == 0:
+                    return
+    finally:
+        await watcher.unsubscribe(list(channels), queue)
+
+
+async def _current_data(
+    task_ids: List[str],
+    task_groups: Dict[str, str],
+    group_metas: Dict[str, Dict[str, Dict[str, Any]]],
+) -> List[TasksData]:
+    """
+    Current state of the tasks and groups, updating the ``group_metas``.
+    """
+    tasks = [t for t in task_ids if t not in group_metas]
+    members = [t for t, g in task_groups.items() if g in task_ids]
+    metas = await get_task_metas(tasks + members)
+    for task_id in members:
+        group_metas[task_groups[task_id]][task_id] = metas[task_id]
+
+    return [
+        (
+            _group_data(task_id, group_metas[task_id])
+            if task_id in group_metas
+            else _task_data(
+                task_id, metas[task_id]["status"], metas[task_id]["result"]
+            )
+        )
+        for task_id in task_ids
+    ]
+
+
+async def get(task_id: str, wait: int = 0) -> Response:
     """
     Get the task details from Result Backend Server.
 
-    Uses the Celery implementation in
-    ``repository_service_tuf_api.metadata.metadata_repository.AsyncResult`` to
-    fetch from Result Backend the task state.
+    Uses ``get_task_meta`` to fetch from Result Backend the task state without
+    blocking the event loop.
+
+    If the task id is a group id, the state aggregates the tasks of the group
+    (see ``_group_data``).
 
     Args:
         task_id: Task ID
+        wait: Seconds to wait for the task to be ready. See ``wait_task_meta``
 
     Returns:
         ``Response`` as BaseModel from pydantic
     """
-    task = repository_metadata.AsyncResult(task_id)
+    if wait > 0:
+        group_tasks = await get_group_tasks(task_id)
+        if group_tasks is None:
+            meta = await wait_task_meta(task_id, wait)
+    else:
+        meta = await get_task_meta(task_id)
+        group_tasks = None
+        if meta["status"] == states.PENDING:
+            group_tasks = await get_group_tasks(task_id)
+
+    if group_tasks is not None:
+        if wait > 0:
+            group_metas = await asyncio.gather(
+                *[wait_task_meta(t, wait) for t in group_tasks]
+            )
+            metas = dict(zip(group_tasks, group_metas))
+        else:
+            metas = await get_task_metas(group_tasks)
+
+        data = _group_data(task_id, metas)
+
+        return Response(data=data, message="Task state.")
+
+    data = _task_data(task_id, meta["status"], meta["result"])
+
+    return Response(data=data, message="Task state.")
+
+
+async def get_bulk(task_ids: List[str]) -> BulkResponse:
+    """
+    Get many tasks details from Result Backend Server.
 
-    task_state = task.state
-    task_result = task.result
+    Uses ``get_tasks_metas`` to fetch all the tasks in a single round trip,
+    and the tasks of the group ids in another.
 
+    Args:
+        task_ids: List of Task IDs. Duplicated ids are ignored. Group ids are
+            aggregated as in ``get``.
+
+    Returns:
+        ``BulkResponse`` as BaseModel from pydantic
+    """
+    metas, group_metas = await get_tasks_metas(list(dict.fromkeys(task_ids)))
+    data = {
+        task_id: (
+            _group_data(task_id, group_metas[task_id])
+            if task_id in group_metas
+            else _task_data(task_id, meta["status"], meta["result"])
+        )
+        for task_id, meta in metas.items()
+    }
+
+    return BulkResponse(data=data, message="Tasks state.")
+
+
+def _group_data(group_id: str, metas: Dict[str, Dict[str, Any]]) -> TasksData:
+    """
+    Aggregate the tasks of a group.
+
+    The group is ``PENDING`` until any task starts and ``STARTED`` until all
+    tasks are ready. Then, it is ``SUCCESS`` if all tasks succeeded,
+    otherwise ``FAILURE`` (any task failed or was revoked) or ``ERRORED``.
+    """
+    tasks = {
+        task_id: _task_data(task_id, meta["status"], meta["result"])
+        for task_id, meta in metas.items()
+    }
+    task_states = [task_data.state for task_data in tasks.values()]
+    # ERRORED is a SUCCESS Celery task
+    finished = sum(
+        meta["status"] in states.READY_STATES for meta in metas.values()
+    )
+    if finished < len(tasks):
+        if all(state == TaskState.PENDING for state in task_states):
+            group_state = TaskState.PENDING
+        else:
+            group_state = TaskState.STARTED
+    elif all(state == TaskState.SUCCESS for state in task_states):
+        group_state = TaskState.SUCCESS
+    elif any(
+        state in [TaskState.FAILURE, TaskState.REVOKED]
+        for state in task_states
+    ):
+        group_state = TaskState.FAILURE
+    else:
+        group_state = TaskState.ERRORED
+
+    results = [t.result for t in tasks.values() if t.result is not None]
+    last_updates = [r.last_update for r in results if r.last_update]
+    result = TaskResult(
+        message=f"{finished}/{len(tasks)} tasks finished",
+        status=(
+            group_state == TaskState.SUCCESS
+            if finished == len(tasks)
+            else None
+        ),
+        task=next((r.task for r in results if r.task), None),
+        last_update=max(last_updates, default=None),
+        details={
+            "finished": finished,
+            "total": len(tasks),
+            "tasks": {
+                task_id: task_data.state
+                for task_id, task_data in tasks.items()
+            },
+        },
+    )
+
+    return TasksData(task_id=group_id, state=group_state, result=result)
+
+
+def _task_data(task_id: str, task_state: str, task_result: Any) -> TasksData:
     # Celery FAILURE task, we include the task result (exception) as an error
     # and default message as critical failure executing the task.
-    if isinstance(task.result, Exception):
+    if isinstance(task_result, Exception):
         task_result = {
-            "message": str(task.result),
+            "message": str(task_result),
         }
 
     # If the task state is SUCCESS and the task.result.status is False we
@@ -153,7 +770,141 @@ def get(task_id: str) -> Response:
     ):
         task_state = TaskState.ERRORED
 
-    return Response(
-        data=TasksData(task_id=task_id, state=task_state, result=task_result),
-        message="Task state.",
-    )
+    return TasksData(task_id=task_id, state=task_state, result=task_result)
+
+
+async def _get_groups(
+    metas: Dict[str, Dict[str, Any]],
+) -> Dict[str, List[str]]:
+    """
+    Get the tasks of the ``PENDING`` task ids that are group ids.
+
+    Args:
+        metas: Task meta by task id, as in ``get_task_metas``
+
+    Returns:
+        Tasks IDs by group id
+    """
+    pending = [
+        task_id
+        for task_id, meta in metas.items()
+        if meta["status"] == states.PENDING
+    ]
+    groups = await asyncio.gather(*[get_group_tasks(t) for t in pending])
+
+    return {
+        group_id: group_tasks
+        for group_id, group_tasks in zip(pending, groups)
+        if group_tasks is not None
+    }
+
+
+async def get_tasks_metas(
+    task_ids: List[str],
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Dict[str, Any]]]]:
+    """
+    Get many tasks meta, and the tasks meta of the group ids.
+
+    Args:
+        task_ids: List of Task IDs or group IDs
+
+    Returns:
+        Task meta by task id, as in ``get_task_metas``, and the meta of the
+        group tasks by group id
+    """
+    metas = await get_task_metas(task_ids)
+    groups = await _get_groups(metas)
+    group_tasks = [t for tasks in groups.values() for t in tasks]
+    tasks_metas = await get_task_metas(group_tasks) if group_tasks else {}
+
+    return metas, {
+        group_id: {task_id: tasks_metas[task_id] for task_id in tasks}
+        for group_id, tasks in groups.items()
+    }
+
+
+def _invalid_paths(results: List[Any]) -> List[str]:
+    return [
+        path
+        for result in results
+        if isinstance(result, dict)
+        for path in (result.get("details") or {}).get("invalid_paths", [])
+    ]
+
+
+async def index_artifacts() -> int:
+    """
+    Update the ``artifacts_index`` with the finished ``add_artifacts`` tasks
+    (or groups).
+
+    The pending artifacts of a succeeded task are indexed, except the task
+    invalid paths. The pending artifacts of a failed task are dropped.
+
+    Returns:
+        Number of finished tasks
+    """
+    finished = 0
+    task_ids = await artifacts_index.pending_tasks()
+    for start in range(0, len(task_ids), BULK_MAX_TASKS):
+        end = start + BULK_MAX_TASKS
+        metas, group_metas = await get_tasks_metas(task_ids[start:end])
+        for task_id, meta in metas.items():
+            if task_id in group_metas:
+                task_metas = group_metas[task_id]
+                task_data = _group_data(task_id, task_metas)
+            else:
+                task_metas = {task_id: meta}
+                task_data = _task_data(task_id, meta["status"], meta["result"])
+
+            if task_data.state == TaskState.SUCCESS:
+                await artifacts_index.commit(
+                    task_id,
+                    _invalid_paths([m["result"] for m in task_metas.values()]),
+                )
+            elif task_data.state in READY_STATES:
+                await artifacts_index.discard(task_id)
+            else:
+                continue
+
+            finished += 1
+
+    return finished
+
+
+class ArtifactsIndexer:
+    """
+    Run ``index_artifacts`` every ``interval`` seconds in the event loop.
+
+    It is started by the application lifespan if ``RSTUF_ARTIFACTS_INDEX`` is
+    enabled, so the artifacts are indexed up to ``interval`` seconds after
+    the task finishes, without any request. All the replicas run it, indexing
+    a task is atomic and done once.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, interval: float):
+        """Start the indexer in the running event loop, if not running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        """Stop the indexer."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self, interval: float):
+        while True:
+            try:
+                await index_artifacts()
+            except Exception as err:
+                logging.error(f"Artifacts indexer error: {err}")
+
+            await asyncio.sleep(interval)
+
+
+artifacts_indexer = ArtifactsIndexer()
@@ -0,0 +1,176 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+
+"""
+OpenTelemetry tracing.
+
+The spans are created with the OpenTelemetry API and are no-op until a
+tracer provider is configured with ``configure_tracing``, which requires the
+``opentelemetry-sdk`` package (and ``opentelemetry-exporter-otlp-proto-http``
+for the OTLP exporter).
+"""
+
+import logging
+import os
+from contextlib import contextmanager
+from typing import Optional
+
+from opentelemetry import propagate, trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from repository_service_tuf_api.metrics import (
+    REDIS_SETTINGS_READ_DURATION,
+    route_template,
+)
+
+SERVICE_NAME = "repository-service-tuf-api"
+
+tracer = trace.get_tracer("repository_service_tuf_api")
+
+
+def configure_tracing(exporter: Optional[str], file: str) -> bool:
+    """
+    Configure the tracer provider exporting the spans.
+
+    Args:
+        exporter: ``otlp`` to export to an OTLP collector (configured by the
+            ``OTEL_EXPORTER_OTLP_*`` environment variables) or ``file`` to
+            write the spans as JSON to ``file``. ``None`` disables tracing.
+        file: file used by the ``file`` exporter.
+
+    Returns:
+        ``True`` if the tracing is enabled.
+    """
+    if not exporter:
+        return False
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+            SimpleSpanProcessor,
+        )
+    except ImportError:
+        logging.error("Tracing requires 'opentelemetry-sdk', disabled")
+        return False
+
+    if exporter.lower() == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            logging.error(
+                "Tracing OTLP exporter requires "
+                "'opentelemetry-exporter-otlp-proto-http', disabled"
+            )
+            return False
+        processor = BatchSpanProcessor(OTLPSpanExporter())
+    elif exporter.lower() == "file":
+        processor = SimpleSpanProcessor(
+            ConsoleSpanExporter(out=open(file, "a"))
+        )
+    else:
+        logging.error(f"Invalid tracing exporter '{exporter}', disabled")
+        return False
+
+    resource = Resource.create(
+        {"service.name": os.getenv("OTEL_SERVICE_NAME", SERVICE_NAME)}
+    )
+    provider = TracerProvider(resource=resource)
+    provider.add_span_processor(processor)
+    trace.set_tracer_provider(provider)
+    logging.info(f"Tracing enabled, exporter {exporter}")
+
+    return True
+
+
+@contextmanager
+def redis_span(operation: str):
+    """Span of a call to the repository settings Redis."""
+    with tracer.start_as_current_span(
+        f"redis {operation}",
+        kind=SpanKind.CLIENT,
+        attributes={"db.system": "redis", "db.operation": operation},
+    ) as span:
+        yield span
+
+
+@contextmanager
+def settings_read(read: str):
+    """Measure and trace a repository settings read from Redis."""
+    with REDIS_SETTINGS_READ_DURATION.labels(read=read).time():
+        with redis_span(read):
+            yield
+
+
+@contextmanager
+def publish_span(task_name: str, action: str, options: dict):
+    """
+    Span of a task publish.
+
+    The trace context is injected in the task message ``headers`` option, so
+    the worker spans join the trace of the request.
+    """
+    with tracer.start_as_current_span(
+        f"{task_name} publish",
+        kind=SpanKind.PRODUCER,
+        attributes={
+            "messaging.system": "celery",
+            "messaging.operation": "publish",
+            "rstuf.action": action,
+        },
+    ) as span:
+        headers = dict(options.get("headers") or {})
+        propagate.inject(headers)
+        if headers:
+            options["headers"] = headers
+        yield span
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware creating a server span for each request.
+
+    The trace context is extracted from the request headers (W3C
+    ``traceparent``) and the span is named by the route path template.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        carrier = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope["headers"]
+        }
+        with tracer.start_as_current_span(
+            scope["method"],
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={
+                "http.request.method": scope["method"],
+                "url.path": scope["path"],
+            },
+        ) as span:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    route = route_template(scope)
+                    span.update_name(f"{scope['method']} {route}")
+                    span.set_attribute("http.route", route)
+                    span.set_attribute(
+                        "http.response.status_code", message["status"]
+                    )
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Benchmark of the serialization cost of the large API responses.
+
+It builds the responses from the ``tests/data_examples`` payloads:
+``GET /metadata/sign`` with the root metadata pending signing and the trusted
+root, and ``GET /task`` / ``POST /task/bulk`` with ``--artifacts`` artifacts
+in the result details. Each response is serialized ``--number`` times as:
+
+* ``jsonable_encoder``: ``jsonable_encoder`` and ``json.dumps``
+  (``JSONResponse`` without response model).
+* ``pydantic``: Pydantic ``dump_json`` (FastAPI default with response model).
+* ``orjson``: Pydantic ``dump_python`` and ``ORJSONResponse`` (FastAPI with
+  ``RSTUF_ORJSON_RESPONSES``). Requires the ``orjson`` package.
+
+It reports the mean time by response and serialization::
+
+    python -m tests.benchmarks.serialization --artifacts 1000
+"""
+
+import argparse
+import json
+import os
+import timeit
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from repository_service_tuf_api import metadata, tasks
+from repository_service_tuf_api.responses import ORJSONResponse, orjson
+
+DATA_EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "data_examples")
+
+
+def _load(path: str) -> dict:
+    with open(os.path.join(DATA_EXAMPLES, path)) as f:
+        return json.load(f)
+
+
+def responses(artifacts: int) -> dict:
+    root = _load("metadata/update-root-payload.json")["metadata"]["root"]
+    trusted_root = _load("bootstrap/das-payload.json")["metadata"]["root"]
+    metadata_sign = metadata.MetadataSignGetResponse(
+        data={
+            "metadata": {
+                "root": root,
+                "trusted_root": trusted_root,
+            }
+        },
+        message="Metadata role(s) pending signing",
+    )
+
+    paths = [
+        f"{artifact['path']}-{i}"
+        for i in range(artifacts)
+        for artifact in _load("artifacts/add_payload.json")["artifacts"]
+    ][:artifacts]
+    task = {
+        "task_id": "33e66671dcc84cdfa2535a1eb030104c",
+        "state": tasks.TaskState.SUCCESS,
+        "result": {
+            "task": tasks.TaskName.ADD_ARTIFACTS,
+            "status": True,
+            "last_update": datetime.now(timezone.utc),
+            "message": "Artifact(s) Added",
+            "details": {
+                "added_artifacts": paths,
+                "invalid_paths": [],
+                "target_roles": [f"bins-{i}" for i in range(256)],
+            },
+        },
+    }
+    task_get = tasks.Response(data=task, message="Task state.")
+    task_bulk = tasks.BulkResponse(
+        data={
+            f"{i:032x}": {**task, "task_id": f"{i:032x}"} for i in range(10)
+        },
+        message="Tasks state.",
+    )
+
+    return {
+        "GET /metadata/sign": metadata_sign,
+        "GET /task": task_get,
+        "POST /task/bulk": task_bulk,
+    }
+
+
+def serializers(model: type) -> dict:
+    adapter = TypeAdapter(model)
+    options = {"by_alias": True, "exclude_none": True}
+    serializers = {
+        "jsonable_encoder": lambda response: JSONResponse(
+            jsonable_encoder(response, **options)
+        ).body,
+        "pydantic": lambda response: adapter.dump_json(response, **options),
+    }
+    if orjson is not None:
+        serializers["orjson"] = lambda response: ORJSONResponse(
+            adapter.dump_python(response, mode="json", **options)
+        ).body
+
+    return serializers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--artifacts", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.artifacts} artifacts, mean of {args.number} runs")
+    print(
+        f"{'response':<20}{'serialization':<18}{'size':>10}{'time (ms)':>12}"
+    )
+    for name, response in responses(args.artifacts).items():
+        for serializer, serialize in serializers(type(response)).items():
+            size = len(serialize(response))
+            seconds = timeit.timeit(
+                lambda: serialize(response), number=args.number
+            )
+            print(
+                f"{name:<20}{serializer:<18}{size:>10}"
+                f"{seconds / args.number * 1000:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -22,3 +22,14 @@ def test_client(monkeypatch):
 def fake_datetime(monkeypatch):
     fake_time = datetime(2019, 6, 16, 9, 5, 1, tzinfo=timezone.utc)
     return pretend.stub(now=pretend.call_recorder(lambda a: fake_time))
+
+
+@pytest.fixture()
+def async_return():
+    def _async_return(value):
+        async def _coroutine(*args, **kwargs):
+            return value
+
+        return _coroutine
+
+    return _async_return
@@ -14,12 +14,16 @@ MOCK_PATH = "repository_service_tuf_api.bootstrap"
 
 
 class TestGetBootstrap:
-    def test_get_bootstrap_available(self, test_client, monkeypatch):
+    def test_get_bootstrap_available(
+        self, test_client, monkeypatch, async_return
+    ):
         mocked_bootstrap_state = pretend.call_recorder(
-            lambda *a: pretend.stub(bootstrap=False, state=None, task_id=None)
+            async_return(
+                pretend.stub(bootstrap=False, state=None, task_id=None)
+            )
         )
         monkeypatch.setattr(
-            f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
+            f"{MOCK_PATH}.bootstrap_state_async", mocked_bootstrap_state
         )
 
         response = test_client.get(BOOTSTRAP_URL)
@@ -31,14 +35,18 @@ class TestGetBootstrap:
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
 
-    def test_get_bootstrap_not_available(self, test_client, monkeypatch):
+    def test_get_bootstrap_not_available(
+        self, test_client, monkeypatch, async_return
+    ):
         mocked_bootstrap_state = pretend.call_recorder(
-            lambda *a: pretend.stub(
-                bootstrap=True, state="finished", task_id="task_id"
+            async_return(
+                pretend.stub(
+                    bootstrap=True, state="finished", task_id="task_id"
+                )
             )
         )
         monkeypatch.setattr(
-            f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
+            f"{MOCK_PATH}.bootstrap_state_async", mocked_bootstrap_state
         )
 
         response = test_client.get(BOOTSTRAP_URL)
@@ -51,15 +59,15 @@ class TestGetBootstrap:
         assert mocked_bootstrap_state.calls == [pretend.call()]
 
     def test_get_bootstrap_already_bootstrap_in_pre(
-        self, test_client, monkeypatch
+        self, test_client, monkeypatch, async_return
     ):
         mocked_bootstrap_state = pretend.call_recorder(
-            lambda *a: pretend.stub(
-                bootstrap=False, state="pre", task_id="task_id"
+            async_return(
+                pretend.stub(bootstrap=False, state="pre", task_id="task_id")
             )
         )
         monkeypatch.setattr(
-            f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
+            f"{MOCK_PATH}.bootstrap_state_async", mocked_bootstrap_state
         )
 
         response = test_client.get(BOOTSTRAP_URL)
@@ -72,15 +80,17 @@ class TestGetBootstrap:
         assert mocked_bootstrap_state.calls == [pretend.call()]
 
     def test_get_bootstrap_already_bootstrap_in_signing(
-        self, test_client, monkeypatch
+        self, test_client, monkeypatch, async_return
     ):
         mocked_bootstrap_state = pretend.call_recorder(
-            lambda *a: pretend.stub(
-                bootstrap=False, state="signing", task_id="task_id"
+            async_return(
+                pretend.stub(
+                    bootstrap=False, state="signing", task_id="task_id"
+                )
             )
         )
         monkeypatch.setattr(
-            f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
+            f"{MOCK_PATH}.bootstrap_state_async", mocked_bootstrap_state
         )
 
         response = test_client.get(BOOTSTRAP_URL)
@@ -114,8 +124,10 @@ class TestPostBootstrap:
             f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
         )
         monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", lambda: "123")
-        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: None)
-        mocked__check_bootstrap_status = pretend.call_recorder(lambda *a: None)
+        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: True)
+        mocked__check_bootstrap_status = pretend.call_recorder(
+            lambda **kw: None
+        )
 
         monkeypatch.setattr(
             f"{MOCK_PATH}._check_bootstrap_status",
@@ -162,8 +174,10 @@ class TestPostBootstrap:
             f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
         )
         monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", lambda: "123")
-        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: None)
-        mocked__check_bootstrap_status = pretend.call_recorder(lambda *a: None)
+        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: True)
+        mocked__check_bootstrap_status = pretend.call_recorder(
+            lambda **kw: None
+        )
         monkeypatch.setattr(
             f"{MOCK_PATH}._check_bootstrap_status",
             mocked__check_bootstrap_status,
@@ -209,7 +223,7 @@ class TestPostBootstrap:
             f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
         )
         monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", lambda: "123")
-        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: None)
+        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: True)
 
         with open("tests/data_examples/bootstrap/payload_bins.json") as f:
             f_data = f.read()
@@ -245,7 +259,7 @@ class TestPostBootstrap:
             f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
         )
         monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", lambda: "123")
-        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: None)
+        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: True)
 
         with open("tests/data_examples/bootstrap/payload_bins.json") as f:
             f_data = f.read()
@@ -281,8 +295,10 @@ class TestPostBootstrap:
             f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
         )
         monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", lambda: "123")
-        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: None)
-        mocked__check_bootstrap_status = pretend.call_recorder(lambda *a: None)
+        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: True)
+        mocked__check_bootstrap_status = pretend.call_recorder(
+            lambda **kw: None
+        )
         monkeypatch.setattr(
             f"{MOCK_PATH}._check_bootstrap_status",
             mocked__check_bootstrap_status,
@@ -333,6 +349,42 @@ class TestPostBootstrap:
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
 
+    def test_post_bootstrap_concurrent_lock(self, test_client, monkeypatch):
+        states = [
+            pretend.stub(bootstrap=False, state=None, task_id=None),
+            pretend.stub(bootstrap=False, state="pre", task_id="other"),
+        ]
+        mocked_bootstrap_state = pretend.call_recorder(
+            lambda *a: states.pop(0)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", lambda: "123")
+        mocked_pre_lock_bootstrap = pretend.call_recorder(lambda *a: False)
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.pre_lock_bootstrap", mocked_pre_lock_bootstrap
+        )
+        mocked_repository_metadata = pretend.stub(
+            apply_async=pretend.call_recorder(lambda **kw: None)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        )
+        with open("tests/data_examples/bootstrap/payload_bins.json") as f:
+            f_data = f.read()
+
+        payload = json.loads(f_data)
+        response = test_client.post(BOOTSTRAP_URL, json=payload)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {
+            "detail": {"error": "System already has a Metadata. State: pre"}
+        }
+        assert mocked_bootstrap_state.calls == [pretend.call(), pretend.call()]
+        assert mocked_pre_lock_bootstrap.calls == [pretend.call("123")]
+        assert mocked_repository_metadata.apply_async.calls == []
+
     def test_post_bootstrap_already_bootstrap_in_pre(
         self, test_client, monkeypatch
     ):
@@ -428,7 +480,7 @@ class TestPostBootstrap:
             f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
         )
         monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", lambda: "123")
-        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: None)
+        monkeypatch.setattr(f"{MOCK_PATH}.pre_lock_bootstrap", lambda *a: True)
         monkeypatch.setattr(
             f"{MOCK_PATH}._check_bootstrap_status",
             pretend.call_recorder(lambda **kw: None),
@@ -1,79 +1,66 @@
 import pretend
 
-from repository_service_tuf_api import common_models
+from repository_service_tuf_api import (
+    RepositorySettingsSnapshot,
+    common_models,
+)
 
 COMMON_MODELS_PATH = "repository_service_tuf_api.common_models"
 
 
 class TestRoles:
-    def test_online_values_all_true(self, monkeypatch):
-        def fake_get_fresh(args: str):
-            setting = args[0]
-            if setting == "TARGETS_ONLINE_KEY":
-                return True
-            elif setting == "DELEGATED_ROLES_NAMES":
-                return ["bins-0", "bins-1"]
-
-        mocked_settings_repository = pretend.stub(
-            get_fresh=pretend.call_recorder(lambda *a: fake_get_fresh(a)),
+    def _fake_repository_settings(self, monkeypatch, targets_online, roles):
+        snapshot = RepositorySettingsSnapshot(
+            1,
+            {
+                "TARGETS_ONLINE_KEY": targets_online,
+                "DELEGATED_ROLES_NAMES": roles,
+            },
         )
+        mocked_repository_settings = pretend.call_recorder(lambda r: snapshot)
         monkeypatch.setattr(
-            f"{COMMON_MODELS_PATH}.settings_repository",
-            mocked_settings_repository,
+            f"{COMMON_MODELS_PATH}.repository_settings",
+            mocked_repository_settings,
+        )
+
+        return mocked_repository_settings
+
+    def test_online_values_all_true(self, monkeypatch):
+        mocked_repository_settings = self._fake_repository_settings(
+            monkeypatch, True, ["bins-0", "bins-1"]
         )
 
         result = common_models.Roles.online_roles_values()
         assert result == ["snapshot", "timestamp", "targets", "bins"]
-        assert mocked_settings_repository.get_fresh.calls == [
-            pretend.call("TARGETS_ONLINE_KEY", True),
-            pretend.call("DELEGATED_ROLES_NAMES"),
+        assert mocked_repository_settings.calls == [
+            pretend.call("online_roles")
         ]
 
     def test_online_values_custom_delegations(self, monkeypatch):
-        def fake_get_fresh(args: str):
-            setting = args[0]
-            if setting == "TARGETS_ONLINE_KEY":
-                return True
-            elif setting == "DELEGATED_ROLES_NAMES":
-                return ["foo", "bar"]
-
-        mocked_settings_repository = pretend.stub(
-            get_fresh=pretend.call_recorder(lambda *a: fake_get_fresh(a)),
-        )
-        monkeypatch.setattr(
-            f"{COMMON_MODELS_PATH}.settings_repository",
-            mocked_settings_repository,
-        )
+        self._fake_repository_settings(monkeypatch, True, ["foo", "bar"])
 
         result = common_models.Roles.online_roles_values()
         assert result == ["snapshot", "timestamp", "targets", "foo", "bar"]
-        assert mocked_settings_repository.get_fresh.calls == [
-            pretend.call("TARGETS_ONLINE_KEY", True),
-            pretend.call("DELEGATED_ROLES_NAMES"),
-        ]
 
     def test_getting_online_values_targets_role_is_offline(self, monkeypatch):
-        def fake_get_fresh(args: str):
-            setting = args[0]
-            if setting == "TARGETS_ONLINE_KEY":
-                return False
-            elif setting == "DELEGATED_ROLES_NAMES":
-                return ["bins-0", "bins-1"]
-
-        mocked_settings_repository = pretend.stub(
-            get_fresh=pretend.call_recorder(lambda *a: fake_get_fresh(a)),
-        )
-        monkeypatch.setattr(
-            f"{COMMON_MODELS_PATH}.settings_repository",
-            mocked_settings_repository,
+        self._fake_repository_settings(
+            monkeypatch, False, ["bins-0", "bins-1"]
         )
 
         result = common_models.Roles.online_roles_values()
         assert result == ["snapshot", "timestamp", "bins"]
-        assert mocked_settings_repository.get_fresh.calls == [
-            pretend.call("TARGETS_ONLINE_KEY", True),
-            pretend.call("DELEGATED_ROLES_NAMES"),
-        ]
+
+    def test_online_values_snapshot(self, monkeypatch):
+        mocked_repository_settings = self._fake_repository_settings(
+            monkeypatch, True, ["bins-0"]
+        )
+        snapshot = RepositorySettingsSnapshot(
+            2, {"TARGETS_ONLINE_KEY": False, "DELEGATED_ROLES_NAMES": ["foo"]}
+        )
+
+        result = common_models.Roles.online_roles_values(snapshot)
+        assert result == ["snapshot", "timestamp", "foo"]
+        assert mocked_repository_settings.calls == []
 
     def test_is_role_true_all_roles(self):
         all = ["root", "targets", "snapshot", "timestamp", "bins"]
@@ -156,13 +156,14 @@ class TestGetSettings:
         monkeypatch.setattr(
             f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
         )
-        fake_settings = pretend.stub(
-            fresh=pretend.call_recorder(lambda: None),
-            to_dict=pretend.call_recorder(
-                lambda: {"k": "v", "j": ["v1", "v2"], "l": "none"}
-            ),
+        mocked_repository_settings = pretend.call_recorder(
+            lambda r: pretend.stub(
+                values={"K": "v", "J": ["v1", "v2"], "L": "none"}
+            )
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_settings", mocked_repository_settings
         )
-        monkeypatch.setattr(f"{MOCK_PATH}.settings_repository", fake_settings)
 
         test_response = test_client.get(url)
         assert test_response.status_code == status.HTTP_200_OK
@@ -171,8 +172,33 @@ class TestGetSettings:
             "message": "Current Settings",
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
-        assert fake_settings.fresh.calls == [pretend.call()]
-        assert fake_settings.to_dict.calls == [pretend.call()]
+        assert mocked_repository_settings.calls == [pretend.call("settings")]
+
+    def test_get_settings_not_modified(self, test_client, monkeypatch):
+        url = "/api/v1/config"
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.bootstrap_state",
+            lambda *a: pretend.stub(bootstrap=True),
+        )
+        values = {"K": "v"}
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_settings",
+            lambda r: pretend.stub(values=values),
+        )
+
+        response = test_client.get(url)
+        etag = response.headers["etag"]
+        not_modified = test_client.get(url, headers={"If-None-Match": etag})
+        values["K"] = "changed"
+        modified = test_client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+        assert modified.status_code == status.HTTP_200_OK
+        assert modified.headers["etag"] != etag
+        assert modified.json()["data"] == {"k": "changed"}
 
     def test_get_settings_without_bootstrap(self, test_client, monkeypatch):
         url = "/api/v1/config"
@@ -7,10 +7,12 @@ import copy
 import json
 from datetime import datetime, timezone
 
+import fakeredis
 import pretend
 from fastapi import status
 
 import repository_service_tuf_api.common_models as common_models
+from repository_service_tuf_api import RepositorySettingsSnapshot, metadata
 
 METADATA_URL = "/api/v1/metadata/"
 METADATA_ONLINE_URL = "/api/v1/metadata/online"
@@ -19,6 +21,26 @@ DELETE_SIGN_URL = "/api/v1/metadata/sign/delete"
 MOCK_PATH = "repository_service_tuf_api.metadata"
 
 
+def _mock_repository_settings(monkeypatch, values):
+    mocked_repository_settings = pretend.call_recorder(
+        lambda read: RepositorySettingsSnapshot(1, values)
+    )
+    monkeypatch.setattr(
+        f"{MOCK_PATH}.repository_settings", mocked_repository_settings
+    )
+
+    return mocked_repository_settings
+
+
+def _mock_pending_signing(monkeypatch, signing, trusted):
+    mocked_pending_signing = pretend.call_recorder(
+        lambda: (dict(signing), trusted)
+    )
+    monkeypatch.setattr(f"{MOCK_PATH}.pending_signing", mocked_pending_signing)
+
+    return mocked_pending_signing
+
+
 class TestPostMetadata:
     def test_post_metadata(self, test_client, monkeypatch, fake_datetime):
         mocked_bootstrap_state = pretend.call_recorder(
@@ -160,19 +182,18 @@ class TestPostMetadataOnline:
             f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
         )
 
-        def fake_get_fresh(attr: str) -> bool:
-            setting = attr[0]
-            if setting == "TARGETS_ONLINE_KEY":
-                return True
-            elif setting == "DELEGATED_ROLES_NAMES":
-                return ["bins-0", "bins-1"]
-
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: fake_get_fresh(a)),
+        repository = RepositorySettingsSnapshot(
+            1,
+            {
+                "TARGETS_ONLINE_KEY": True,
+                "DELEGATED_ROLES_NAMES": ["bins-0", "bins-1"],
+            },
+        )
+        mocked_repository_settings = pretend.call_recorder(
+            lambda r: repository
         )
         monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
+            f"{MOCK_PATH}.repository_settings", mocked_repository_settings
         )
         fake_id = "fake_id"
         fake_get_task_id = pretend.call_recorder(lambda: fake_id)
@@ -203,12 +224,8 @@ class TestPostMetadataOnline:
             "message": "Force online metadata update accepted.",
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
-        assert mocked_settings_repository.reload.calls == [
-            pretend.call(),
-        ]
-        assert mocked_settings_repository.get_fresh.calls == [
-            pretend.call("TARGETS_ONLINE_KEY", True),
-            pretend.call("DELEGATED_ROLES_NAMES"),
+        assert mocked_repository_settings.calls == [
+            pretend.call("metadata_online")
         ]
         assert fake_get_task_id.calls == [pretend.call()]
         assert fake_repository_metadata.apply_async.calls == [
@@ -234,24 +251,23 @@ class TestPostMetadataOnline:
             f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
         )
 
-        def fake_get_fresh(attr: str) -> bool:
-            setting = attr[0]
-            if setting == "TARGETS_ONLINE_KEY":
-                return True
-            elif setting == "DELEGATED_ROLES_NAMES":
-                return ["bins-0", "bins-1"]
-
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: fake_get_fresh(a)),
+        repository = RepositorySettingsSnapshot(
+            1,
+            {
+                "TARGETS_ONLINE_KEY": True,
+                "DELEGATED_ROLES_NAMES": ["bins-0", "bins-1"],
+            },
+        )
+        mocked_repository_settings = pretend.call_recorder(
+            lambda r: repository
         )
         monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
+            f"{MOCK_PATH}.repository_settings", mocked_repository_settings
         )
         fake_online_roles_return = ["snapshot", "targets", "timestamp", "bins"]
         fake_roles = pretend.stub(
             online_roles_values=pretend.call_recorder(
-                lambda: fake_online_roles_return
+                lambda repository: fake_online_roles_return
             ),
             BINS=pretend.stub(value="bins"),
         )
@@ -282,14 +298,12 @@ class TestPostMetadataOnline:
             "message": "Force online metadata update accepted.",
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
-        assert mocked_settings_repository.reload.calls == [
-            pretend.call(),
+        assert mocked_repository_settings.calls == [
+            pretend.call("metadata_online")
         ]
-        assert mocked_settings_repository.get_fresh.calls == [
-            pretend.call("TARGETS_ONLINE_KEY", True),
-            pretend.call("DELEGATED_ROLES_NAMES"),
+        assert fake_roles.online_roles_values.calls == [
+            pretend.call(repository)
         ]
-        assert fake_roles.online_roles_values.calls == [pretend.call()]
         assert fake_get_task_id.calls == [pretend.call()]
         expected_payload = {"roles": fake_online_roles_return}
         assert fake_repository_metadata.apply_async.calls == [
@@ -335,12 +349,13 @@ class TestPostMetadataOnline:
         monkeypatch.setattr(
             f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
         )
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: False),
+        mocked_repository_settings = pretend.call_recorder(
+            lambda r: RepositorySettingsSnapshot(
+                1, {"TARGETS_ONLINE_KEY": False}
+            )
         )
         monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
+            f"{MOCK_PATH}.repository_settings", mocked_repository_settings
         )
         payload = {"roles": ["snapshot", "targets"]}
 
@@ -354,9 +369,8 @@ class TestPostMetadataOnline:
             },
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
-        assert mocked_settings_repository.reload.calls == [pretend.call()]
-        assert mocked_settings_repository.get_fresh.calls == [
-            pretend.call("TARGETS_ONLINE_KEY", True)
+        assert mocked_repository_settings.calls == [
+            pretend.call("metadata_online")
         ]
 
     def test_post_metadata_online_bins_used_bad_payload(
@@ -369,19 +383,18 @@ class TestPostMetadataOnline:
             f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
         )
 
-        def fake_get_fresh(attr: str) -> bool:
-            setting = attr[0]
-            if setting == "TARGETS_ONLINE_KEY":
-                return True
-            elif setting == "DELEGATED_ROLES_NAMES":
-                return ["bins-0", "bins-1"]
-
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: fake_get_fresh(a)),
+        repository = RepositorySettingsSnapshot(
+            1,
+            {
+                "TARGETS_ONLINE_KEY": True,
+                "DELEGATED_ROLES_NAMES": ["bins-0", "bins-1"],
+            },
+        )
+        mocked_repository_settings = pretend.call_recorder(
+            lambda r: repository
         )
         monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
+            f"{MOCK_PATH}.repository_settings", mocked_repository_settings
         )
         payload = {"roles": ["snapshot", "targets", "abcsdaw"]}
 
@@ -398,12 +411,8 @@ class TestPostMetadataOnline:
             },
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
-        assert mocked_settings_repository.reload.calls == [
-            pretend.call(),
-        ]
-        assert mocked_settings_repository.get_fresh.calls == [
-            pretend.call("TARGETS_ONLINE_KEY", True),
-            pretend.call("DELEGATED_ROLES_NAMES"),
+        assert mocked_repository_settings.calls == [
+            pretend.call("metadata_online")
         ]
 
     def test_post_metadata_online_custom_delegation_used_bad_payload(
@@ -416,19 +425,18 @@ class TestPostMetadataOnline:
             f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
         )
 
-        def fake_get_fresh(attr: str) -> bool:
-            setting = attr[0]
-            if setting == "TARGETS_ONLINE_KEY":
-                return True
-            elif setting == "DELEGATED_ROLES_NAMES":
-                return ["foo", "bar"]
-
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: fake_get_fresh(a)),
+        repository = RepositorySettingsSnapshot(
+            1,
+            {
+                "TARGETS_ONLINE_KEY": True,
+                "DELEGATED_ROLES_NAMES": ["foo", "bar"],
+            },
+        )
+        mocked_repository_settings = pretend.call_recorder(
+            lambda r: repository
         )
         monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
+            f"{MOCK_PATH}.repository_settings", mocked_repository_settings
         )
         payload = {"roles": ["snapshot", "targets", "bins"]}
 
@@ -442,12 +450,8 @@ class TestPostMetadataOnline:
             },
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
-        assert mocked_settings_repository.reload.calls == [
-            pretend.call(),
-        ]
-        assert mocked_settings_repository.get_fresh.calls == [
-            pretend.call("TARGETS_ONLINE_KEY", True),
-            pretend.call("DELEGATED_ROLES_NAMES"),
+        assert mocked_repository_settings.calls == [
+            pretend.call("metadata_online")
         ]
 
 
@@ -462,24 +466,8 @@ class TestGetMetadataSign:
         with open("tests/data_examples/bootstrap/payload_bins.json") as f:
             md_content = f.read()
         metadata_data = json.loads(md_content)
-        fake_metadata = pretend.stub(
-            to_dict=pretend.call_recorder(
-                lambda: metadata_data["metadata"]["root"]
-            )
-        )
-
-        def get_role(role_setting: str):
-            if role_setting == "ROOT_SIGNING":
-                return fake_metadata
-            return None
-
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get=pretend.call_recorder(lambda a: get_role(a)),
-            ROOT_SIGNING=fake_metadata,
-        )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
+        mocked_pending_signing = _mock_pending_signing(
+            monkeypatch, {"root": metadata_data["metadata"]["root"]}, {}
         )
 
         response = test_client.get(SIGN_URL)
@@ -489,13 +477,7 @@ class TestGetMetadataSign:
             "message": "Metadata role(s) pending signing",
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
-        assert mocked_settings_repository.reload.calls == [pretend.call()]
-        assert mocked_settings_repository.get.calls == [
-            pretend.call("ROOT_SIGNING"),
-            pretend.call("TRUSTED_ROOT"),
-            pretend.call("TRUSTED_TARGETS"),
-        ]
-        assert fake_metadata.to_dict.calls == [pretend.call()]
+        assert mocked_pending_signing.calls == [pretend.call()]
 
     def test_get_metadata_sign_with_trusted_root(
         self, test_client, monkeypatch
@@ -510,32 +492,13 @@ class TestGetMetadataSign:
             md_content = f.read()
 
         metadata_data = json.loads(md_content)
-        fake_metadata = pretend.stub(
-            to_dict=pretend.call_recorder(
-                lambda: metadata_data["metadata"]["root"]
-            )
-        )
         # Change trusted root:
         trusted_root_dict = copy.deepcopy(metadata_data["metadata"]["root"])
         trusted_root_dict["signed"]["version"] = 10
-        fake_trusted_metadata = pretend.stub(
-            to_dict=pretend.call_recorder(lambda: trusted_root_dict)
-        )
-
-        def get_role(setting: str):
-            if setting == "ROOT_SIGNING":
-                return fake_metadata
-            elif setting == "TRUSTED_ROOT":
-                return fake_trusted_metadata
-
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get=pretend.call_recorder(lambda a: get_role(a)),
-            ROOT_SIGNING=fake_metadata,
-            TRUSTED_ROOT=fake_metadata,
-        )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
+        mocked_pending_signing = _mock_pending_signing(
+            monkeypatch,
+            {"root": metadata_data["metadata"]["root"]},
+            {"trusted_root": trusted_root_dict},
         )
 
         response = test_client.get(SIGN_URL)
@@ -550,14 +513,7 @@ class TestGetMetadataSign:
             "message": "Metadata role(s) pending signing",
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
-        assert mocked_settings_repository.reload.calls == [pretend.call()]
-        assert mocked_settings_repository.get.calls == [
-            pretend.call("ROOT_SIGNING"),
-            pretend.call("TRUSTED_ROOT"),
-            pretend.call("TRUSTED_TARGETS"),
-        ]
-        assert fake_metadata.to_dict.calls == [pretend.call()]
-        assert fake_trusted_metadata.to_dict.calls == [pretend.call()]
+        assert mocked_pending_signing.calls == [pretend.call()]
 
     def test_get_metadata_sign_with_trusted_targets(
         self, test_client, monkeypatch
@@ -600,27 +556,10 @@ class TestGetMetadataSign:
         # Change trusted root:
         pending_targets_dict = copy.deepcopy(trusted_targets_dict)
         pending_targets_dict["signed"]["version"] = 10
-        fake_targets_pending_metadata = pretend.stub(
-            to_dict=pretend.call_recorder(lambda: pending_targets_dict)
-        )
-        fake_targets_trusted_metadata = pretend.stub(
-            to_dict=pretend.call_recorder(lambda: trusted_targets_dict)
-        )
-
-        def get_role(setting: str):
-            if setting == "TARGETS_SIGNING":
-                return fake_targets_pending_metadata
-            elif setting == "TRUSTED_TARGETS":
-                return fake_targets_trusted_metadata
-
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get=pretend.call_recorder(lambda a: get_role(a)),
-            TARGETS_SIGNING=fake_targets_pending_metadata,
-            TRUSTED_TARGETS=fake_targets_trusted_metadata,
-        )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
+        mocked_pending_signing = _mock_pending_signing(
+            monkeypatch,
+            {"targets": pending_targets_dict},
+            {"trusted_targets": trusted_targets_dict},
         )
 
         response = test_client.get(SIGN_URL)
@@ -635,14 +574,7 @@ class TestGetMetadataSign:
             "message": "Metadata role(s) pending signing",
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
-        assert mocked_settings_repository.reload.calls == [pretend.call()]
-        assert mocked_settings_repository.get.calls == [
-            pretend.call("TARGETS_SIGNING"),
-            pretend.call("TRUSTED_ROOT"),
-            pretend.call("TRUSTED_TARGETS"),
-        ]
-        assert fake_targets_pending_metadata.to_dict.calls == [pretend.call()]
-        assert fake_targets_trusted_metadata.to_dict.calls == [pretend.call()]
+        assert mocked_pending_signing.calls == [pretend.call()]
 
     def test_get_metadata_sign_with_trusted_root_no_pending(
         self, test_client, monkeypatch
@@ -659,15 +591,8 @@ class TestGetMetadataSign:
         metadata_data = json.loads(md_content)
         trusted_root_dict = copy.deepcopy(metadata_data["metadata"]["root"])
         trusted_root_dict["signed"]["version"] = 10
-        fake_trusted_metadata = pretend.stub(
-            to_dict=pretend.call_recorder(lambda: trusted_root_dict)
-        )
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get=pretend.call_recorder(lambda a: fake_trusted_metadata),
-        )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
+        mocked_pending_signing = _mock_pending_signing(
+            monkeypatch, {}, {"trusted_root": trusted_root_dict}
         )
 
         response = test_client.get(SIGN_URL)
@@ -676,8 +601,7 @@ class TestGetMetadataSign:
             "message": "No metadata pending signing available",
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
-        assert mocked_settings_repository.reload.calls == [pretend.call()]
-        assert len(mocked_settings_repository.get.calls) == 0
+        assert mocked_pending_signing.calls == [pretend.call()]
 
     def test_get_metadata_sign_no_pending_roles(
         self, test_client, monkeypatch
@@ -689,13 +613,7 @@ class TestGetMetadataSign:
             f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
         )
 
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get=pretend.call_recorder(lambda *a: None),
-        )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
-        )
+        mocked_pending_signing = _mock_pending_signing(monkeypatch, {}, {})
 
         response = test_client.get(SIGN_URL)
         assert response.status_code == status.HTTP_200_OK, response.text
@@ -703,7 +621,24 @@ class TestGetMetadataSign:
             "message": "No metadata pending signing available",
         }
         assert mocked_bootstrap_state.calls == [pretend.call()]
-        assert mocked_settings_repository.reload.calls == [pretend.call()]
+        assert mocked_pending_signing.calls == [pretend.call()]
+
+    def test_get_metadata_sign_not_modified(self, test_client, monkeypatch):
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.bootstrap_state",
+            lambda *a: pretend.stub(bootstrap=True, state="signing"),
+        )
+        _mock_pending_signing(monkeypatch, {}, {})
+
+        response = test_client.get(SIGN_URL)
+        etag = response.headers["etag"]
+        not_modified = test_client.get(
+            SIGN_URL, headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not_modified.content == b""
 
     def test_get_metadata_sign_no_bootstrap(self, test_client, monkeypatch):
         mocked_bootstrap_state = pretend.call_recorder(
@@ -827,16 +762,83 @@ class TestPostMetadataSign:
         assert mocked_bootstrap_state.calls == [pretend.call()]
 
 
+class TestPendingSigning:
+    def _fake_script(self, monkeypatch, result):
+        fake_script = pretend.call_recorder(lambda **kw: result)
+        fake_redis = pretend.stub(
+            register_script=pretend.call_recorder(lambda s: fake_script)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.settings_repository_redis", lambda: fake_redis
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.settings_repository_key", lambda: "RSTUF_TEST"
+        )
+
+        return fake_redis, fake_script
+
+    def test_pending_signing(self, monkeypatch):
+        fake_redis, fake_script = self._fake_script(
+            monkeypatch,
+            [
+                ["root", "targets"],
+                ['@json {"signed": {"_type": "root"}}', "@none "],
+                ['@json {"signed": {"version": 1}}', None],
+            ],
+        )
+
+        result = metadata.pending_signing()
+
+        assert result == (
+            {"root": {"signed": {"_type": "root"}}},
+            {"trusted_root": {"signed": {"version": 1}}},
+        )
+        assert fake_redis.register_script.calls == [
+            pretend.call(metadata._PENDING_SIGNING)
+        ]
+        assert fake_script.calls == [pretend.call(keys=["RSTUF_TEST"])]
+
+    def test_pending_signing_none(self, monkeypatch):
+        self._fake_script(monkeypatch, [])
+
+        assert metadata.pending_signing() == ({}, {})
+
+    def test_pending_signing_redis(self, monkeypatch):
+        fake_redis = fakeredis.FakeRedis(
+            server=fakeredis.FakeServer(), decode_responses=True
+        )
+        fake_redis.hset(
+            "RSTUF_TEST",
+            mapping={
+                "ROOT_SIGNING": '@json {"signed": {"_type": "root"}}',
+                "BINS_SIGNING": "@none ",
+                "TRUSTED_ROOT": '@json {"signed": {"version": 1}}',
+                "BOOTSTRAP": "task_id",
+            },
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.settings_repository_redis", lambda: fake_redis
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.settings_repository_key", lambda: "RSTUF_TEST"
+        )
+
+        assert metadata.pending_signing() == (
+            {"root": {"signed": {"_type": "root"}}},
+            {"trusted_root": {"signed": {"version": 1}}},
+        )
+
+        fake_redis.hdel("RSTUF_TEST", "ROOT_SIGNING", "BINS_SIGNING")
+
+        assert metadata.pending_signing() == ({}, {})
+
+
 class TestPostMetadataSignDelete:
     def test_post_metadata_sign_delete(
         self, test_client, monkeypatch, fake_datetime
     ):
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: "metadata"),
-        )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
+        mocked_repository_settings = _mock_repository_settings(
+            monkeypatch, {"ROOT_SIGNING": "metadata"}
         )
         fake_get_task_id = pretend.call_recorder(lambda: "123")
         monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", fake_get_task_id)
@@ -858,9 +860,8 @@ class TestPostMetadataSignDelete:
             "data": {"task_id": "123", "last_update": "2019-06-16T09:05:01Z"},
             "message": "Metadata sign delete accepted.",
         }
-        assert mocked_settings_repository.reload.calls == [pretend.call()]
-        assert mocked_settings_repository.get_fresh.calls == [
-            pretend.call("ROOT_SIGNING")
+        assert mocked_repository_settings.calls == [
+            pretend.call("metadata_sign")
         ]
         assert fake_get_task_id.calls == [pretend.call()]
         assert mocked_repository_metadata.apply_async.calls == [
@@ -878,12 +879,8 @@ class TestPostMetadataSignDelete:
     def test_metadata_sign_delete_role_not_in_signing_status(
         self, test_client, monkeypatch
     ):
-        mocked_settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: None),
-        )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.settings_repository", mocked_settings_repository
+        mocked_repository_settings = _mock_repository_settings(
+            monkeypatch, {"ROOT_SIGNING": None}
         )
 
         payload = {"role": "root"}
@@ -896,7 +893,6 @@ class TestPostMetadataSignDelete:
                 "error": "The root role is not in a signing process.",
             }
         }
-        assert mocked_settings_repository.reload.calls == [pretend.call()]
-        assert mocked_settings_repository.get_fresh.calls == [
-            pretend.call("ROOT_SIGNING")
+        assert mocked_repository_settings.calls == [
+            pretend.call("metadata_sign")
         ]
@@ -2,6 +2,7 @@
 # SPDX-FileCopyrightText: 2022-2023 VMware Inc
 #
 # SPDX-License-Identifier: MIT
+import asyncio
 import json
 from datetime import timezone
 from uuid import uuid4
@@ -9,9 +10,12 @@ from uuid import uuid4
 import pretend
 from fastapi import status
 
+from repository_service_tuf_api import artifacts
+
 ARTIFACTS_URL = "/api/v1/artifacts/"
 ARTIFACTS_DELETE_URL = "/api/v1/artifacts/delete"
 ARTIFACTS_POST_URL = "/api/v1/artifacts/publish/"
+ARTIFACTS_STREAM_URL = "/api/v1/artifacts/stream"
 MOCK_PATH = "repository_service_tuf_api.artifacts"
 
 
@@ -247,6 +251,583 @@ class TestPostArtifacts:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+class TestPostArtifactsCoalesced:
+    def _setup(self, monkeypatch, fake_datetime, coalesce_settings):
+        mocked_bootstrap_state = pretend.call_recorder(
+            lambda *a: pretend.stub(bootstrap=True)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
+        )
+        mocked_repository_metadata = pretend.stub(
+            apply_async=pretend.call_recorder(lambda **kw: None)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.settings",
+            pretend.stub(get=lambda k, d=None: coalesce_settings.get(k, d)),
+        )
+        fake_task_ids = iter(["task-1", "task-2"])
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_task_id", lambda: next(fake_task_ids)
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.datetime", fake_datetime)
+        coalescer = artifacts.ArtifactsCoalescer()
+        monkeypatch.setattr(f"{MOCK_PATH}.artifacts_coalescer", coalescer)
+
+        return mocked_repository_metadata, coalescer
+
+    def test_post_coalesced(self, monkeypatch, test_client, fake_datetime):
+        mocked_repository_metadata, coalescer = self._setup(
+            monkeypatch,
+            fake_datetime,
+            {"ARTIFACTS_COALESCE_WINDOW": 60},
+        )
+        artifact1 = {"info": {"length": 1, "hashes": {"a": "1"}}, "path": "a"}
+        artifact2 = {"info": {"length": 2, "hashes": {"b": "2"}}, "path": "b"}
+
+        response1 = test_client.post(
+            ARTIFACTS_URL, json={"artifacts": [artifact1]}
+        )
+        response2 = test_client.post(
+            ARTIFACTS_URL,
+            json={"artifacts": [artifact2], "add_task_id_to_custom": True},
+        )
+        assert mocked_repository_metadata.apply_async.calls == []
+        coalescer.flush()
+
+        assert response1.status_code == status.HTTP_202_ACCEPTED
+        assert response2.status_code == status.HTTP_202_ACCEPTED
+        assert response1.json()["data"]["task_id"] == "task-1"
+        assert response2.json()["data"]["task_id"] == "task-1"
+        assert response2.json()["data"]["artifacts"] == ["b"]
+        assert mocked_repository_metadata.apply_async.calls == [
+            pretend.call(
+                kwargs={
+                    "action": "add_artifacts",
+                    "payload": {
+                        "artifacts": [
+                            artifact1,
+                            {
+                                "info": {
+                                    "length": 2,
+                                    "hashes": {"b": "2"},
+                                    "custom": {"added_by_task_id": "task-1"},
+                                },
+                                "path": "b",
+                            },
+                        ],
+                        "add_task_id_to_custom": False,
+                        "publish_artifacts": True,
+                    },
+                },
+                task_id="task-1",
+                queue="metadata_repository",
+                acks_late=True,
+            )
+        ]
+
+    def test_post_coalesced_batch_size(
+        self, monkeypatch, test_client, fake_datetime
+    ):
+        mocked_repository_metadata, coalescer = self._setup(
+            monkeypatch,
+            fake_datetime,
+            {"ARTIFACTS_COALESCE_WINDOW": 60, "ARTIFACTS_COALESCE_SIZE": 2},
+        )
+        artifact = {"info": {"length": 1, "hashes": {"a": "1"}}, "path": "a"}
+
+        for _ in range(3):
+            test_client.post(ARTIFACTS_URL, json={"artifacts": [artifact]})
+
+        assert [
+            c.kwargs["task_id"]
+            for c in mocked_repository_metadata.apply_async.calls
+        ] == ["task-1"]
+        coalescer.flush()
+        assert [
+            c.kwargs["task_id"]
+            for c in mocked_repository_metadata.apply_async.calls
+        ] == ["task-1", "task-2"]
+
+    def test_post_coalesced_split_by_publish_artifacts(
+        self, monkeypatch, test_client, fake_datetime
+    ):
+        mocked_repository_metadata, coalescer = self._setup(
+            monkeypatch,
+            fake_datetime,
+            {"ARTIFACTS_COALESCE_WINDOW": 60},
+        )
+        artifact = {"info": {"length": 1, "hashes": {"a": "1"}}, "path": "a"}
+
+        response1 = test_client.post(
+            ARTIFACTS_URL, json={"artifacts": [artifact]}
+        )
+        response2 = test_client.post(
+            ARTIFACTS_URL,
+            json={"artifacts": [artifact], "publish_artifacts": False},
+        )
+        coalescer.flush()
+
+        assert response1.json()["data"]["task_id"] == "task-1"
+        assert response2.json()["data"]["task_id"] == "task-2"
+        assert len(mocked_repository_metadata.apply_async.calls) == 2
+
+    def test_coalescer_window_expired(self, monkeypatch):
+        mocked_repository_metadata = pretend.stub(
+            apply_async=pretend.call_recorder(lambda **kw: None)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", lambda: "task-1")
+        coalescer = artifacts.ArtifactsCoalescer()
+        payload = artifacts.AddPayload(
+            artifacts=[{"info": {"length": 1, "hashes": {}}, "path": "a"}]
+        )
+
+        coalescer.add(payload, window=60, size=10)
+        batch = coalescer._batches[True]
+        batch.timer.cancel()
+        coalescer._expire(batch)
+        # expiring an already published batch does nothing
+        coalescer._expire(batch)
+
+        assert len(mocked_repository_metadata.apply_async.calls) == 1
+
+    def test_coalescer_publish_failure(self, monkeypatch):
+        def fake_apply_async(**kw):
+            raise ConnectionError("broker down")
+
+        mocked_repository_metadata = pretend.stub(
+            apply_async=fake_apply_async,
+            backend=pretend.stub(
+                mark_as_failure=pretend.call_recorder(lambda *a: None)
+            ),
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", lambda: "task-1")
+        coalescer = artifacts.ArtifactsCoalescer()
+        payload = artifacts.AddPayload(
+            artifacts=[{"info": {"length": 1, "hashes": {}}, "path": "a"}]
+        )
+
+        coalescer.add(payload, window=60, size=1)
+
+        calls = mocked_repository_metadata.backend.mark_as_failure.calls
+        assert len(calls) == 1
+        assert calls[0].args[0] == "task-1"
+        assert str(calls[0].args[1]) == "broker down"
+
+
+class TestPostArtifactsGroup:
+    def test_post_chunked(self, monkeypatch, test_client, fake_datetime):
+        mocked_bootstrap_state = pretend.call_recorder(
+            lambda *a: pretend.stub(bootstrap=True)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.bootstrap_state", mocked_bootstrap_state
+        )
+        mocked_repository_metadata = pretend.stub(
+            signature=pretend.call_recorder(lambda **kw: kw["task_id"])
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        )
+        fake_group_result = pretend.stub(
+            save=pretend.call_recorder(lambda: None)
+        )
+        fake_group = pretend.stub(
+            apply_async=pretend.call_recorder(lambda **kw: fake_group_result)
+        )
+        mocked_group = pretend.call_recorder(lambda signatures: fake_group)
+        monkeypatch.setattr(f"{MOCK_PATH}.group", mocked_group)
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.settings",
+            pretend.stub(
+                get=lambda k, d=None: {"ARTIFACTS_CHUNK_SIZE": 2}.get(k, d)
+            ),
+        )
+        fake_task_ids = iter(["group-id", "task-1", "task-2"])
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_task_id", lambda: next(fake_task_ids)
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.datetime", fake_datetime)
+        payload_artifacts = [
+            {"info": {"length": i, "hashes": {"a": "1"}}, "path": f"f{i}"}
+            for i in range(3)
+        ]
+
+        response = test_client.post(
+            ARTIFACTS_URL,
+            json={
+                "artifacts": payload_artifacts,
+                "add_task_id_to_custom": True,
+            },
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json()["data"] == {
+            "artifacts": ["f0", "f1", "f2"],
+            "task_id": "group-id",
+            "last_update": "2019-06-16T09:05:01Z",
+        }
+        for artifact in payload_artifacts:
+            artifact["info"]["custom"] = {"added_by_task_id": "group-id"}
+        assert mocked_repository_metadata.signature.calls == [
+            pretend.call(
+                kwargs={
+                    "action": "add_artifacts",
+                    "payload": {
+                        "artifacts": chunk,
+                        "add_task_id_to_custom": False,
+                        "publish_artifacts": True,
+                    },
+                },
+                task_id=task_id,
+                queue="metadata_repository",
+                acks_late=True,
+            )
+            for task_id, chunk in [
+                ("task-1", payload_artifacts[:2]),
+                ("task-2", payload_artifacts[2:]),
+            ]
+        ]
+        assert mocked_group.calls == [pretend.call(["task-1", "task-2"])]
+        assert fake_group.apply_async.calls == [
+            pretend.call(task_id="group-id")
+        ]
+        assert fake_group_result.save.calls == [pretend.call()]
+
+
+class TestPostArtifactsStream:
+    def _setup(self, monkeypatch, async_return, fake_datetime, bootstrap=True):
+        mocked_bootstrap_state_async = pretend.call_recorder(
+            async_return(pretend.stub(bootstrap=bootstrap, state=None))
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.bootstrap_state_async", mocked_bootstrap_state_async
+        )
+        mocked_repository_metadata = pretend.stub(
+            apply_async=pretend.call_recorder(lambda **kw: None)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.settings",
+            pretend.stub(
+                get=lambda k, d=None: {"ARTIFACTS_STREAM_CHUNK_SIZE": 2}.get(
+                    k, d
+                )
+            ),
+        )
+        fake_task_ids = iter(["task-1", "task-2", "task-3"])
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_task_id", lambda: next(fake_task_ids)
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.datetime", fake_datetime)
+
+        return mocked_repository_metadata
+
+    def _artifact(self, path):
+        return {"info": {"length": 1, "hashes": {"a": "1"}}, "path": path}
+
+    def _ndjson(self, *lines):
+        return "\n".join(
+            line if isinstance(line, str) else json.dumps(line)
+            for line in lines
+        ).encode()
+
+    def test_post_stream(
+        self, monkeypatch, test_client, async_return, fake_datetime
+    ):
+        mocked_repository_metadata = self._setup(
+            monkeypatch, async_return, fake_datetime
+        )
+        body = self._ndjson(
+            self._artifact("a"), "", self._artifact("b"), self._artifact("c")
+        )
+
+        response = test_client.post(
+            f"{ARTIFACTS_STREAM_URL}?publish_artifacts=false",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json() == {
+            "data": {
+                "artifacts": 3,
+                "task_ids": ["task-1", "task-2"],
+                "last_update": "2019-06-16T09:05:01Z",
+            },
+            "message": (
+                "New Artifact(s) successfully submitted. "
+                "Publishing will be skipped."
+            ),
+        }
+        assert mocked_repository_metadata.apply_async.calls == [
+            pretend.call(
+                kwargs={
+                    "action": "add_artifacts",
+                    "payload": {
+                        "artifacts": artifacts,
+                        "add_task_id_to_custom": False,
+                        "publish_artifacts": False,
+                    },
+                },
+                task_id=task_id,
+                queue="metadata_repository",
+                acks_late=True,
+            )
+            for task_id, artifacts in [
+                ("task-1", [self._artifact("a"), self._artifact("b")]),
+                ("task-2", [self._artifact("c")]),
+            ]
+        ]
+
+    def test_post_stream_add_task_id_to_custom(
+        self, monkeypatch, test_client, async_return, fake_datetime
+    ):
+        mocked_repository_metadata = self._setup(
+            monkeypatch, async_return, fake_datetime
+        )
+
+        response = test_client.post(
+            f"{ARTIFACTS_STREAM_URL}?add_task_id_to_custom=true",
+            content=self._ndjson(self._artifact("a")),
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        payload = mocked_repository_metadata.apply_async.calls[0].kwargs[
+            "kwargs"
+        ]["payload"]
+        assert payload["artifacts"][0]["info"]["custom"] == {
+            "added_by_task_id": "task-1"
+        }
+
+    def test_post_stream_invalid_artifact(
+        self, monkeypatch, test_client, async_return, fake_datetime
+    ):
+        mocked_repository_metadata = self._setup(
+            monkeypatch, async_return, fake_datetime
+        )
+        body = self._ndjson(
+            self._artifact("a"),
+            self._artifact("b"),
+            {"path": "c"},
+            self._artifact("d"),
+        )
+
+        response = test_client.post(ARTIFACTS_STREAM_URL, content=body)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        detail = response.json()["detail"]
+        assert detail["message"] == "Invalid artifact."
+        assert detail["error"].startswith("Line 3: 1 validation error")
+        assert detail["task_ids"] == ["task-1"]
+        assert len(mocked_repository_metadata.apply_async.calls) == 1
+
+    def test_post_stream_line_too_long(
+        self, monkeypatch, test_client, async_return, fake_datetime
+    ):
+        self._setup(monkeypatch, async_return, fake_datetime)
+        monkeypatch.setattr(f"{MOCK_PATH}.STREAM_MAX_LINE", 10)
+
+        response = test_client.post(
+            ARTIFACTS_STREAM_URL, content=self._ndjson(self._artifact("a"))
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"] == {
+            "message": "Invalid artifact.",
+            "error": "Line 1: exceeds 10 bytes",
+            "task_ids": [],
+        }
+
+    def test_post_stream_empty(
+        self, monkeypatch, test_client, async_return, fake_datetime
+    ):
+        mocked_repository_metadata = self._setup(
+            monkeypatch, async_return, fake_datetime
+        )
+
+        response = test_client.post(ARTIFACTS_STREAM_URL, content=b"\n")
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"] == {
+            "message": "Invalid artifact.",
+            "error": "No artifacts",
+        }
+        assert mocked_repository_metadata.apply_async.calls == []
+
+    def test__ndjson_lines(self):
+        async def chunks():
+            for chunk in [b'{"a"', b': 1}\n\n{"b": 2', b"}\n", b'{"c": 3}']:
+                yield chunk
+
+        async def lines():
+            return [line async for line in artifacts._ndjson_lines(chunks())]
+
+        assert asyncio.run(lines()) == [
+            (1, b'{"a": 1}'),
+            (3, b'{"b": 2}'),
+            (4, b'{"c": 3}'),
+        ]
+
+    def test_post_stream_without_bootstrap(
+        self, monkeypatch, test_client, async_return, fake_datetime
+    ):
+        self._setup(monkeypatch, async_return, fake_datetime, bootstrap=False)
+
+        response = test_client.post(
+            ARTIFACTS_STREAM_URL, content=self._ndjson(self._artifact("a"))
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == {
+            "detail": {
+                "message": "Task not accepted.",
+                "error": "It requires bootstrap finished. State: None",
+            }
+        }
+
+
+class TestPostArtifactsIndex:
+    def _setup(self, monkeypatch, indexed, index=True):
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.bootstrap_state",
+            lambda *a: pretend.stub(bootstrap=True),
+        )
+        mocked_repository_metadata = pretend.stub(
+            apply_async=pretend.call_recorder(lambda **kw: None)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.settings",
+            pretend.stub(
+                get=lambda k, d=None: {"ARTIFACTS_INDEX": index}.get(k, d)
+            ),
+        )
+        mocked_index = pretend.stub(
+            artifact_digest=lambda info: f"digest-{info['length']}",
+            indexed=pretend.call_recorder(lambda digests: indexed),
+            add_pending=pretend.call_recorder(lambda task_id, digests: None),
+            remove=pretend.call_recorder(lambda paths: None),
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.artifacts_index", mocked_index)
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", lambda: "task_id")
+
+        return mocked_repository_metadata, mocked_index
+
+    def _payload(self, **kwargs):
+        return {
+            "artifacts": [
+                {"info": {"length": i, "hashes": {"a": "1"}}, "path": f"f{i}"}
+                for i in range(2)
+            ],
+            **kwargs,
+        }
+
+    def test_post(self, monkeypatch, test_client):
+        mocked_repository_metadata, mocked_index = self._setup(
+            monkeypatch, set()
+        )
+
+        response = test_client.post(ARTIFACTS_URL, json=self._payload())
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert "skipped" not in response.json()["data"]
+        assert mocked_index.indexed.calls == []
+        assert mocked_index.add_pending.calls == [
+            pretend.call("task_id", {"f0": "digest-0", "f1": "digest-1"})
+        ]
+        assert len(mocked_repository_metadata.apply_async.calls) == 1
+
+    def test_post_skip_existing(self, monkeypatch, test_client):
+        mocked_repository_metadata, mocked_index = self._setup(
+            monkeypatch, {"f0"}
+        )
+
+        response = test_client.post(
+            ARTIFACTS_URL, json=self._payload(skip_existing=True)
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        data = response.json()["data"]
+        assert data["artifacts"] == ["f1"]
+        assert data["skipped"] == ["f0"]
+        assert data["task_id"] == "task_id"
+        assert mocked_index.add_pending.calls == [
+            pretend.call("task_id", {"f1": "digest-1"})
+        ]
+        task_payload = mocked_repository_metadata.apply_async.calls[0].kwargs[
+            "kwargs"
+        ]["payload"]
+        assert task_payload == {
+            "artifacts": [
+                {"info": {"length": 1, "hashes": {"a": "1"}}, "path": "f1"}
+            ],
+            "add_task_id_to_custom": False,
+            "publish_artifacts": True,
+        }
+
+    def test_post_skip_existing_all(self, monkeypatch, test_client):
+        mocked_repository_metadata, mocked_index = self._setup(
+            monkeypatch, {"f0", "f1"}
+        )
+
+        response = test_client.post(
+            ARTIFACTS_URL, json=self._payload(skip_existing=True)
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json()["message"] == (
+            "No new Artifact(s), all already added."
+        )
+        data = response.json()["data"]
+        assert data["artifacts"] == []
+        assert data["skipped"] == ["f0", "f1"]
+        assert "task_id" not in data
+        assert mocked_repository_metadata.apply_async.calls == []
+        assert mocked_index.add_pending.calls == []
+
+    def test_post_skip_existing_index_disabled(self, monkeypatch, test_client):
+        mocked_repository_metadata, _ = self._setup(
+            monkeypatch, set(), index=False
+        )
+
+        response = test_client.post(
+            ARTIFACTS_URL, json=self._payload(skip_existing=True)
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json() == {
+            "detail": {
+                "message": "Task not accepted.",
+                "error": "skip_existing requires RSTUF_ARTIFACTS_INDEX",
+            }
+        }
+        assert mocked_repository_metadata.apply_async.calls == []
+
+    def test_post_delete(self, monkeypatch, test_client):
+        _, mocked_index = self._setup(monkeypatch, set())
+
+        response = test_client.post(
+            ARTIFACTS_DELETE_URL, json={"artifacts": ["f0"]}
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert mocked_index.remove.calls == [pretend.call(["f0"])]
+
+
 class TestPostArtifactsDelete:
     def test_post_delete(self, monkeypatch, test_client, fake_datetime):
         payload = {
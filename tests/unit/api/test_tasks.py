@@ -3,17 +3,25 @@
 #
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import contextlib
+import json
+
 import pretend
 from fastapi import status
 
+from repository_service_tuf_api import tasks
+
 TASK_URL = "/api/v1/task/"
+TASK_BULK_URL = "/api/v1/task/bulk"
+TASK_STREAM_URL = "/api/v1/task/stream"
 MOCK_PATH = "repository_service_tuf_api.tasks"
 
 
 class TestGetTask:
-    def test_get(self, test_client, monkeypatch):
-        mocked_task_result = pretend.stub(
-            state="SUCCESS",
+    def test_get(self, test_client, monkeypatch, async_return):
+        mocked_task_meta = dict(
+            status="SUCCESS",
             result={
                 "status": True,
                 "task": "add_artifacts",
@@ -30,12 +38,10 @@ class TestGetTask:
                 },
             },
         )
-        mocked_repository_metadata = pretend.stub(
-            AsyncResult=pretend.call_recorder(lambda t: mocked_task_result)
-        )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        mocked_get_task_meta = pretend.call_recorder(
+            async_return(mocked_task_meta)
         )
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_meta", mocked_get_task_meta)
 
         test_response = test_client.get(f"{TASK_URL}?task_id=test_id")
         assert test_response.status_code == status.HTTP_200_OK
@@ -61,20 +67,18 @@ class TestGetTask:
             },
             "message": "Task state.",
         }
-        assert mocked_repository_metadata.AsyncResult.calls == [
-            pretend.call("test_id")
-        ]
+        assert mocked_get_task_meta.calls == [pretend.call("test_id")]
 
-    def test_get_result_is_exception(self, test_client, monkeypatch):
-        mocked_task_result = pretend.stub(
-            state="FAILURE", result=ValueError("Failed to load")
-        )
-        mocked_repository_metadata = pretend.stub(
-            AsyncResult=pretend.call_recorder(lambda t: mocked_task_result)
+    def test_get_result_is_exception(
+        self, test_client, monkeypatch, async_return
+    ):
+        mocked_task_meta = dict(
+            status="FAILURE", result=ValueError("Failed to load")
         )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        mocked_get_task_meta = pretend.call_recorder(
+            async_return(mocked_task_meta)
         )
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_meta", mocked_get_task_meta)
 
         test_response = test_client.get(f"{TASK_URL}?task_id=test_id")
         assert test_response.status_code == status.HTTP_200_OK
@@ -88,13 +92,13 @@ class TestGetTask:
             },
             "message": "Task state.",
         }
-        assert mocked_repository_metadata.AsyncResult.calls == [
-            pretend.call("test_id")
-        ]
+        assert mocked_get_task_meta.calls == [pretend.call("test_id")]
 
-    def test_get_result_is_errored(self, test_client, monkeypatch):
-        mocked_task_result = pretend.stub(
-            state="SUCCESS",
+    def test_get_result_is_errored(
+        self, test_client, monkeypatch, async_return
+    ):
+        mocked_task_meta = dict(
+            status="SUCCESS",
             result={
                 "status": False,
                 "task": "sign_metadata",
@@ -103,12 +107,10 @@ class TestGetTask:
                 "error": "No signatures pending for root",
             },
         )
-        mocked_repository_metadata = pretend.stub(
-            AsyncResult=pretend.call_recorder(lambda t: mocked_task_result)
-        )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        mocked_get_task_meta = pretend.call_recorder(
+            async_return(mocked_task_meta)
         )
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_meta", mocked_get_task_meta)
 
         test_response = test_client.get(f"{TASK_URL}?task_id=test_id")
         assert test_response.status_code == status.HTTP_200_OK
@@ -127,23 +129,19 @@ class TestGetTask:
             },
             "message": "Task state.",
         }
-        assert mocked_repository_metadata.AsyncResult.calls == [
-            pretend.call("test_id")
-        ]
+        assert mocked_get_task_meta.calls == [pretend.call("test_id")]
 
     def test_get_result_success_with_empty_result(
-        self, test_client, monkeypatch
+        self, test_client, monkeypatch, async_return
     ):
-        mocked_task_result = pretend.stub(
-            state="SUCCESS",
+        mocked_task_meta = dict(
+            status="SUCCESS",
             result={},
         )
-        mocked_repository_metadata = pretend.stub(
-            AsyncResult=pretend.call_recorder(lambda t: mocked_task_result)
-        )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        mocked_get_task_meta = pretend.call_recorder(
+            async_return(mocked_task_meta)
         )
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_meta", mocked_get_task_meta)
 
         test_response = test_client.get(f"{TASK_URL}?task_id=test_id")
         assert test_response.status_code == status.HTTP_200_OK
@@ -156,23 +154,19 @@ class TestGetTask:
             },
             "message": "Task state.",
         }
-        assert mocked_repository_metadata.AsyncResult.calls == [
-            pretend.call("test_id")
-        ]
+        assert mocked_get_task_meta.calls == [pretend.call("test_id")]
 
     def test_get_result_failure_with_empty_result(
-        self, test_client, monkeypatch
+        self, test_client, monkeypatch, async_return
     ):
-        mocked_task_result = pretend.stub(
-            state="FAILURE",
+        mocked_task_meta = dict(
+            status="FAILURE",
             result={},
         )
-        mocked_repository_metadata = pretend.stub(
-            AsyncResult=pretend.call_recorder(lambda t: mocked_task_result)
-        )
-        monkeypatch.setattr(
-            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        mocked_get_task_meta = pretend.call_recorder(
+            async_return(mocked_task_meta)
         )
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_meta", mocked_get_task_meta)
 
         test_response = test_client.get(f"{TASK_URL}?task_id=test_id")
         assert test_response.status_code == status.HTTP_200_OK
@@ -185,6 +179,1003 @@ class TestGetTask:
             },
             "message": "Task state.",
         }
-        assert mocked_repository_metadata.AsyncResult.calls == [
-            pretend.call("test_id")
+        assert mocked_get_task_meta.calls == [pretend.call("test_id")]
+
+    def test_get_wait(self, test_client, monkeypatch, async_return):
+        mocked_wait_task_meta = pretend.call_recorder(
+            async_return({"status": "SUCCESS", "result": {"status": True}})
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.wait_task_meta", mocked_wait_task_meta
+        )
+        mocked_get_group_tasks = pretend.call_recorder(async_return(None))
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_group_tasks", mocked_get_group_tasks
+        )
+
+        test_response = test_client.get(f"{TASK_URL}?task_id=test_id&wait=30")
+
+        assert test_response.status_code == status.HTTP_200_OK
+        assert test_response.json() == {
+            "data": {
+                "task_id": "test_id",
+                "state": "SUCCESS",
+                "result": {"status": True},
+            },
+            "message": "Task state.",
+        }
+        assert mocked_wait_task_meta.calls == [pretend.call("test_id", 30)]
+        assert mocked_get_group_tasks.calls == [pretend.call("test_id")]
+
+    def test_get_group(self, test_client, monkeypatch, async_return):
+        mocked_get_task_meta = pretend.call_recorder(
+            async_return({"status": "PENDING", "result": None})
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_meta", mocked_get_task_meta)
+        mocked_get_group_tasks = pretend.call_recorder(
+            async_return(["t1", "t2"])
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_group_tasks", mocked_get_group_tasks
+        )
+        mocked_get_task_metas = pretend.call_recorder(
+            async_return(
+                {
+                    "t1": {
+                        "status": "SUCCESS",
+                        "result": {
+                            "status": True,
+                            "task": "add_artifacts",
+                            "last_update": "2023-11-17T09:54:15.762882",
+                        },
+                    },
+                    "t2": {"status": "STARTED", "result": {}},
+                }
+            )
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_task_metas", mocked_get_task_metas
+        )
+
+        test_response = test_client.get(f"{TASK_URL}?task_id=group_id")
+
+        assert test_response.status_code == status.HTTP_200_OK
+        assert test_response.json() == {
+            "data": {
+                "task_id": "group_id",
+                "state": "STARTED",
+                "result": {
+                    "message": "1/2 tasks finished",
+                    "task": "add_artifacts",
+                    "last_update": "2023-11-17T09:54:15.762882",
+                    "details": {
+                        "finished": 1,
+                        "total": 2,
+                        "tasks": {"t1": "SUCCESS", "t2": "STARTED"},
+                    },
+                },
+            },
+            "message": "Task state.",
+        }
+        assert mocked_get_task_meta.calls == [pretend.call("group_id")]
+        assert mocked_get_group_tasks.calls == [pretend.call("group_id")]
+        assert mocked_get_task_metas.calls == [pretend.call(["t1", "t2"])]
+
+    def test_get_group_wait(self, test_client, monkeypatch, async_return):
+        mocked_get_group_tasks = pretend.call_recorder(
+            async_return(["t1", "t2"])
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_group_tasks", mocked_get_group_tasks
+        )
+        mocked_wait_task_meta = pretend.call_recorder(
+            async_return({"status": "SUCCESS", "result": {"status": True}})
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.wait_task_meta", mocked_wait_task_meta
+        )
+
+        test_response = test_client.get(f"{TASK_URL}?task_id=group_id&wait=5")
+
+        assert test_response.status_code == status.HTTP_200_OK
+        data = test_response.json()["data"]
+        assert data["state"] == "SUCCESS"
+        assert data["result"]["status"] is True
+        assert data["result"]["message"] == "2/2 tasks finished"
+        assert mocked_wait_task_meta.calls == [
+            pretend.call("t1", 5),
+            pretend.call("t2", 5),
+        ]
+
+    def test_get_wait_above_max(self, test_client):
+        test_response = test_client.get(
+            f"{TASK_URL}?task_id=test_id&wait={tasks.MAX_WAIT + 1}"
+        )
+
+        assert (
+            test_response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+
+class TestGetTaskStream:
+    def test_get_stream(self, test_client, monkeypatch):
+        async def fake_stream(task_ids):
+            yield "event: task_state\ndata: {}\n\n"
+            yield ": keep-alive\n\n"
+
+        mocked_stream = pretend.call_recorder(fake_stream)
+        monkeypatch.setattr(f"{MOCK_PATH}.stream", mocked_stream)
+
+        test_response = test_client.get(
+            f"{TASK_STREAM_URL}?task_id=id1&task_id=id2"
+        )
+
+        assert test_response.status_code == status.HTTP_200_OK
+        assert test_response.headers["content-type"].startswith(
+            "text/event-stream"
+        )
+        assert test_response.text == (
+            "event: task_state\ndata: {}\n\n: keep-alive\n\n"
+        )
+        assert mocked_stream.calls == [pretend.call(["id1", "id2"])]
+
+    def test_get_stream_all_tasks(self, test_client, monkeypatch):
+        async def fake_stream(task_ids):
+            yield ": keep-alive\n\n"
+
+        mocked_stream = pretend.call_recorder(fake_stream)
+        monkeypatch.setattr(f"{MOCK_PATH}.stream", mocked_stream)
+
+        test_response = test_client.get(TASK_STREAM_URL)
+
+        assert test_response.status_code == status.HTTP_200_OK
+        assert mocked_stream.calls == [pretend.call([])]
+
+
+class TestPostBulkTask:
+    def test_post_bulk(self, test_client, monkeypatch, async_return):
+        mocked_task_metas = {
+            "id1": {
+                "status": "SUCCESS",
+                "result": {"status": True, "task": "add_artifacts"},
+            },
+            "id2": {"status": "SUCCESS", "result": {"status": False}},
+            "id3": {"status": "FAILURE", "result": ValueError("Failed")},
+            "id4": {"status": "PENDING", "result": None},
+        }
+        mocked_get_task_metas = pretend.call_recorder(
+            async_return(mocked_task_metas)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_task_metas", mocked_get_task_metas
+        )
+        mocked_get_group_tasks = pretend.call_recorder(async_return(None))
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_group_tasks", mocked_get_group_tasks
+        )
+
+        test_response = test_client.post(
+            TASK_BULK_URL,
+            json={"task_ids": ["id1", "id2", "id3", "id4", "id1"]},
+        )
+
+        assert test_response.status_code == status.HTTP_200_OK
+        assert test_response.json() == {
+            "data": {
+                "id1": {
+                    "task_id": "id1",
+                    "state": "SUCCESS",
+                    "result": {"status": True, "task": "add_artifacts"},
+                },
+                "id2": {
+                    "task_id": "id2",
+                    "state": "ERRORED",
+                    "result": {"status": False},
+                },
+                "id3": {
+                    "task_id": "id3",
+                    "state": "FAILURE",
+                    "result": {"message": "Failed"},
+                },
+                "id4": {"task_id": "id4", "state": "PENDING"},
+            },
+            "message": "Tasks state.",
+        }
+        assert mocked_get_task_metas.calls == [
+            pretend.call(["id1", "id2", "id3", "id4"])
+        ]
+        assert mocked_get_group_tasks.calls == [pretend.call("id4")]
+
+    def test_post_bulk_group(self, test_client, monkeypatch):
+        metas = {
+            "id1": {"status": "STARTED", "result": None},
+            "group_id": {"status": "PENDING", "result": None},
+            "t1": {
+                "status": "SUCCESS",
+                "result": {"status": True, "task": "add_artifacts"},
+            },
+            "t2": {"status": "STARTED", "result": None},
+        }
+
+        async def fake_get_task_metas(task_ids):
+            return {task_id: metas[task_id] for task_id in task_ids}
+
+        async def fake_get_group_tasks(task_id):
+            return ["t1", "t2"] if task_id == "group_id" else None
+
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_metas", fake_get_task_metas)
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_group_tasks", fake_get_group_tasks
+        )
+
+        test_response = test_client.post(
+            TASK_BULK_URL, json={"task_ids": ["id1", "group_id"]}
+        )
+
+        assert test_response.status_code == status.HTTP_200_OK
+        assert test_response.json()["data"] == {
+            "id1": {"task_id": "id1", "state": "STARTED"},
+            "group_id": {
+                "task_id": "group_id",
+                "state": "STARTED",
+                "result": {
+                    "message": "1/2 tasks finished",
+                    "task": "add_artifacts",
+                    "details": {
+                        "finished": 1,
+                        "total": 2,
+                        "tasks": {"t1": "SUCCESS", "t2": "STARTED"},
+                    },
+                },
+            },
+        }
+
+    def test_post_bulk_empty(self, test_client):
+        test_response = test_client.post(TASK_BULK_URL, json={"task_ids": []})
+
+        assert (
+            test_response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+    def test_post_bulk_too_many(self, test_client):
+        task_ids = [f"id{i}" for i in range(tasks.BULK_MAX_TASKS + 1)]
+        test_response = test_client.post(
+            TASK_BULK_URL, json={"task_ids": task_ids}
+        )
+
+        assert (
+            test_response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+
+class TestGetTaskMeta:
+    def test_get_task_meta(self, monkeypatch, async_return):
+        fake_backend = pretend.stub(
+            get_key_for_task=pretend.call_recorder(
+                lambda t: b"celery-task-meta-test_id"
+            ),
+            decode_result=pretend.call_recorder(lambda m: json.loads(m)),
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata",
+            pretend.stub(backend=fake_backend),
+        )
+        meta = json.dumps({"status": "SUCCESS", "result": {"status": True}})
+        fake_redis = pretend.stub(
+            get=pretend.call_recorder(async_return(meta))
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.result_backend_async", lambda: fake_redis
+        )
+
+        result = asyncio.run(tasks.get_task_meta("test_id"))
+
+        assert result == {"status": "SUCCESS", "result": {"status": True}}
+        assert fake_redis.get.calls == [
+            pretend.call(b"celery-task-meta-test_id")
+        ]
+        assert fake_backend.decode_result.calls == [pretend.call(meta)]
+
+    def test_get_task_meta_unknown_task(self, monkeypatch, async_return):
+        fake_backend = pretend.stub(
+            get_key_for_task=lambda t: b"celery-task-meta-test_id",
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata",
+            pretend.stub(backend=fake_backend),
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.result_backend_async",
+            lambda: pretend.stub(get=async_return(None)),
+        )
+
+        result = asyncio.run(tasks.get_task_meta("test_id"))
+
+        assert result == {"status": "PENDING", "result": None}
+
+    def test_get_task_metas(self, monkeypatch, async_return):
+        fake_backend = pretend.stub(
+            get_key_for_task=lambda t: f"celery-task-meta-{t}".encode(),
+            decode_result=pretend.call_recorder(lambda m: json.loads(m)),
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata",
+            pretend.stub(backend=fake_backend),
+        )
+        meta = json.dumps({"status": "STARTED", "result": None})
+        fake_redis = pretend.stub(
+            mget=pretend.call_recorder(async_return([meta, None]))
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.result_backend_async", lambda: fake_redis
+        )
+
+        result = asyncio.run(tasks.get_task_metas(["id1", "id2"]))
+
+        assert result == {
+            "id1": {"status": "STARTED", "result": None},
+            "id2": {"status": "PENDING", "result": None},
+        }
+        assert fake_redis.mget.calls == [
+            pretend.call([b"celery-task-meta-id1", b"celery-task-meta-id2"])
+        ]
+
+
+class TestGroup:
+    def test_get_group_tasks(self, monkeypatch, async_return):
+        backend = tasks.repository_metadata.backend
+        meta = backend.encode(
+            {
+                "result": (
+                    ("group_id", None),
+                    [(("t1", None), None), (("t2", None), None)],
+                )
+            }
+        )
+        fake_redis = pretend.stub(
+            get=pretend.call_recorder(async_return(meta))
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.result_backend_async", lambda: fake_redis
+        )
+
+        result = asyncio.run(tasks.get_group_tasks("group_id"))
+
+        assert result == ["t1", "t2"]
+        assert fake_redis.get.calls == [
+            pretend.call(b"celery-taskset-meta-group_id")
+        ]
+
+    def test_get_group_tasks_not_a_group(self, monkeypatch, async_return):
+        fake_redis = pretend.stub(get=async_return(None))
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.result_backend_async", lambda: fake_redis
+        )
+
+        assert asyncio.run(tasks.get_group_tasks("task_id")) is None
+
+    def _metas(self, *task_states):
+        return {
+            f"t{i}": {
+                "status": state,
+                "result": {"status": state != "ERRORED"},
+            }
+            for i, state in enumerate(task_states)
+        }
+
+    def test__group_data_pending(self):
+        result = tasks._group_data(
+            "group_id",
+            {
+                "t0": {"status": "PENDING", "result": None},
+                "t1": {"status": "PENDING", "result": None},
+            },
+        )
+
+        assert result.state == tasks.TaskState.PENDING
+        assert result.result.status is None
+        assert result.result.message == "0/2 tasks finished"
+
+    def test__group_data_success(self):
+        result = tasks._group_data(
+            "group_id", self._metas("SUCCESS", "SUCCESS")
+        )
+
+        assert result.state == tasks.TaskState.SUCCESS
+        assert result.result.status is True
+
+    def test__group_data_errored(self):
+        metas = self._metas("SUCCESS", "SUCCESS")
+        metas["t1"]["result"]["status"] = False
+
+        result = tasks._group_data("group_id", metas)
+
+        assert result.state == tasks.TaskState.ERRORED
+        assert result.result.status is False
+        assert result.result.details["tasks"] == {
+            "t0": tasks.TaskState.SUCCESS,
+            "t1": tasks.TaskState.ERRORED,
+        }
+
+    def test__group_data_failure(self):
+        metas = self._metas("SUCCESS", "FAILURE")
+        metas["t1"]["result"] = ValueError("failed")
+
+        result = tasks._group_data("group_id", metas)
+
+        assert result.state == tasks.TaskState.FAILURE
+        assert result.result.status is False
+
+
+class TestIndexArtifacts:
+    def _setup(self, monkeypatch, pending_tasks, metas, groups):
+        async def fake_commit(task_id, invalid_paths):
+            return 1
+
+        async def fake_discard(task_id):
+            return None
+
+        async def fake_get_task_metas(task_ids):
+            return {task_id: metas[task_id] for task_id in task_ids}
+
+        async def fake_get_group_tasks(task_id):
+            return groups.get(task_id)
+
+        fake_index = pretend.stub(
+            pending_tasks=pretend.call_recorder(
+                lambda: self._async(pending_tasks)
+            ),
+            commit=pretend.call_recorder(fake_commit),
+            discard=pretend.call_recorder(fake_discard),
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.artifacts_index", fake_index)
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_task_metas",
+            pretend.call_recorder(fake_get_task_metas),
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_group_tasks", fake_get_group_tasks
+        )
+
+        return fake_index
+
+    async def _async(self, value):
+        return value
+
+    def _result(self, invalid_paths=()):
+        return {
+            "status": True,
+            "task": "add_artifacts",
+            "details": {"invalid_paths": list(invalid_paths)},
+        }
+
+    def test_index_artifacts(self, monkeypatch):
+        fake_index = self._setup(
+            monkeypatch,
+            ["t1", "t2", "t3", "t4", "g1", "g2"],
+            {
+                "t1": {
+                    "status": "SUCCESS",
+                    "result": self._result(invalid_paths=["f1"]),
+                },
+                "t2": {"status": "STARTED", "result": None},
+                "t3": {"status": "FAILURE", "result": ValueError("failed")},
+                "t4": {"status": "SUCCESS", "result": {"status": False}},
+                "g1": {"status": "PENDING", "result": None},
+                "g2": {"status": "PENDING", "result": None},
+                "m1": {
+                    "status": "SUCCESS",
+                    "result": self._result(invalid_paths=["f2"]),
+                },
+                "m2": {"status": "SUCCESS", "result": self._result()},
+                "m3": {"status": "SUCCESS", "result": self._result()},
+                "m4": {"status": "STARTED", "result": None},
+            },
+            {"g1": ["m1", "m2"], "g2": ["m3", "m4"]},
+        )
+
+        result = asyncio.run(tasks.index_artifacts())
+
+        assert result == 4
+        assert fake_index.commit.calls == [
+            pretend.call("t1", ["f1"]),
+            pretend.call("g1", ["f2"]),
+        ]
+        assert fake_index.discard.calls == [
+            pretend.call("t3"),
+            pretend.call("t4"),
+        ]
+        assert tasks.get_task_metas.calls == [
+            pretend.call(["t1", "t2", "t3", "t4", "g1", "g2"]),
+            pretend.call(["m1", "m2", "m3", "m4"]),
+        ]
+
+    def test_index_artifacts_no_pending(self, monkeypatch):
+        fake_index = self._setup(monkeypatch, [], {}, {})
+
+        assert asyncio.run(tasks.index_artifacts()) == 0
+        assert fake_index.commit.calls == []
+        assert tasks.get_task_metas.calls == []
+
+    def test_get_does_not_index(self, test_client, monkeypatch, async_return):
+        fake_index = self._setup(monkeypatch, [], {}, {})
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_task_meta",
+            async_return({"status": "SUCCESS", "result": self._result()}),
+        )
+
+        response = test_client.get(f"{TASK_URL}?task_id=task_id")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert fake_index.commit.calls == []
+
+    def test_artifacts_indexer(self, monkeypatch):
+        # the task is indexed by the next run, up to the interval later
+        calls = []
+
+        async def fake_index_artifacts():
+            calls.append(len(calls))
+            if len(calls) == 1:
+                raise ConnectionError("redis down")
+            return 1
+
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.index_artifacts", fake_index_artifacts
+        )
+        fake_logging = pretend.stub(
+            error=pretend.call_recorder(lambda m: None)
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.logging", fake_logging)
+        indexer = tasks.ArtifactsIndexer()
+
+        async def run():
+            indexer.start(0.01)
+            indexer.start(0.01)
+            while len(calls) < 3:
+                await asyncio.sleep(0.01)
+            await indexer.stop()
+
+        asyncio.run(run())
+
+        assert len(calls) >= 3
+        assert indexer._task is None
+        assert fake_logging.error.calls == [
+            pretend.call("Artifacts indexer error: redis down")
+        ]
+
+
+class FakePubSub:
+    def __init__(self):
+        self.subscribed = []
+        self.unsubscribed = []
+        self.messages = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.subscribed.append(channel)
+
+    async def unsubscribe(self, *channels):
+        self.unsubscribed.extend(channels)
+
+    async def psubscribe(self, channel):
+        self.subscribed.append(("pattern", channel))
+
+    async def punsubscribe(self, *channels):
+        self.unsubscribed.extend(("pattern", c) for c in channels)
+
+    async def get_message(self, ignore_subscribe_messages, timeout):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class TestTaskStateWatcher:
+    def test_subscribe_and_dispatch(self):
+        fake_pubsub = FakePubSub()
+        watcher = tasks.TaskStateWatcher(
+            pretend.stub(pubsub=lambda: fake_pubsub)
+        )
+
+        async def run():
+            queue1 = await watcher.subscribe(b"key1")
+            queue2 = await watcher.subscribe(b"key1")
+            queue3 = await watcher.subscribe(b"key2")
+            fake_pubsub.messages.put_nowait(
+                {"channel": b"key1", "data": b"meta1"}
+            )
+            messages = await asyncio.gather(queue1.get(), queue2.get())
+
+            await watcher.unsubscribe([b"key1"], queue1)
+            assert fake_pubsub.unsubscribed == []
+            await watcher.unsubscribe([b"key1"], queue2)
+            await watcher.unsubscribe([b"key2"], queue3)
+
+            return messages, queue3.empty()
+
+        messages, queue3_empty = asyncio.run(run())
+
+        assert messages == [b"meta1", b"meta1"]
+        assert queue3_empty is True
+        assert fake_pubsub.subscribed == [b"key1", b"key2"]
+        assert fake_pubsub.unsubscribed == [b"key1", b"key2"]
+
+    def test_subscribe_pattern(self):
+        fake_pubsub = FakePubSub()
+        watcher = tasks.TaskStateWatcher(
+            pretend.stub(pubsub=lambda: fake_pubsub)
+        )
+
+        async def run():
+            queue = asyncio.Queue()
+            await watcher.subscribe(b"key1", queue)
+            await watcher.subscribe(b"key*", queue, pattern=True)
+            fake_pubsub.messages.put_nowait(
+                {"pattern": b"key*", "channel": b"key2", "data": b"meta2"}
+            )
+            fake_pubsub.messages.put_nowait(
+                {"pattern": None, "channel": b"key1", "data": b"meta1"}
+            )
+            messages = [await queue.get(), await queue.get()]
+            await watcher.unsubscribe([b"key1", b"key*"], queue)
+
+            return messages
+
+        assert asyncio.run(run()) == [b"meta2", b"meta1"]
+        assert fake_pubsub.subscribed == [b"key1", ("pattern", b"key*")]
+        assert fake_pubsub.unsubscribed == [("pattern", b"key*"), b"key1"]
+        assert watcher._patterns == set()
+
+    def test_unsubscribe_cancelled(self):
+        class SlowPubSub(FakePubSub):
+            async def unsubscribe(self, *channels):
+                await asyncio.sleep(0.01)
+                await super().unsubscribe(*channels)
+
+        fake_pubsub = SlowPubSub()
+        watcher = tasks.TaskStateWatcher(
+            pretend.stub(pubsub=lambda: fake_pubsub)
+        )
+
+        async def run():
+            queue = asyncio.Queue()
+            for channel in [b"key1", b"key2", b"key3"]:
+                await watcher.subscribe(channel, queue)
+            unsubscribe = asyncio.create_task(
+                watcher.unsubscribe([b"key1", b"key2", b"key3"], queue)
+            )
+            await asyncio.sleep(0)
+            unsubscribe.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await unsubscribe
+            assert watcher._queues == {}
+            # the shielded unsubscribe completes
+            await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+
+        assert fake_pubsub.unsubscribed == [b"key1", b"key2", b"key3"]
+
+    def test_read_failure(self, monkeypatch, async_return):
+        class FailingPubSub(FakePubSub):
+            failed = False
+
+            async def get_message(self, **kw):
+                if self.failed is False:
+                    self.failed = True
+                    raise ConnectionError("lost")
+
+                return await super().get_message(**kw)
+
+        fake_pubsub = FailingPubSub()
+        watcher = tasks.TaskStateWatcher(
+            pretend.stub(pubsub=lambda: fake_pubsub)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.asyncio.sleep",
+            pretend.call_recorder(async_return(None)),
+        )
+
+        async def run():
+            queue = await watcher.subscribe(b"key1")
+            fake_pubsub.messages.put_nowait(
+                {"channel": b"key1", "data": b"meta1"}
+            )
+            message = await queue.get()
+            await watcher.unsubscribe([b"key1"], queue)
+
+            return message
+
+        assert asyncio.run(run()) == b"meta1"
+        assert tasks.asyncio.sleep.calls == [pretend.call(1)]
+
+
+class TestWaitTaskMeta:
+    def _setup(self, monkeypatch, async_return, metas):
+        queue = asyncio.Queue()
+        fake_watcher = pretend.stub(
+            subscribe=pretend.call_recorder(async_return(queue)),
+            unsubscribe=pretend.call_recorder(async_return(None)),
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.task_state_watcher", lambda: fake_watcher
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata",
+            pretend.stub(
+                backend=pretend.stub(
+                    get_key_for_task=lambda t: b"celery-task-meta-id",
+                    decode_result=lambda m: json.loads(m),
+                )
+            ),
+        )
+        fake_metas = iter(metas)
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_task_meta",
+            lambda t: async_return(next(fake_metas))(),
+        )
+
+        return fake_watcher, queue
+
+    def test_wait_task_meta_ready(self, monkeypatch, async_return):
+        fake_watcher, _ = self._setup(
+            monkeypatch, async_return, [{"status": "SUCCESS", "result": {}}]
+        )
+
+        meta = asyncio.run(tasks.wait_task_meta("id", 10))
+
+        assert meta == {"status": "SUCCESS", "result": {}}
+        assert fake_watcher.subscribe.calls == [
+            pretend.call(b"celery-task-meta-id")
+        ]
+        assert len(fake_watcher.unsubscribe.calls) == 1
+
+    def test_wait_task_meta_state_change(self, monkeypatch, async_return):
+        fake_watcher, queue = self._setup(
+            monkeypatch, async_return, [{"status": "PENDING", "result": None}]
+        )
+        queue.put_nowait(json.dumps({"status": "STARTED", "result": None}))
+        queue.put_nowait(json.dumps({"status": "FAILURE", "result": None}))
+
+        meta = asyncio.run(tasks.wait_task_meta("id", 10))
+
+        assert meta == {"status": "FAILURE", "result": None}
+        assert queue.empty()
+
+    def test_wait_task_meta_timeout(self, monkeypatch, async_return):
+        fake_watcher, _ = self._setup(
+            monkeypatch, async_return, [{"status": "STARTED", "result": None}]
+        )
+
+        meta = asyncio.run(tasks.wait_task_meta("id", 0.01))
+
+        assert meta == {"status": "STARTED", "result": None}
+        assert len(fake_watcher.unsubscribe.calls) == 1
+
+
+class TestStream:
+    def _setup(self, monkeypatch, async_return, metas=None):
+        queues = []
+
+        async def fake_subscribe(channel, queue, pattern):
+            queues.append(queue)
+
+        fake_watcher = pretend.stub(
+            subscribe=pretend.call_recorder(fake_subscribe),
+            unsubscribe=pretend.call_recorder(async_return(None)),
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.task_state_watcher", lambda: fake_watcher
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata",
+            pretend.stub(
+                backend=pretend.stub(
+                    get_key_for_task=lambda t: f"meta-{t}".encode(),
+                    decode_result=lambda m: json.loads(m),
+                )
+            ),
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_metas", async_return(metas))
+
+        return fake_watcher, queues
+
+    def test_stream_task_ids(self, monkeypatch, async_return):
+        fake_watcher, queues = self._setup(
+            monkeypatch,
+            async_return,
+            {
+                "id1": {"status": "SUCCESS", "result": {"status": True}},
+                "id2": {"status": "STARTED", "result": None},
+            },
+        )
+
+        async def run():
+            events = []
+            async for event in tasks.stream(["id1", "id2", "id1"]):
+                events.append(event)
+                if len(events) == 2:
+                    queues[0].put_nowait(
+                        json.dumps(
+                            {
+                                "task_id": "id2",
+                                "status": "SUCCESS",
+                                "result": {"status": False},
+                            }
+                        )
+                    )
+
+            return events
+
+        events = asyncio.run(run())
+
+        assert events == [
+            "event: task_state\ndata: "
+            '{"task_id":"id1","state":"SUCCESS","result":{"status":true}}\n\n',
+            'event: task_state\ndata: {"task_id":"id2","state":"STARTED"}\n\n',
+            "event: task_state\ndata: "
+            '{"task_id":"id2","state":"ERRORED","result":{"status":false}}'
+            "\n\n",
+        ]
+        assert [c.args for c in fake_watcher.subscribe.calls] == [
+            (b"meta-id1", queues[0], False),
+            (b"meta-id2", queues[0], False),
+        ]
+        assert [c.args for c in fake_watcher.unsubscribe.calls] == [
+            ([b"meta-id1", b"meta-id2"], queues[0]),
+        ]
+
+    def test_stream_task_ids_all_ready(self, monkeypatch, async_return):
+        fake_watcher, _ = self._setup(
+            monkeypatch,
+            async_return,
+            {"id1": {"status": "FAILURE", "result": None}},
+        )
+
+        async def run():
+            return [event async for event in tasks.stream(["id1"])]
+
+        events = asyncio.run(run())
+
+        assert events == [
+            'event: task_state\ndata: {"task_id":"id1","state":"FAILURE"}\n\n'
+        ]
+        assert len(fake_watcher.unsubscribe.calls) == 1
+
+    def test_stream_all_tasks(self, monkeypatch, async_return):
+        fake_watcher, queues = self._setup(monkeypatch, async_return)
+        monkeypatch.setattr(f"{MOCK_PATH}.STREAM_KEEP_ALIVE", 0.01)
+
+        async def run():
+            events = []
+            task_stream = tasks.stream([])
+            events.append(await anext(task_stream))
+            queues[0].put_nowait(
+                json.dumps(
+                    {"task_id": "id9", "status": "RUNNING", "result": None}
+                )
+            )
+            events.append(await anext(task_stream))
+            await task_stream.aclose()
+
+            return events
+
+        events = asyncio.run(run())
+
+        assert events == [
+            ": keep-alive\n\n",
+            'event: task_state\ndata: {"task_id":"id9","state":"RUNNING"}\n\n',
+        ]
+        assert [c.args for c in fake_watcher.subscribe.calls] == [
+            (b"meta-*", queues[0], True)
+        ]
+        assert [c.args for c in fake_watcher.unsubscribe.calls] == [
+            ([b"meta-*"], queues[0])
+        ]
+
+    def test_stream_cancelled(self, monkeypatch, async_return):
+        # a client disconnect cancels the stream at every await
+        class SlowPubSub(FakePubSub):
+            async def unsubscribe(self, *channels):
+                await asyncio.sleep(0)
+                await super().unsubscribe(*channels)
+
+        fake_pubsub = SlowPubSub()
+        watcher = tasks.TaskStateWatcher(
+            pretend.stub(pubsub=lambda: fake_pubsub)
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.task_state_watcher", lambda: watcher)
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata",
+            pretend.stub(
+                backend=pretend.stub(
+                    get_key_for_task=lambda t: f"meta-{t}".encode()
+                )
+            ),
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_task_metas",
+            async_return(
+                {
+                    t: {"status": "STARTED", "result": None}
+                    for t in ["a", "b", "c"]
+                }
+            ),
+        )
+
+        async def consume():
+            async for _ in tasks.stream(["a", "b", "c"]):
+                pass
+
+        async def run():
+            consumer = asyncio.create_task(consume())
+            while len(fake_pubsub.subscribed) < 3 or consumer.done():
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.01)
+            while not consumer.done():
+                consumer.cancel()
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+
+        assert watcher._queues == {}
+        assert sorted(fake_pubsub.unsubscribed) == [
+            b"meta-a",
+            b"meta-b",
+            b"meta-c",
+        ]
+
+    def test_stream_group(self, monkeypatch, async_return):
+        fake_watcher, queues = self._setup(monkeypatch, async_return)
+        metas = {
+            "group_id": {"status": "PENDING", "result": None},
+            "t1": {"status": "SUCCESS", "result": {"status": True}},
+            "t2": {"status": "STARTED", "result": None},
+        }
+
+        async def fake_get_task_metas(task_ids):
+            return {task_id: metas[task_id] for task_id in task_ids}
+
+        async def fake_get_group_tasks(task_id):
+            return ["t1", "t2"] if task_id == "group_id" else None
+
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_metas", fake_get_task_metas)
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.get_group_tasks", fake_get_group_tasks
+        )
+
+        async def run():
+            events = []
+            async for event in tasks.stream(["group_id"]):
+                events.append(json.loads(event.split("data: ")[1]))
+                if len(events) == 1:
+                    queues[0].put_nowait(
+                        json.dumps(
+                            {
+                                "task_id": "t2",
+                                "status": "SUCCESS",
+                                "result": {"status": True},
+                            }
+                        )
+                    )
+
+            return events
+
+        events = asyncio.run(run())
+
+        assert [(e["task_id"], e["state"]) for e in events] == [
+            ("group_id", "STARTED"),
+            ("group_id", "SUCCESS"),
+        ]
+        assert events[1]["result"]["details"]["tasks"] == {
+            "t1": "SUCCESS",
+            "t2": "SUCCESS",
+        }
+        assert [c.args for c in fake_watcher.subscribe.calls] == [
+            (b"meta-group_id", queues[0], False),
+            (b"meta-t1", queues[0], False),
+            (b"meta-t2", queues[0], False),
+        ]
+        assert [c.args for c in fake_watcher.unsubscribe.calls] == [
+            ([b"meta-group_id", b"meta-t1", b"meta-t2"], queues[0]),
         ]
@@ -3,7 +3,12 @@
 #
 # SPDX-License-Identifier: MIT
 
+import gzip
+import json
+
+import pretend
 from fastapi import status
+from fastapi.testclient import TestClient
 
 
 class TestAPP:
@@ -21,6 +26,156 @@ class TestAPP:
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert response.json() == {"detail": "Not Found"}
 
+    def test_lifespan_bootstrap_watcher(self, monkeypatch):
+        import app
+
+        fake_watcher = pretend.stub(
+            start=pretend.call_recorder(lambda: None),
+            stop=pretend.call_recorder(lambda: None),
+        )
+        monkeypatch.setattr(app, "bootstrap_watcher", fake_watcher)
+
+        with TestClient(app.rstuf_app):
+            assert fake_watcher.start.calls == [pretend.call()]
+            assert fake_watcher.stop.calls == []
+
+        assert fake_watcher.stop.calls == [pretend.call()]
+
+    def test_lifespan_artifacts_indexer(self, monkeypatch):
+        import app
+
+        async def fake_stop():
+            return None
+
+        fake_indexer = pretend.stub(
+            start=pretend.call_recorder(lambda interval: None),
+            stop=pretend.call_recorder(fake_stop),
+        )
+        monkeypatch.setattr(app, "artifacts_indexer", fake_indexer)
+        monkeypatch.setattr(
+            app,
+            "bootstrap_watcher",
+            pretend.stub(start=lambda: None, stop=lambda: None),
+        )
+        monkeypatch.setattr(
+            app,
+            "settings",
+            pretend.stub(
+                get=lambda k, d=None: {
+                    "ARTIFACTS_INDEX": True,
+                    "ARTIFACTS_INDEX_INTERVAL": 2,
+                }.get(k, d)
+            ),
+        )
+
+        with TestClient(app.rstuf_app):
+            assert fake_indexer.start.calls == [pretend.call(2)]
+
+        assert fake_indexer.stop.calls == [pretend.call()]
+
+    def test_lifespan_artifacts_coalescer(self, monkeypatch):
+        import app
+
+        fake_coalescer = pretend.stub(
+            flush=pretend.call_recorder(lambda: None)
+        )
+        monkeypatch.setattr(app, "artifacts_coalescer", fake_coalescer)
+        monkeypatch.setattr(
+            app,
+            "bootstrap_watcher",
+            pretend.stub(start=lambda: None, stop=lambda: None),
+        )
+
+        with TestClient(app.rstuf_app):
+            assert fake_coalescer.flush.calls == []
+
+        assert fake_coalescer.flush.calls == [pretend.call()]
+
+    def test_lifespan_queue_depth_sampler(self, monkeypatch):
+        import app
+
+        fake_sampler = pretend.stub(
+            start=pretend.call_recorder(lambda interval: None),
+            stop=pretend.call_recorder(lambda: None),
+        )
+        monkeypatch.setattr(app, "queue_depth_sampler", fake_sampler)
+        monkeypatch.setattr(
+            app,
+            "bootstrap_watcher",
+            pretend.stub(start=lambda: None, stop=lambda: None),
+        )
+        monkeypatch.setattr(
+            app,
+            "settings",
+            pretend.stub(
+                get=lambda k, d=None: {
+                    "ADMISSION_QUEUE_HARD_LIMIT": 1000,
+                    "ADMISSION_CACHE_SECONDS": 5,
+                }.get(k, d)
+            ),
+        )
+
+        with TestClient(app.rstuf_app):
+            assert fake_sampler.start.calls == [pretend.call(5)]
+
+        assert fake_sampler.stop.calls == [pretend.call()]
+
+    def test_openapi(self, test_client):
+        import app
+
+        response = test_client.get(
+            "/openapi.json", headers={"Accept-Encoding": "identity"}
+        )
+
+        document = app.openapi_document()
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] == document.etags["identity"]
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert "content-encoding" not in response.headers
+        assert response.content == document.bodies["identity"]
+        assert response.json() == app.rstuf_app.openapi()
+        assert app.openapi_document() is document
+
+    def test_openapi_gzip(self, test_client, monkeypatch):
+        import app
+
+        monkeypatch.setattr(
+            app,
+            "_openapi_document",
+            app.OpenAPIDocument(
+                etags={"identity": '"d"', "gzip": '"d-gzip"'},
+                bodies={
+                    "identity": b'{"k":"v"}',
+                    "gzip": gzip.compress(b'{"k":"v"}'),
+                },
+            ),
+        )
+
+        response = test_client.get(
+            "/openapi.json", headers={"Accept-Encoding": "br;q=0, gzip"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] == '"d-gzip"'
+        assert response.headers["content-encoding"] == "gzip"
+        assert json.loads(response.content) == {"k": "v"}
+
+    def test_openapi_not_modified(self, test_client):
+        import app
+
+        etag = app.openapi_document().etags["identity"]
+        response = test_client.get(
+            "/openapi.json",
+            headers={
+                "Accept-Encoding": "gzip;q=0",
+                "If-None-Match": f'"other", {etag}',
+            },
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
     def test_load_endpoints_disable_prefix_and_method(self, caplog):
         import app
 
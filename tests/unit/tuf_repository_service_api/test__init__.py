@@ -2,89 +2,214 @@
 # SPDX-FileCopyrightText: 2022-2023 VMware Inc
 #
 # SPDX-License-Identifier: MIT
+import asyncio
+
+import fakeredis
 import pretend
 
 import repository_service_tuf_api
 
 
 class TestInit:
-    def test_pre_lock_bootstrap(self):
-        fake_settings = pretend.stub(
-            current_env="test", as_dict=pretend.call_recorder(lambda **kw: {})
+    def _fake_script(self, monkeypatch, result):
+        fake_script = pretend.call_recorder(lambda **kw: result)
+        fake_redis = pretend.stub(
+            register_script=pretend.call_recorder(lambda s: fake_script)
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository_redis",
+            lambda: fake_redis,
         )
-        repository_service_tuf_api.settings_repository = fake_settings
-        repository_service_tuf_api.redis_loader.write = pretend.call_recorder(
-            lambda *a: fake_settings
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository_key",
+            lambda: "RSTUF_TEST",
         )
 
-        repository_service_tuf_api.pre_lock_bootstrap("fake_task_id")
+        return fake_redis, fake_script
+
+    def test_pre_lock_bootstrap(self, monkeypatch):
+        fake_redis, fake_script = self._fake_script(monkeypatch, None)
 
-        assert fake_settings.as_dict.calls == [pretend.call(env="test")]
-        assert repository_service_tuf_api.redis_loader.write.calls == [
-            pretend.call(fake_settings, {"BOOTSTRAP": "pre-fake_task_id"})
+        result = repository_service_tuf_api.pre_lock_bootstrap("fake_task_id")
+
+        assert result is True
+        assert fake_redis.register_script.calls == [
+            pretend.call(repository_service_tuf_api._LOCK_BOOTSTRAP)
+        ]
+        assert fake_script.calls == [
+            pretend.call(
+                keys=["RSTUF_TEST", "RSTUF_SETTINGS_VERSION"],
+                args=["pre-fake_task_id", "@none "],
+            )
         ]
 
-    def test_release_bootstrap_lock(self):
-        fake_settings = pretend.stub(
-            current_env="test", as_dict=pretend.call_recorder(lambda **kw: {})
+    def test_pre_lock_bootstrap_locked(self, monkeypatch):
+        _, fake_script = self._fake_script(monkeypatch, "pre-other_task_id")
+
+        result = repository_service_tuf_api.pre_lock_bootstrap("fake_task_id")
+
+        assert result is False
+        assert len(fake_script.calls) == 1
+
+    def test_release_bootstrap_lock(self, monkeypatch):
+        fake_redis, fake_script = self._fake_script(monkeypatch, 1)
+
+        repository_service_tuf_api.release_bootstrap_lock()
+        repository_service_tuf_api.release_bootstrap_lock("fake_task_id")
+
+        assert fake_redis.register_script.calls == [
+            pretend.call(repository_service_tuf_api._RELEASE_BOOTSTRAP),
+            pretend.call(repository_service_tuf_api._RELEASE_BOOTSTRAP),
+        ]
+        assert fake_script.calls == [
+            pretend.call(
+                keys=["RSTUF_TEST", "RSTUF_SETTINGS_VERSION"],
+                args=["@none ", ""],
+            ),
+            pretend.call(
+                keys=["RSTUF_TEST", "RSTUF_SETTINGS_VERSION"],
+                args=["@none ", "fake_task_id"],
+            ),
+        ]
+
+    def _fake_redis_server(self, monkeypatch, bootstrap=None):
+        fake_redis = fakeredis.FakeRedis(
+            server=fakeredis.FakeServer(), decode_responses=True
         )
-        repository_service_tuf_api.settings_repository = fake_settings
-        repository_service_tuf_api.redis_loader.write = pretend.call_recorder(
-            lambda *a: fake_settings
+        if bootstrap is not None:
+            fake_redis.hset("RSTUF_TEST", "BOOTSTRAP", bootstrap)
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository_redis",
+            lambda: fake_redis,
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository_key",
+            lambda: "RSTUF_TEST",
         )
 
-        repository_service_tuf_api.release_bootstrap_lock()
+        return fake_redis
+
+    def test_pre_lock_bootstrap_redis(self, monkeypatch):
+        fake_redis = self._fake_redis_server(monkeypatch, "@none ")
+
+        result = repository_service_tuf_api.pre_lock_bootstrap("task_a")
+
+        assert result is True
+        assert fake_redis.hget("RSTUF_TEST", "BOOTSTRAP") == "pre-task_a"
+        assert fake_redis.get("RSTUF_SETTINGS_VERSION") == "1"
+
+    def test_pre_lock_bootstrap_redis_held(self, monkeypatch):
+        fake_redis = self._fake_redis_server(monkeypatch)
+
+        assert repository_service_tuf_api.pre_lock_bootstrap("task_a")
+        for bootstrap in ["pre-task_a", "signing-task_a", "task_a"]:
+            fake_redis.hset("RSTUF_TEST", "BOOTSTRAP", bootstrap)
 
-        assert fake_settings.as_dict.calls == [pretend.call(env="test")]
-        assert repository_service_tuf_api.redis_loader.write.calls == [
-            pretend.call(fake_settings, {"BOOTSTRAP": None})
+            result = repository_service_tuf_api.pre_lock_bootstrap("task_b")
+
+            assert result is False
+            assert fake_redis.hget("RSTUF_TEST", "BOOTSTRAP") == bootstrap
+        # only the first lock changed the settings
+        assert fake_redis.get("RSTUF_SETTINGS_VERSION") == "1"
+
+    def test_release_bootstrap_lock_redis(self, monkeypatch):
+        fake_redis = self._fake_redis_server(monkeypatch, "pre-task_a")
+
+        # not the owner of the lock
+        repository_service_tuf_api.release_bootstrap_lock("task_b")
+
+        assert fake_redis.hget("RSTUF_TEST", "BOOTSTRAP") == "pre-task_a"
+        assert fake_redis.get("RSTUF_SETTINGS_VERSION") is None
+
+        repository_service_tuf_api.release_bootstrap_lock("task_a")
+
+        assert fake_redis.hget("RSTUF_TEST", "BOOTSTRAP") == "@none "
+        assert fake_redis.get("RSTUF_SETTINGS_VERSION") == "1"
+
+    def test_redis_clients(self, monkeypatch):
+        fake_client = pretend.stub()
+        fake_redis_pools = pretend.stub(
+            client=pretend.call_recorder(lambda *a, **kw: fake_client),
+            async_client=pretend.call_recorder(lambda *a, **kw: fake_client),
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api, "redis_pools", fake_redis_pools
+        )
+
+        assert repository_service_tuf_api.settings_repository_redis() is (
+            fake_client
+        )
+        assert repository_service_tuf_api.result_backend_redis() is (
+            fake_client
+        )
+        assert repository_service_tuf_api.settings_repository_async() is (
+            fake_client
+        )
+        assert repository_service_tuf_api.result_backend_async() is (
+            fake_client
+        )
+        assert fake_redis_pools.client.calls == [
+            pretend.call(1, decode_responses=True),
+            pretend.call(0),
         ]
+        assert fake_redis_pools.async_client.calls == [
+            pretend.call(1, decode_responses=True),
+            pretend.call(0),
+        ]
+
+    def test_result_backend_pool(self):
+        backend = repository_service_tuf_api.repository_metadata.backend
 
-    def test_bootstrap_state(self):
-        repository_service_tuf_api.settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: None),
+        assert backend.client.connection_pool is (
+            repository_service_tuf_api.redis_pools.pool(0)
         )
+
+    def _fake_repository_settings(self, monkeypatch, bootstrap):
+        fake_load = pretend.call_recorder(
+            lambda: repository_service_tuf_api.RepositorySettingsSnapshot(
+                1, {"BOOTSTRAP": bootstrap}
+            )
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api, "_load_repository_settings", fake_load
+        )
+
+        return fake_load
+
+    def test_bootstrap_state(self, monkeypatch):
+        self._fake_repository_settings(monkeypatch, None)
         result = repository_service_tuf_api.bootstrap_state()
         assert result == repository_service_tuf_api.BootstrapState(
             False, None, None
         )
 
-    def test_bootstrap_state_pre(self):
-        repository_service_tuf_api.settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: "pre-<task_id>"),
-        )
+    def test_bootstrap_state_pre(self, monkeypatch):
+        self._fake_repository_settings(monkeypatch, "pre-<task_id>")
         result = repository_service_tuf_api.bootstrap_state()
         assert result == repository_service_tuf_api.BootstrapState(
             False, "pre", "<task_id>"
         )
 
-    def test_bootstrap_state_signing(self):
-        repository_service_tuf_api.settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: "signing-<task_id>"),
-        )
+    def test_bootstrap_state_signing(self, monkeypatch):
+        self._fake_repository_settings(monkeypatch, "signing-<task_id>")
         result = repository_service_tuf_api.bootstrap_state()
         assert result == repository_service_tuf_api.BootstrapState(
             False, "signing", "<task_id>"
         )
 
-    def test_bootstrap_state_finished(self):
-        repository_service_tuf_api.settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: "<task_id>"),
-        )
+    def test_bootstrap_state_finished(self, monkeypatch):
+        self._fake_repository_settings(monkeypatch, "<task_id>")
         result = repository_service_tuf_api.bootstrap_state()
         assert result == repository_service_tuf_api.BootstrapState(
             True, "finished", "<task_id>"
         )
 
-    def test_bootstrap_state_unexpected_format(self):
-        repository_service_tuf_api.settings_repository = pretend.stub(
-            reload=pretend.call_recorder(lambda: None),
-            get_fresh=pretend.call_recorder(lambda *a: "pre-abc-def"),
-        )
+    def test_bootstrap_state_unexpected_format(self, monkeypatch):
+        self._fake_repository_settings(monkeypatch, "pre-abc-def")
         repository_service_tuf_api.logging.warning = pretend.call_recorder(
             lambda *a: None
         )
@@ -97,3 +222,441 @@ class TestInit:
         assert repository_service_tuf_api.logging.warning.calls == [
             pretend.call("Unexpected bootstrap value format: 'pre-abc-def'")
         ]
+
+    def test_bootstrap_state_cache_enabled(self, monkeypatch):
+        fake_load = self._fake_repository_settings(monkeypatch, "<task_id>")
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings",
+            pretend.stub(get=lambda k, d=None: k == "BOOTSTRAP_STATE_CACHE"),
+        )
+        cache = repository_service_tuf_api.BootstrapStateCache()
+        cache._listening = True
+        monkeypatch.setattr(
+            repository_service_tuf_api, "bootstrap_state_cache", cache
+        )
+
+        first = repository_service_tuf_api.bootstrap_state()
+        second = repository_service_tuf_api.bootstrap_state()
+
+        expected = repository_service_tuf_api.BootstrapState(
+            True, "finished", "<task_id>"
+        )
+        assert first == expected
+        assert second == expected
+        assert fake_load.calls == [pretend.call()]
+
+        cache.invalidate()
+        repository_service_tuf_api.bootstrap_state()
+        assert len(fake_load.calls) == 2
+
+    def test_bootstrap_state_cache_not_listening(self, monkeypatch):
+        fake_load = self._fake_repository_settings(monkeypatch, "<task_id>")
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings",
+            pretend.stub(get=lambda k, d=None: k == "BOOTSTRAP_STATE_CACHE"),
+        )
+        fake_cache = pretend.stub(start=pretend.call_recorder(lambda: False))
+        monkeypatch.setattr(
+            repository_service_tuf_api, "bootstrap_state_cache", fake_cache
+        )
+
+        repository_service_tuf_api.bootstrap_state()
+        repository_service_tuf_api.bootstrap_state()
+
+        assert fake_cache.start.calls == [pretend.call(), pretend.call()]
+        assert len(fake_load.calls) == 2
+
+    def test_bootstrap_state_async(self, monkeypatch, async_return):
+        fake_redis = pretend.stub(
+            hget=pretend.call_recorder(async_return("signing-<task_id>"))
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository_async",
+            lambda: fake_redis,
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository",
+            pretend.stub(current_env="main", get=lambda *a: "DYNACONF"),
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings",
+            pretend.stub(get=lambda *a: False),
+        )
+
+        result = asyncio.run(
+            repository_service_tuf_api.bootstrap_state_async()
+        )
+
+        assert result == repository_service_tuf_api.BootstrapState(
+            False, "signing", "<task_id>"
+        )
+        assert fake_redis.hget.calls == [
+            pretend.call("DYNACONF_MAIN", "BOOTSTRAP")
+        ]
+
+    def test_bootstrap_state_async_none(self, monkeypatch, async_return):
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository_async",
+            lambda: pretend.stub(hget=async_return("@none")),
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository",
+            pretend.stub(current_env="main", get=lambda *a: "DYNACONF"),
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings",
+            pretend.stub(get=lambda *a: False),
+        )
+
+        result = asyncio.run(
+            repository_service_tuf_api.bootstrap_state_async()
+        )
+
+        assert result == repository_service_tuf_api.BootstrapState(
+            False, None, None
+        )
+
+    def test_bootstrap_state_async_cached(self, monkeypatch):
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings",
+            pretend.stub(get=lambda *a: True),
+        )
+        cache = repository_service_tuf_api.BootstrapStateCache()
+        cache._listening = True
+        state = repository_service_tuf_api.BootstrapState(
+            True, "finished", "<task_id>"
+        )
+        cache.set(state, cache.get()[1])
+        monkeypatch.setattr(
+            repository_service_tuf_api, "bootstrap_state_cache", cache
+        )
+
+        result = asyncio.run(
+            repository_service_tuf_api.bootstrap_state_async()
+        )
+
+        assert result == state
+
+
+class TestRepositorySettings:
+    def _fake_redis(self, monkeypatch, version, values):
+        fake_pipeline = pretend.stub(
+            get=pretend.call_recorder(lambda key: None),
+            hgetall=pretend.call_recorder(lambda key: None),
+            execute=pretend.call_recorder(lambda: [version, values]),
+        )
+        fake_redis = pretend.stub(
+            pipeline=lambda: fake_pipeline,
+            get=pretend.call_recorder(lambda key: version),
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository_redis",
+            lambda: fake_redis,
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository_key",
+            lambda: "RSTUF_TEST",
+        )
+
+        return fake_redis, fake_pipeline
+
+    def test_repository_settings(self, monkeypatch):
+        _, fake_pipeline = self._fake_redis(
+            monkeypatch,
+            "3",
+            {
+                "BOOTSTRAP": "task_id",
+                "TARGETS_ONLINE_KEY": "@bool False",
+                "DELEGATED_ROLES_NAMES": '@json ["bins-0"]',
+                "ROOT_SIGNING": '@json {"signed": {"_type": "root"}}',
+                "TARGETS_SIGNING": "@none ",
+            },
+        )
+
+        snapshot = repository_service_tuf_api.repository_settings("test")
+
+        assert snapshot.version == 3
+        assert snapshot.bootstrap == "task_id"
+        assert snapshot.targets_online_key is False
+        assert snapshot.delegated_roles_names == ["bins-0"]
+        assert snapshot.get("root_signing") == {"signed": {"_type": "root"}}
+        assert snapshot.get("TARGETS_SIGNING") is None
+        assert snapshot.get("trusted_root", "default") == "default"
+        assert fake_pipeline.get.calls == [
+            pretend.call("RSTUF_SETTINGS_VERSION")
+        ]
+        assert fake_pipeline.hgetall.calls == [pretend.call("RSTUF_TEST")]
+
+    def test_repository_settings_no_version(self, monkeypatch):
+        self._fake_redis(monkeypatch, None, {})
+
+        snapshot = repository_service_tuf_api.repository_settings("test")
+
+        assert (
+            snapshot
+            == repository_service_tuf_api.RepositorySettingsSnapshot(0, {})
+        )
+        assert snapshot.targets_online_key is True
+
+    def test_repository_settings_cache(self, monkeypatch):
+        fake_redis, fake_pipeline = self._fake_redis(
+            monkeypatch, "1", {"BOOTSTRAP": "task_id"}
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings",
+            pretend.stub(get=lambda k, d=None: k == "SETTINGS_SNAPSHOT_CACHE"),
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "repository_settings_cache",
+            repository_service_tuf_api.RepositorySettingsCache(),
+        )
+
+        first = repository_service_tuf_api.repository_settings("test")
+        second = repository_service_tuf_api.repository_settings("test")
+        assert second is first
+        assert len(fake_pipeline.execute.calls) == 1
+
+        fake_redis.get = lambda key: "2"
+        fake_pipeline.execute = lambda: ["2", {"BOOTSTRAP": "other"}]
+        third = repository_service_tuf_api.repository_settings("test")
+        assert third.version == 2
+        assert third.bootstrap == "other"
+        assert repository_service_tuf_api.repository_settings("test") is third
+
+
+class TestBootstrapStateCache:
+    def test_set_stale_generation(self):
+        cache = repository_service_tuf_api.BootstrapStateCache()
+        cache._listening = True
+        state = repository_service_tuf_api.BootstrapState(True, "finished")
+
+        _, generation = cache.get()
+        cache.invalidate()
+        cache.set(state, generation)
+
+        assert cache.get() == (None, generation + 1)
+
+    def test_set_not_listening(self):
+        cache = repository_service_tuf_api.BootstrapStateCache()
+        state = repository_service_tuf_api.BootstrapState(True, "finished")
+
+        _, generation = cache.get()
+        cache.set(state, generation)
+
+        assert cache.get() == (None, generation)
+
+    def test_start(self, monkeypatch):
+        fake_thread = pretend.stub()
+        fake_pubsub = pretend.stub(
+            subscribe=pretend.call_recorder(lambda **kw: None),
+            run_in_thread=pretend.call_recorder(lambda **kw: fake_thread),
+        )
+        fake_client = pretend.stub(
+            config_get=pretend.call_recorder(
+                lambda *a: {"notify-keyspace-events": "Ex"}
+            ),
+            config_set=pretend.call_recorder(lambda *a: True),
+            pubsub=pretend.call_recorder(lambda **kw: fake_pubsub),
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository_redis",
+            lambda: fake_client,
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository",
+            pretend.stub(current_env="main", get=lambda *a: "DYNACONF"),
+        )
+        cache = repository_service_tuf_api.BootstrapStateCache()
+
+        assert cache.start() is True
+        assert cache.start() is True
+        assert cache.listening is True
+        assert fake_client.config_set.calls == [
+            pretend.call("notify-keyspace-events", "EKghx")
+        ]
+        assert list(fake_pubsub.subscribe.calls[0].kwargs) == [
+            "__keyspace@1__:DYNACONF_MAIN"
+        ]
+        assert fake_pubsub.run_in_thread.calls == [
+            pretend.call(
+                sleep_time=1, daemon=True, exception_handler=cache._on_error
+            )
+        ]
+
+    def test_start_keyspace_events_not_allowed(self, monkeypatch):
+        def fake_config_set(*a):
+            raise repository_service_tuf_api.redis.ResponseError("no CONFIG")
+
+        fake_client = pretend.stub(
+            config_get=lambda *a: {"notify-keyspace-events": ""},
+            config_set=fake_config_set,
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings_repository_redis",
+            lambda: fake_client,
+        )
+        cache = repository_service_tuf_api.BootstrapStateCache()
+
+        assert cache.start() is False
+        # retry is delayed by BOOTSTRAP_STATE_CACHE_RETRY
+        assert cache.start() is False
+        assert cache.listening is False
+
+    def test_on_message_and_on_error(self):
+        cache = repository_service_tuf_api.BootstrapStateCache()
+        cache._listening = True
+        state = repository_service_tuf_api.BootstrapState(True, "finished")
+        _, generation = cache.get()
+        cache.set(state, generation)
+        assert cache.get() == (state, generation)
+
+        cache._on_message({"data": "hset"})
+        assert cache.get() == (None, generation + 1)
+
+        fake_thread = pretend.stub(stop=pretend.call_recorder(lambda: None))
+        cache._on_error(ConnectionError("lost"), None, fake_thread)
+        assert cache.listening is False
+        assert fake_thread.stop.calls == [pretend.call()]
+
+
+class TestBrokerTask:
+    def _setup(self, monkeypatch, method, threshold):
+        mocked_apply_async = pretend.call_recorder(
+            lambda self, args=None, kwargs=None, **options: None
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api.Task, "apply_async", mocked_apply_async
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api, "broker_compression", method
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings",
+            pretend.stub(
+                get=lambda k, d=None: {
+                    "BROKER_COMPRESSION_THRESHOLD": threshold
+                }.get(k, d)
+            ),
+        )
+
+        return mocked_apply_async
+
+    def test_apply_async_compressed(self, monkeypatch):
+        mocked_apply_async = self._setup(monkeypatch, "zlib", 30)
+        task = repository_service_tuf_api.repository_metadata
+
+        task.apply_async(kwargs={"payload": "x" * 10}, task_id="id")
+        task.apply_async(kwargs={"payload": "x"}, task_id="id")
+
+        assert mocked_apply_async.calls == [
+            pretend.call(
+                task,
+                None,
+                {"payload": "x" * 10},
+                task_id="id",
+                compression="zlib",
+            ),
+            pretend.call(task, None, {"payload": "x"}, task_id="id"),
+        ]
+
+    def test_apply_async_threshold_disabled(self, monkeypatch):
+        mocked_apply_async = self._setup(monkeypatch, "zlib", 0)
+        task = repository_service_tuf_api.repository_metadata
+
+        task.apply_async(kwargs={}, task_id="id")
+
+        assert mocked_apply_async.calls == [
+            pretend.call(task, None, {}, task_id="id", compression="zlib")
+        ]
+
+    def test_apply_async_compression_disabled(self, monkeypatch):
+        mocked_apply_async = self._setup(monkeypatch, None, 0)
+        task = repository_service_tuf_api.repository_metadata
+
+        task.apply_async(kwargs={}, task_id="id")
+
+        assert mocked_apply_async.calls == [
+            pretend.call(task, None, {}, task_id="id")
+        ]
+
+    def test_apply_async_priority(self, monkeypatch):
+        mocked_apply_async = self._setup(monkeypatch, None, 0)
+        monkeypatch.setattr(
+            repository_service_tuf_api, "task_queue_max_priority", 10
+        )
+        task = repository_service_tuf_api.repository_metadata
+
+        task.apply_async(kwargs={"action": "sign_metadata"}, task_id="id")
+        task.apply_async(
+            kwargs={"action": "add_artifacts"}, task_id="id", priority=7
+        )
+
+        assert mocked_apply_async.calls == [
+            pretend.call(
+                task,
+                None,
+                {"action": "sign_metadata"},
+                task_id="id",
+                priority=9,
+            ),
+            pretend.call(
+                task,
+                None,
+                {"action": "add_artifacts"},
+                task_id="id",
+                priority=7,
+            ),
+        ]
+
+    def test_task_priority(self, monkeypatch):
+        monkeypatch.setattr(
+            repository_service_tuf_api, "task_queue_max_priority", 5
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings",
+            pretend.stub(
+                get=lambda k, d=None: {
+                    "TASK_PRIORITIES": {"add_artifacts": 4}
+                }.get(k, d)
+            ),
+        )
+
+        assert repository_service_tuf_api.task_priority("add_artifacts") == 4
+        assert (
+            repository_service_tuf_api.task_priority("publish_artifacts") == 1
+        )
+        # limited by the queue maximum priority
+        assert repository_service_tuf_api.task_priority("sign_metadata") == 5
+        assert repository_service_tuf_api.task_priority("unknown") == 5
+
+    def test__broker_compression(self, monkeypatch):
+        compression_settings = {}
+        monkeypatch.setattr(
+            repository_service_tuf_api,
+            "settings",
+            pretend.stub(get=lambda k, d=None: compression_settings.get(k, d)),
+        )
+
+        assert repository_service_tuf_api._broker_compression() is None
+        compression_settings["BROKER_COMPRESSION"] = "zlib"
+        assert repository_service_tuf_api._broker_compression() == "zlib"
+        compression_settings["BROKER_COMPRESSION"] = "invalid"
+        assert repository_service_tuf_api._broker_compression() is None
@@ -0,0 +1,163 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+import pretend
+import pytest
+from fastapi import HTTPException, status
+
+from repository_service_tuf_api import admission
+
+
+class FakeConnection:
+    def __init__(self, depth):
+        self.depth = depth
+        self.default_channel = pretend.stub(
+            queue_declare=pretend.call_recorder(self._queue_declare)
+        )
+
+    def _queue_declare(self, queue, passive):
+        if isinstance(self.depth, Exception):
+            raise self.depth
+        return queue, self.depth, 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class TestQueueDepthSampler:
+    def _setup(self, monkeypatch, depth):
+        connection = FakeConnection(depth)
+        fake_pool = pretend.stub(
+            acquire=pretend.call_recorder(lambda block: connection)
+        )
+        monkeypatch.setattr(admission, "celery", pretend.stub(pool=fake_pool))
+
+        return connection, fake_pool
+
+    def test_depth(self, monkeypatch):
+        connection, fake_pool = self._setup(monkeypatch, 10)
+        sampler = admission.QueueDepthSampler("queue")
+
+        assert sampler.depth() is None
+        assert sampler._sample() == 10
+        assert connection.default_channel.queue_declare.calls == [
+            pretend.call(queue="queue", passive=True)
+        ]
+        assert fake_pool.acquire.calls == [pretend.call(block=True)]
+
+    def test_depth_broker_error(self, monkeypatch):
+        self._setup(monkeypatch, ConnectionError("broker down"))
+        sampler = admission.QueueDepthSampler("queue")
+
+        assert sampler._sample() is None
+
+    def test__run(self, monkeypatch):
+        connection, _ = self._setup(monkeypatch, 10)
+        sampler = admission.QueueDepthSampler("queue")
+        depths = []
+
+        def fake_wait(interval):
+            depths.append(sampler.depth())
+            connection.depth = 20
+
+        sampler._stop = pretend.stub(
+            is_set=lambda: len(depths) == 2, wait=fake_wait
+        )
+
+        sampler._run(2)
+
+        assert depths == [10, 20]
+        # not running, the depth is unknown
+        assert sampler.depth() is None
+
+    def test_start_stop(self, monkeypatch):
+        self._setup(monkeypatch, 10)
+        sampler = admission.QueueDepthSampler("queue")
+
+        sampler.start(60)
+        thread = sampler._thread
+        sampler.start(60)
+
+        assert sampler._thread is thread
+        sampler.stop()
+        thread.join(timeout=5)
+        assert thread.is_alive() is False
+        assert sampler.depth() is None
+
+
+class TestAdmissionControl:
+    def _setup(self, monkeypatch, depth, soft=100, hard=1000):
+        monkeypatch.setattr(
+            admission,
+            "settings",
+            pretend.stub(
+                get=lambda k, d=None: {
+                    "ADMISSION_QUEUE_SOFT_LIMIT": soft,
+                    "ADMISSION_QUEUE_HARD_LIMIT": hard,
+                }.get(k, d)
+            ),
+        )
+        fake_sampler = pretend.stub(depth=pretend.call_recorder(lambda: depth))
+        monkeypatch.setattr(admission, "queue_depth_sampler", fake_sampler)
+
+        return fake_sampler
+
+    def test_admitted(self, monkeypatch):
+        self._setup(monkeypatch, 99)
+
+        assert admission.admission_control("add_artifacts")() is None
+
+    def test_disabled(self, monkeypatch):
+        fake_sampler = self._setup(monkeypatch, 5000, soft=0, hard=0)
+
+        assert admission.admission_control("add_artifacts")() is None
+        assert fake_sampler.depth.calls == []
+
+    def test_unknown_depth(self, monkeypatch):
+        self._setup(monkeypatch, None)
+
+        assert admission.admission_control("add_artifacts")() is None
+
+    def test_soft_limit(self, monkeypatch):
+        self._setup(monkeypatch, 100)
+
+        with pytest.raises(HTTPException) as err:
+            admission.admission_control("add_artifacts")()
+
+        assert err.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert err.value.headers == {"Retry-After": "30"}
+        assert err.value.detail == {
+            "message": "Task not accepted.",
+            "error": (
+                "Queue metadata_repository is saturated (100 tasks). "
+                "Retry later."
+            ),
+        }
+
+    def test_soft_limit_priority_lane(self, monkeypatch):
+        fake_sampler = self._setup(monkeypatch, 999, hard=0)
+
+        assert admission.admission_control("sign_metadata")() is None
+        assert fake_sampler.depth.calls == []
+
+    def test_hard_limit(self, monkeypatch):
+        self._setup(monkeypatch, 1000)
+
+        for action in ["add_artifacts", "sign_metadata"]:
+            with pytest.raises(HTTPException) as err:
+                admission.admission_control(action)()
+
+            assert err.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def test_endpoint(self, monkeypatch, test_client):
+        self._setup(monkeypatch, 100)
+
+        response = test_client.post(
+            "/api/v1/artifacts/", json={"artifacts": []}
+        )
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers["retry-after"] == "30"
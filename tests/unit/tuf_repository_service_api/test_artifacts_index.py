@@ -0,0 +1,191 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+import asyncio
+
+import fakeredis
+import pretend
+
+from repository_service_tuf_api import artifacts_index
+
+
+class TestArtifactsIndex:
+    def test_artifact_digest(self):
+        digest = artifacts_index.artifact_digest(
+            {"length": 1, "hashes": {"sha256": "a", "blake2b-256": "b"}}
+        )
+
+        assert len(digest) == 32
+        assert digest == artifacts_index.artifact_digest(
+            {"hashes": {"blake2b-256": "b", "sha256": "a"}, "length": 1}
+        )
+        assert digest != artifacts_index.artifact_digest(
+            {"length": 2, "hashes": {"sha256": "a", "blake2b-256": "b"}}
+        )
+
+    def test_indexed(self, monkeypatch):
+        fake_redis = pretend.stub(
+            hmget=pretend.call_recorder(lambda key, paths: ["d1", "x", None])
+        )
+        monkeypatch.setattr(
+            artifacts_index, "settings_repository_redis", lambda: fake_redis
+        )
+
+        result = artifacts_index.indexed({"p1": "d1", "p2": "d2", "p3": "d3"})
+
+        assert result == {"p1"}
+        assert fake_redis.hmget.calls == [
+            pretend.call("RSTUF_API_ARTIFACTS_INDEX", ["p1", "p2", "p3"])
+        ]
+
+    def test_indexed_empty(self, monkeypatch):
+        monkeypatch.setattr(
+            artifacts_index, "settings_repository_redis", lambda: None
+        )
+
+        assert artifacts_index.indexed({}) == set()
+
+    def test_add_pending(self, monkeypatch):
+        fake_pipeline = pretend.stub(
+            hset=pretend.call_recorder(lambda key, mapping: None),
+            expire=pretend.call_recorder(lambda key, ttl: None),
+            sadd=pretend.call_recorder(lambda key, task_id: None),
+            execute=pretend.call_recorder(lambda: None),
+        )
+        fake_redis = pretend.stub(pipeline=lambda: fake_pipeline)
+        monkeypatch.setattr(
+            artifacts_index, "settings_repository_redis", lambda: fake_redis
+        )
+
+        artifacts_index.add_pending("task_id", {"p1": "d1"})
+
+        key = "RSTUF_API_ARTIFACTS_PENDING_task_id"
+        assert fake_pipeline.hset.calls == [
+            pretend.call(key, mapping={"p1": "d1"})
+        ]
+        assert fake_pipeline.expire.calls == [
+            pretend.call(key, artifacts_index.ARTIFACTS_PENDING_TTL)
+        ]
+        assert fake_pipeline.sadd.calls == [
+            pretend.call("RSTUF_API_ARTIFACTS_PENDING_TASKS", "task_id")
+        ]
+        assert fake_pipeline.execute.calls == [pretend.call()]
+
+    def test_add_pending_empty(self, monkeypatch):
+        monkeypatch.setattr(
+            artifacts_index, "settings_repository_redis", lambda: None
+        )
+
+        artifacts_index.add_pending("task_id", {})
+
+    def test_remove(self, monkeypatch):
+        fake_script = pretend.call_recorder(lambda keys, args: None)
+        fake_redis = pretend.stub(
+            register_script=pretend.call_recorder(lambda script: fake_script)
+        )
+        monkeypatch.setattr(
+            artifacts_index, "settings_repository_redis", lambda: fake_redis
+        )
+
+        artifacts_index.remove(["p1", "p2"])
+        artifacts_index.remove([])
+
+        assert fake_redis.register_script.calls == [
+            pretend.call(artifacts_index._REMOVE)
+        ]
+        assert fake_script.calls == [
+            pretend.call(
+                keys=[
+                    "RSTUF_API_ARTIFACTS_INDEX",
+                    "RSTUF_API_ARTIFACTS_PENDING_TASKS",
+                ],
+                args=["RSTUF_API_ARTIFACTS_PENDING_", "p1", "p2"],
+            )
+        ]
+
+    def test_commit(self, monkeypatch):
+        async def fake_script(keys, args):
+            return 1
+
+        fake_script_recorder = pretend.call_recorder(fake_script)
+        fake_redis = pretend.stub(
+            register_script=pretend.call_recorder(
+                lambda script: fake_script_recorder
+            )
+        )
+        monkeypatch.setattr(
+            artifacts_index, "settings_repository_async", lambda: fake_redis
+        )
+
+        result = asyncio.run(artifacts_index.commit("task_id", ["invalid"]))
+
+        assert result == 1
+        assert fake_redis.register_script.calls == [
+            pretend.call(artifacts_index._COMMIT_PENDING)
+        ]
+        assert fake_script_recorder.calls == [
+            pretend.call(
+                keys=[
+                    "RSTUF_API_ARTIFACTS_INDEX",
+                    "RSTUF_API_ARTIFACTS_PENDING_task_id",
+                    "RSTUF_API_ARTIFACTS_PENDING_TASKS",
+                ],
+                args=["task_id", "invalid"],
+            )
+        ]
+
+
+class TestArtifactsIndexRedis:
+    """Scripts and interleavings on a fake Redis server (with Lua)."""
+
+    def _setup(self, monkeypatch):
+        server = fakeredis.FakeServer()
+        client = fakeredis.FakeRedis(server=server, decode_responses=True)
+        monkeypatch.setattr(
+            artifacts_index, "settings_repository_redis", lambda: client
+        )
+        monkeypatch.setattr(
+            artifacts_index,
+            "settings_repository_async",
+            lambda: fakeredis.FakeAsyncRedis(
+                server=server, decode_responses=True
+            ),
+        )
+
+        return client
+
+    def test_add_remove_commit(self, monkeypatch):
+        client = self._setup(monkeypatch)
+
+        artifacts_index.add_pending("t1", {"p": "d1", "q": "d2"})
+        artifacts_index.add_pending("t2", {"q": "d3", "r": "d4"})
+        artifacts_index.remove(["q"])
+        assert asyncio.run(artifacts_index.commit("t1")) == 1
+        assert asyncio.run(artifacts_index.commit("t2", ["r"])) == 0
+
+        assert client.hgetall("RSTUF_API_ARTIFACTS_INDEX") == {"p": "d1"}
+        assert client.smembers("RSTUF_API_ARTIFACTS_PENDING_TASKS") == set()
+        assert artifacts_index.indexed({"q": "d2", "p": "d1"}) == {"p"}
+
+    def test_remove_indexed(self, monkeypatch):
+        client = self._setup(monkeypatch)
+        client.hset(
+            "RSTUF_API_ARTIFACTS_INDEX", mapping={"p": "d1", "q": "d2"}
+        )
+
+        artifacts_index.remove(["q"])
+
+        assert client.hgetall("RSTUF_API_ARTIFACTS_INDEX") == {"p": "d1"}
+
+    def test_pending_tasks(self, monkeypatch):
+        client = self._setup(monkeypatch)
+        artifacts_index.add_pending("t1", {"p": "d1"})
+        artifacts_index.add_pending("t2", {"q": "d2"})
+        artifacts_index.add_pending("t3", {"r": "d3"})
+        # expired pending artifacts
+        client.delete("RSTUF_API_ARTIFACTS_PENDING_t2")
+        asyncio.run(artifacts_index.discard("t3"))
+
+        assert asyncio.run(artifacts_index.pending_tasks()) == ["t1"]
+        assert client.smembers("RSTUF_API_ARTIFACTS_PENDING_TASKS") == {"t1"}
+        assert client.exists("RSTUF_API_ARTIFACTS_PENDING_t3") == 0
@@ -3,50 +3,316 @@
 #
 # SPDX-License-Identifier: MIT
 import pretend
+from prometheus_client import REGISTRY
 
 from repository_service_tuf_api import bootstrap
 
 
+def _sample(name):
+    return REGISTRY.get_sample_value(f"rstuf_api_bootstrap_watcher_{name}")
+
+
+class FakePubSub:
+    def __init__(self):
+        self.channels = {}
+        self.get_message = pretend.call_recorder(lambda **kw: None)
+        self.close = pretend.call_recorder(lambda: None)
+
+    def subscribe(self, *channels):
+        self.channels.update({c: None for c in channels})
+
+    def unsubscribe(self, *channels):
+        for channel in channels:
+            del self.channels[channel]
+
+
+class FakeRedis:
+    """Repository settings Redis with the bootstrap watches and lease."""
+
+    def __init__(self, watches=None, lease=None):
+        self.watches = dict(watches or {})
+        self.lease = lease
+
+    def hgetall(self, key):
+        assert key == bootstrap.BOOTSTRAP_WATCHES_KEY
+        return {k: str(v) for k, v in self.watches.items()}
+
+    def hset(self, key, field, value):
+        assert key == bootstrap.BOOTSTRAP_WATCHES_KEY
+        self.watches[field] = value
+
+    def hdel(self, key, field):
+        assert key == bootstrap.BOOTSTRAP_WATCHES_KEY
+        self.watches.pop(field, None)
+
+    def set(self, key, value, nx, px):
+        assert key == bootstrap.BOOTSTRAP_WATCHER_LEASE_KEY
+        assert nx is True
+        assert px == bootstrap.BOOTSTRAP_WATCHER_LEASE * 1000
+        if self.lease is not None:
+            return None
+        self.lease = value
+        return True
+
+    def register_script(self, script):
+        def renew(keys, args):
+            return 1 if self.lease == args[0] else 0
+
+        def release(keys, args):
+            if self.lease == args[0]:
+                self.lease = None
+                return 1
+            return 0
+
+        return renew if script == bootstrap._RENEW_LEASE else release
+
+
 class TestBootstrap:
-    def test__check_bootstrap_status_SUCCESS(self):
-        bootstrap.repository_metadata.AsyncResult = pretend.call_recorder(
-            lambda *a: pretend.stub(status="SUCCESS")
+    def test__check_bootstrap_status(self, monkeypatch):
+        fake_watcher = pretend.stub(
+            watch=pretend.call_recorder(lambda *a: None)
         )
+        monkeypatch.setattr(bootstrap, "bootstrap_watcher", fake_watcher)
 
-        result = bootstrap._check_bootstrap_status("fake_task_id", 2)
+        bootstrap._check_bootstrap_status("fake_task_id", 2)
+        bootstrap._check_bootstrap_status("fake_task_id", None)
 
-        assert result is None
-        assert bootstrap.repository_metadata.AsyncResult.calls == [
-            pretend.call("fake_task_id")
+        assert fake_watcher.watch.calls == [
+            pretend.call("fake_task_id", 2),
+            pretend.call("fake_task_id", bootstrap.BOOTSTRAP_TIMEOUT),
         ]
 
-    def test__check_bootstrap_status_FAILURE(self):
-        bootstrap.repository_metadata.AsyncResult = pretend.call_recorder(
-            lambda *a: pretend.stub(status="FAILURE")
+
+class TestBootstrapWatcher:
+    def _setup(self, monkeypatch, fake_task, watches=None, lease=None):
+        fake_redis = FakeRedis(watches, lease)
+        monkeypatch.setattr(
+            bootstrap, "settings_repository_redis", lambda: fake_redis
+        )
+        fake_pubsub = FakePubSub()
+        monkeypatch.setattr(
+            bootstrap,
+            "result_backend_redis",
+            lambda: pretend.stub(pubsub=lambda **kw: fake_pubsub),
+        )
+        mocked_repository_metadata = pretend.stub(
+            AsyncResult=pretend.call_recorder(lambda *a: fake_task),
+            backend=pretend.stub(
+                get_key_for_task=lambda t: f"celery-task-meta-{t}".encode()
+            ),
+        )
+        monkeypatch.setattr(
+            bootstrap, "repository_metadata", mocked_repository_metadata
+        )
+        mocked_release_bootstrap_lock = pretend.call_recorder(
+            lambda task_id: None
+        )
+        monkeypatch.setattr(
+            bootstrap, "release_bootstrap_lock", mocked_release_bootstrap_lock
+        )
+        monkeypatch.setattr(bootstrap.time, "time", lambda: 1000)
+        watcher = bootstrap.BootstrapWatcher()
+        watcher._stop = pretend.stub(
+            wait=pretend.call_recorder(lambda timeout: None),
+            is_set=lambda: False,
+        )
+
+        return (
+            watcher,
+            fake_redis,
+            fake_pubsub,
+            mocked_repository_metadata,
+            mocked_release_bootstrap_lock,
+        )
+
+    def test_start(self, monkeypatch):
+        fake_thread = pretend.stub(
+            start=pretend.call_recorder(lambda: None),
+            is_alive=lambda: True,
         )
-        bootstrap.release_bootstrap_lock = pretend.call_recorder(lambda: None)
+        mocked_thread = pretend.call_recorder(lambda **kw: fake_thread)
+        monkeypatch.setattr(bootstrap.threading, "Thread", mocked_thread)
+        watcher = bootstrap.BootstrapWatcher()
+
+        watcher.start()
+        watcher.start()
+
+        assert mocked_thread.calls == [
+            pretend.call(
+                target=watcher._run, name="bootstrap-watcher", daemon=True
+            )
+        ]
+        assert fake_thread.start.calls == [pretend.call()]
+
+    def test_watch(self, monkeypatch):
+        fake_task = pretend.stub(status="PENDING")
+        watcher, fake_redis, *_ = self._setup(monkeypatch, fake_task)
+        watcher.start = pretend.call_recorder(lambda: None)
+
+        watcher.watch("task1", 300)
 
-        result = bootstrap._check_bootstrap_status("fake_task_id", 2)
+        assert fake_redis.watches == {"task1": 1300}
+        assert watcher.start.calls == [pretend.call()]
 
-        assert result is None
-        assert bootstrap.repository_metadata.AsyncResult.calls == [
-            pretend.call("fake_task_id")
+    def test__step_SUCCESS(self, monkeypatch):
+        fake_task = pretend.stub(status="SUCCESS")
+        (
+            watcher,
+            fake_redis,
+            fake_pubsub,
+            mocked_repository_metadata,
+            mocked_release_bootstrap_lock,
+        ) = self._setup(monkeypatch, fake_task, {"task_id": 1300})
+
+        watcher._step()
+
+        assert fake_redis.lease == watcher._id
+        assert fake_redis.watches == {}
+        assert list(fake_pubsub.channels) == [b"celery-task-meta-task_id"]
+        assert fake_pubsub.get_message.calls == []
+        assert mocked_repository_metadata.AsyncResult.calls == [
+            pretend.call("task_id")
+        ]
+        assert mocked_release_bootstrap_lock.calls == []
+        assert _sample("leader") == 1
+        assert _sample("watched_tasks") == 0
+        assert _sample("next_deadline_timestamp_seconds") == 0
+
+        # nothing left to watch, the lease is released
+        watcher._step()
+
+        assert fake_redis.lease is None
+        assert _sample("leader") == 0
+        assert fake_pubsub.close.calls == [pretend.call()]
+        assert watcher._stop.wait.calls == [
+            pretend.call(bootstrap.BOOTSTRAP_CHECK_INTERVAL)
+        ]
+
+    def test__step_FAILURE(self, monkeypatch):
+        fake_task = pretend.stub(status="FAILURE")
+        (
+            watcher,
+            fake_redis,
+            _,
+            _,
+            mocked_release_bootstrap_lock,
+        ) = self._setup(monkeypatch, fake_task, {"task_id": 1300})
+
+        watcher._step()
+
+        assert fake_redis.watches == {}
+        assert mocked_release_bootstrap_lock.calls == [pretend.call("task_id")]
+
+    def test__step_pending(self, monkeypatch):
+        fake_task = pretend.stub(status="STARTED")
+        (
+            watcher,
+            fake_redis,
+            fake_pubsub,
+            _,
+            mocked_release_bootstrap_lock,
+        ) = self._setup(monkeypatch, fake_task, {"task_id": 1300})
+
+        watcher._step()
+        # the lease is renewed on each step
+        watcher._step()
+
+        assert fake_redis.lease == watcher._id
+        assert fake_redis.watches == {"task_id": 1300}
+        assert fake_pubsub.get_message.calls == [
+            pretend.call(timeout=bootstrap.BOOTSTRAP_CHECK_INTERVAL),
+            pretend.call(timeout=bootstrap.BOOTSTRAP_CHECK_INTERVAL),
         ]
-        assert bootstrap.release_bootstrap_lock.calls == [pretend.call()]
+        assert mocked_release_bootstrap_lock.calls == []
+        assert _sample("watched_tasks") == 1
+        assert _sample("next_deadline_timestamp_seconds") == 1300
 
-    def test__check_bootstrap_status_timeout(self):
+    def test__step_timeout(self, monkeypatch):
         fake_task = pretend.stub(
-            status="STARTED",
-            revoke=pretend.call_recorder(lambda **kw: None),
+            status="STARTED", revoke=pretend.call_recorder(lambda **kw: None)
         )
-        bootstrap.repository_metadata.AsyncResult = pretend.call_recorder(
-            lambda *a: fake_task
-        )
-        bootstrap.release_bootstrap_lock = pretend.call_recorder(lambda: None)
+        (
+            watcher,
+            fake_redis,
+            _,
+            _,
+            mocked_release_bootstrap_lock,
+        ) = self._setup(monkeypatch, fake_task, {"task_id": 999})
 
-        result = bootstrap._check_bootstrap_status("fake_task_id", 2)
+        watcher._step()
 
-        assert result is None
-        assert len(bootstrap.repository_metadata.AsyncResult.calls) > 1
+        assert fake_redis.watches == {}
         assert fake_task.revoke.calls == [pretend.call(terminate=True)]
-        assert bootstrap.release_bootstrap_lock.calls == [pretend.call()]
+        assert mocked_release_bootstrap_lock.calls == [pretend.call("task_id")]
+
+    def test__step_lease_held_by_other_replica(self, monkeypatch):
+        fake_task = pretend.stub(status="SUCCESS")
+        (
+            watcher,
+            fake_redis,
+            _,
+            mocked_repository_metadata,
+            _,
+        ) = self._setup(
+            monkeypatch, fake_task, {"task_id": 1300}, lease="other"
+        )
+
+        watcher._step()
+
+        assert fake_redis.lease == "other"
+        assert fake_redis.watches == {"task_id": 1300}
+        assert mocked_repository_metadata.AsyncResult.calls == []
+        assert watcher._stop.wait.calls == [
+            pretend.call(bootstrap.BOOTSTRAP_CHECK_INTERVAL)
+        ]
+        assert _sample("leader") == 0
+        assert _sample("watched_tasks") == 1
+
+        # the other replica is gone, the lease expired
+        fake_redis.lease = None
+        watcher._step()
+
+        assert fake_redis.watches == {}
+        assert mocked_repository_metadata.AsyncResult.calls == [
+            pretend.call("task_id")
+        ]
+
+    def test__run(self, monkeypatch):
+        fake_task = pretend.stub(status="SUCCESS")
+        watcher, fake_redis, *_ = self._setup(monkeypatch, fake_task)
+        steps = []
+
+        def fake_step():
+            steps.append(_sample("running"))
+            if len(steps) == 1:
+                raise ConnectionError("Redis is down")
+            watcher._leader = True
+            fake_redis.lease = watcher._id
+            watcher._stop = pretend.stub(is_set=lambda: True)
+
+        watcher._step = fake_step
+
+        watcher._run()
+
+        assert steps == [1, 1]
+        assert fake_redis.lease is None
+        assert _sample("leader") == 0
+        assert _sample("running") == 0
+
+    def test__run_error(self, monkeypatch):
+        fake_task = pretend.stub(status="SUCCESS")
+        watcher, *_ = self._setup(monkeypatch, fake_task)
+
+        def fake_step():
+            watcher._stop.is_set = lambda: True
+            raise ConnectionError("Redis is down")
+
+        watcher._step = fake_step
+        errors = _sample("errors_total")
+
+        watcher._run()
+
+        assert watcher._stop.wait.calls == [
+            pretend.call(bootstrap.BOOTSTRAP_CHECK_INTERVAL)
+        ]
+        assert _sample("errors_total") == errors + 1
@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: 2023 Repository Service for TUF Contributors
+# SPDX-FileCopyrightText: 2022-2023 VMware Inc
+#
+# SPDX-License-Identifier: MIT
+import json
+
+from repository_service_tuf_api import common_models
+
+
+class TestExamples:
+    def test_load_example(self):
+        with open("tests/data_examples/config/settings.json") as f:
+            expected = json.load(f)
+
+        common_models.load_example.cache_clear()
+        result = common_models.load_example("config/settings.json")
+
+        assert result == expected
+        assert common_models.load_example("config/settings.json") is result
+
+    def test_load_example_not_available(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(common_models, "EXAMPLES_DIR", tmp_path)
+        common_models.load_example.cache_clear()
+
+        assert common_models.load_example("config/settings.json") is None
+        common_models.load_example.cache_clear()
+
+    def test_example_schema(self, monkeypatch):
+        monkeypatch.setattr(
+            common_models, "load_example", lambda name: {"name": name}
+        )
+        schema = {}
+
+        common_models.example_schema("example.json")(schema)
+
+        assert schema == {"example": {"name": "example.json"}}
+
+    def test_example_schema_build(self, monkeypatch):
+        monkeypatch.setattr(
+            common_models, "load_example", lambda name: {"name": name}
+        )
+        schema = {}
+
+        common_models.example_schema("example.json", lambda e: {"data": e})(
+            schema
+        )
+
+        assert schema == {"example": {"data": {"name": "example.json"}}}
+
+    def test_example_schema_not_available(self, monkeypatch):
+        monkeypatch.setattr(common_models, "load_example", lambda name: None)
+        schema = {}
+
+        common_models.example_schema("example.json")(schema)
+
+        assert schema == {}
@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+import pretend
+from pydantic import BaseModel
+
+from repository_service_tuf_api import conditional
+
+
+class FakeModel(BaseModel):
+    message: str
+    data: dict | None = None
+
+
+class TestConditional:
+    def test_etag(self):
+        tag = conditional.etag(b"content")
+
+        assert tag.startswith('"') and tag.endswith('"')
+        assert tag == conditional.etag(b"content")
+        assert tag != conditional.etag(b"other content")
+
+    def test_etag_matches(self):
+        tag = '"abc"'
+
+        assert conditional.etag_matches('"abc"', tag) is True
+        assert conditional.etag_matches('W/"abc"', tag) is True
+        assert conditional.etag_matches('"xyz", "abc"', tag) is True
+        assert conditional.etag_matches("*", tag) is True
+        assert conditional.etag_matches('"xyz"', tag) is False
+        assert conditional.etag_matches("abc", tag) is False
+        assert conditional.etag_matches(None, tag) is False
+        assert conditional.etag_matches("", tag) is False
+
+    def test_conditional_response(self):
+        model = FakeModel(message="msg")
+        request = pretend.stub(headers={})
+
+        response = conditional.conditional_response(
+            request, "fake", lambda: model
+        )
+
+        assert response.status_code == 200
+        assert response.body == b'{"message":"msg"}'
+        assert response.headers["etag"] == conditional.etag(response.body)
+        assert response.headers["cache-control"] == "no-cache"
+        assert response.media_type == "application/json"
+
+    def test_conditional_response_not_modified(self):
+        model = FakeModel(message="msg")
+        tag = conditional.etag(b'{"message":"msg"}')
+        request = pretend.stub(headers={"if-none-match": tag})
+
+        response = conditional.conditional_response(
+            request, "fake", lambda: model
+        )
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == tag
+
+    def _version(self, monkeypatch, version):
+        monkeypatch.setattr(
+            conditional,
+            "settings",
+            pretend.stub(get=lambda k, d=None: k == "SETTINGS_SNAPSHOT_CACHE"),
+        )
+        monkeypatch.setattr(
+            conditional, "response_body_cache", conditional.ResponseBodyCache()
+        )
+        fake_version = pretend.call_recorder(lambda: version)
+        monkeypatch.setattr(
+            conditional, "repository_settings_version", fake_version
+        )
+        fake_build = pretend.call_recorder(lambda: FakeModel(message="msg"))
+
+        return fake_version, fake_build
+
+    def test_conditional_response_version(self, monkeypatch):
+        fake_version, fake_build = self._version(monkeypatch, 7)
+        request = pretend.stub(headers={"if-none-match": '"fake-6"'})
+
+        first = conditional.conditional_response(request, "fake", fake_build)
+        second = conditional.conditional_response(request, "fake", fake_build)
+
+        for response in [first, second]:
+            assert response.status_code == 200
+            assert response.body == b'{"message":"msg"}'
+            assert response.headers["etag"] == '"fake-7"'
+        # the body is serialized once by version
+        assert fake_build.calls == [pretend.call()]
+        assert fake_version.calls == [pretend.call(), pretend.call()]
+
+    def test_conditional_response_version_not_modified(self, monkeypatch):
+        _, fake_build = self._version(monkeypatch, 7)
+        request = pretend.stub(headers={"if-none-match": '"fake-7"'})
+
+        response = conditional.conditional_response(
+            request, "fake", fake_build
+        )
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == '"fake-7"'
+        # not built, nor serialized
+        assert fake_build.calls == []
+
+    def test_response_body_cache(self):
+        cache = conditional.ResponseBodyCache()
+
+        assert cache.get("fake", 2, lambda: FakeModel(message="2")) == (
+            b'{"message":"2"}'
+        )
+        # an older version does not replace the cached body
+        assert cache.get("fake", 1, lambda: FakeModel(message="1")) == (
+            b'{"message":"1"}'
+        )
+        assert cache.get("fake", 2, lambda: FakeModel(message="x")) == (
+            b'{"message":"2"}'
+        )
+        assert cache.get("other", 2, lambda: FakeModel(message="o")) == (
+            b'{"message":"o"}'
+        )
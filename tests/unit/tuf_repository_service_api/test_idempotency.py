@@ -0,0 +1,272 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+import asyncio
+import hashlib
+import json
+
+import pretend
+from fastapi import status
+
+from repository_service_tuf_api import idempotency
+
+ARTIFACTS_URL = "/api/v1/artifacts/"
+ARTIFACTS_STREAM_URL = "/api/v1/artifacts/stream"
+BULK_URL = "/api/v1/task/bulk"
+MOCK_PATH = "repository_service_tuf_api.artifacts"
+
+
+class FakeAsyncRedis:
+    def __init__(self):
+        self.data = {}
+        self.ttl = {}
+        self.renewed = []
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        self.ttl[key] = ex
+        return True
+
+    async def expire(self, key, ex):
+        self.renewed.append((key, ex))
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class TestIdempotency:
+    def _setup(self, monkeypatch, bootstrap=True):
+        fake_redis = FakeAsyncRedis()
+        monkeypatch.setattr(
+            idempotency, "settings_repository_async", lambda: fake_redis
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.bootstrap_state",
+            lambda *a: pretend.stub(bootstrap=bootstrap, state=None),
+        )
+        mocked_repository_metadata = pretend.stub(
+            apply_async=pretend.call_recorder(lambda **kw: None)
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.repository_metadata", mocked_repository_metadata
+        )
+
+        return fake_redis, mocked_repository_metadata
+
+    def _payload(self):
+        with open("tests/data_examples/artifacts/add_payload.json") as f:
+            return json.load(f)
+
+    def test_retry_replays_response(self, monkeypatch, test_client):
+        fake_redis, mocked_repository_metadata = self._setup(monkeypatch)
+        headers = {"Idempotency-Key": "key-1"}
+
+        response = test_client.post(
+            ARTIFACTS_URL, json=self._payload(), headers=headers
+        )
+        retry = test_client.post(
+            ARTIFACTS_URL, json=self._payload(), headers=headers
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert retry.status_code == status.HTTP_202_ACCEPTED
+        assert retry.json() == response.json()
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in response.headers
+        assert len(mocked_repository_metadata.apply_async.calls) == 1
+        redis_key = idempotency.idempotency_key("POST", ARTIFACTS_URL, "key-1")
+        assert fake_redis.ttl[redis_key] == idempotency.IDEMPOTENCY_TTL
+
+    def test_retry_different_body(self, monkeypatch, test_client):
+        fake_redis, mocked_repository_metadata = self._setup(monkeypatch)
+        headers = {"Idempotency-Key": "key-1"}
+        payload = self._payload()
+
+        response = test_client.post(
+            ARTIFACTS_URL, json=payload, headers=headers
+        )
+        payload["artifacts"][0]["path"] = "other/path"
+        retry = test_client.post(ARTIFACTS_URL, json=payload, headers=headers)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert retry.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert retry.json() == {
+            "detail": {
+                "message": "Request not accepted.",
+                "error": "Idempotency-Key already used with a different body",
+            }
+        }
+        assert "idempotent-replayed" not in retry.headers
+        assert len(mocked_repository_metadata.apply_async.calls) == 1
+        # the original response is kept
+        redis_key = idempotency.idempotency_key("POST", ARTIFACTS_URL, "key-1")
+        assert json.loads(fake_redis.data[redis_key])["status"] == 202
+
+    def test_different_keys(self, monkeypatch, test_client):
+        _, mocked_repository_metadata = self._setup(monkeypatch)
+
+        for key in ["key-1", "key-2"]:
+            response = test_client.post(
+                ARTIFACTS_URL,
+                json=self._payload(),
+                headers={"Idempotency-Key": key},
+            )
+            assert response.status_code == status.HTTP_202_ACCEPTED
+
+        assert len(mocked_repository_metadata.apply_async.calls) == 2
+
+    def test_without_key(self, monkeypatch, test_client):
+        fake_redis, mocked_repository_metadata = self._setup(monkeypatch)
+
+        test_client.post(ARTIFACTS_URL, json=self._payload())
+        test_client.post(ARTIFACTS_URL, json=self._payload())
+
+        assert len(mocked_repository_metadata.apply_async.calls) == 2
+        assert fake_redis.data == {}
+
+    def test_not_accepted_releases_key(self, monkeypatch, test_client):
+        fake_redis, _ = self._setup(monkeypatch, bootstrap=False)
+
+        response = test_client.post(
+            ARTIFACTS_URL,
+            json=self._payload(),
+            headers={"Idempotency-Key": "key-1"},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert fake_redis.data == {}
+
+    def test_in_progress(self, monkeypatch, test_client):
+        fake_redis, mocked_repository_metadata = self._setup(monkeypatch)
+        redis_key = idempotency.idempotency_key("POST", ARTIFACTS_URL, "key-1")
+        fake_redis.data[redis_key] = b""
+
+        response = test_client.post(
+            ARTIFACTS_URL,
+            json=self._payload(),
+            headers={"Idempotency-Key": "key-1"},
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.json() == {
+            "detail": {
+                "message": "Request not accepted.",
+                "error": (
+                    "A request with the same Idempotency-Key is in progress"
+                ),
+            }
+        }
+        assert mocked_repository_metadata.apply_async.calls == []
+        assert fake_redis.data[redis_key] == b""
+
+    def test_not_task_route(self, monkeypatch, test_client):
+        fake_redis, _ = self._setup(monkeypatch)
+
+        response = test_client.post(
+            BULK_URL, json={}, headers={"Idempotency-Key": "key-1"}
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert fake_redis.ttl == {}
+
+    def test_stream_partial_failure_stores_response(
+        self, monkeypatch, test_client, async_return
+    ):
+        fake_redis, mocked_repository_metadata = self._setup(monkeypatch)
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.bootstrap_state_async",
+            async_return(pretend.stub(bootstrap=True, state=None)),
+        )
+        monkeypatch.setattr(
+            f"{MOCK_PATH}.settings",
+            pretend.stub(
+                get=lambda k, d=None: {"ARTIFACTS_STREAM_CHUNK_SIZE": 1}.get(
+                    k, d
+                )
+            ),
+        )
+        monkeypatch.setattr(f"{MOCK_PATH}.get_task_id", lambda: "task-1")
+        artifact = {"info": {"length": 1, "hashes": {"a": "1"}}, "path": "a"}
+        body = f'{json.dumps(artifact)}\n{{"path": "b"}}'.encode()
+        headers = {"Idempotency-Key": "key-1"}
+
+        response = test_client.post(
+            ARTIFACTS_STREAM_URL, content=body, headers=headers
+        )
+        retry = test_client.post(
+            ARTIFACTS_STREAM_URL, content=body, headers=headers
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"]["task_ids"] == ["task-1"]
+        assert retry.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert retry.json() == response.json()
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert len(mocked_repository_metadata.apply_async.calls) == 1
+
+    def test_lock_renewed(self, monkeypatch):
+        fake_redis = FakeAsyncRedis()
+        monkeypatch.setattr(
+            idempotency, "settings_repository_async", lambda: fake_redis
+        )
+        monkeypatch.setattr(
+            idempotency,
+            "settings",
+            pretend.stub(
+                get=lambda k, d=None: {"IDEMPOTENCY_LOCK_TTL": 0.03}.get(k, d)
+            ),
+        )
+        monkeypatch.setattr(
+            idempotency, "IDEMPOTENT_ROUTES", {("POST", "/fake")}
+        )
+        sent = []
+
+        async def fake_app(scope, receive, send):
+            await asyncio.sleep(0.05)
+            await send({"type": "http.response.start", "status": 202})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        async def fake_send(message):
+            sent.append(message)
+
+        async def fake_receive():
+            return {"type": "http.request", "body": b"{}"}
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/fake",
+            "headers": [(b"idempotency-key", b"key-1")],
+        }
+        middleware = idempotency.IdempotencyMiddleware(fake_app)
+
+        asyncio.run(middleware(scope, fake_receive, fake_send))
+
+        redis_key = idempotency.idempotency_key("POST", "/fake", "key-1")
+        assert len(fake_redis.renewed) >= 1
+        assert set(fake_redis.renewed) == {(redis_key, 0.03)}
+        assert json.loads(fake_redis.data[redis_key]) == {
+            "status": 202,
+            "body": "{}",
+            "digest": hashlib.sha256(b"{}").hexdigest(),
+        }
+        assert len(sent) == 2
+
+    def test_register_idempotent_route(self, monkeypatch):
+        monkeypatch.setattr(idempotency, "IDEMPOTENT_ROUTES", set())
+        task_route = pretend.stub(
+            status_code=202, methods={"POST"}, path="/task"
+        )
+        read_route = pretend.stub(
+            status_code=200, methods={"POST"}, path="/read"
+        )
+
+        idempotency.register_idempotent_route(task_route, "/api/v1")
+        idempotency.register_idempotent_route(read_route, "/api/v1")
+
+        assert idempotency.IDEMPOTENT_ROUTES == {("POST", "/api/v1/task")}
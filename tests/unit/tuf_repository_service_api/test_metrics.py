@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+import pretend
+from fastapi import status
+from prometheus_client import REGISTRY
+
+from repository_service_tuf_api import artifacts, metrics
+
+
+def _count(name, **labels):
+    return REGISTRY.get_sample_value(f"{name}_count", labels) or 0
+
+
+class TestMetrics:
+    def test_request_duration(self, test_client, monkeypatch):
+        mocked_bootstrap_state = pretend.call_recorder(
+            lambda *a: pretend.stub(bootstrap=False, state=None)
+        )
+        monkeypatch.setattr(
+            "repository_service_tuf_api.artifacts.bootstrap_state",
+            mocked_bootstrap_state,
+        )
+        labels = {
+            "method": "POST",
+            "route": "/api/v1/artifacts/",
+            "status": "404",
+        }
+        before = _count("rstuf_api_request_duration_seconds", **labels)
+
+        test_client.post(
+            "/api/v1/artifacts/", json={"artifacts": [], "other": "x"}
+        )
+
+        assert (
+            _count("rstuf_api_request_duration_seconds", **labels)
+            == before + 1
+        )
+
+    def test_request_duration_unmatched(self, test_client):
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = _count("rstuf_api_request_duration_seconds", **labels)
+
+        test_client.get("/invalid_url")
+
+        assert (
+            _count("rstuf_api_request_duration_seconds", **labels)
+            == before + 1
+        )
+
+    def test_validation_duration(self):
+        before = _count(
+            "rstuf_api_validation_duration_seconds", model="AddPayload"
+        )
+
+        artifacts.AddPayload(artifacts=[])
+
+        assert (
+            _count("rstuf_api_validation_duration_seconds", model="AddPayload")
+            == before + 1
+        )
+
+    def test_metrics(self, test_client):
+        response = test_client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "rstuf_api_request_duration_seconds" in response.text
+        assert "rstuf_api_celery_publish_duration_seconds" in response.text
+
+    def test_metrics_multiprocess(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        fake_collector = pretend.call_recorder(lambda registry: None)
+        monkeypatch.setattr(
+            metrics.multiprocess, "MultiProcessCollector", fake_collector
+        )
+
+        response = metrics.metrics(pretend.stub())
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(fake_collector.calls) == 1
+        assert b"rstuf_api_request_duration_seconds" not in response.body
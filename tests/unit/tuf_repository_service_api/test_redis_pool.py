@@ -0,0 +1,183 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+import asyncio
+import os
+
+import pretend
+import pytest
+import redis
+from prometheus_client import REGISTRY
+
+from repository_service_tuf_api import redis_pool
+
+
+class FakeConnection:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.pid = os.getpid()
+        self.fail = kwargs.get("fail", False)
+
+    def connect(self):
+        if self.fail:
+            raise redis.ConnectionError("refused")
+
+    def can_read(self):
+        return False
+
+    def should_reconnect(self):
+        return False
+
+    def disconnect(self):
+        pass
+
+
+def _connections(pool, state):
+    return REGISTRY.get_sample_value(
+        "rstuf_api_redis_pool_connections", {"pool": pool, "state": state}
+    )
+
+
+class TestRedisPoolConfig:
+    def test_from_settings(self):
+        fake_settings = pretend.stub(
+            REDIS_SERVER="redis://redis-host",
+            get=lambda k, d=None: {
+                "REDIS_POOL_MAX_CONNECTIONS": 10,
+                "REDIS_SOCKET_TIMEOUT": 3,
+            }.get(k, d),
+        )
+
+        config = redis_pool.RedisPoolConfig.from_settings(fake_settings)
+
+        assert config == redis_pool.RedisPoolConfig(
+            host="redis-host",
+            port=6379,
+            unix_socket_path=None,
+            max_connections=10,
+            timeout=5,
+            socket_timeout=3,
+            socket_connect_timeout=5,
+            health_check_interval=30,
+        )
+        assert config.pool_kwargs(1, True) == {
+            "max_connections": 10,
+            "timeout": 5,
+            "db": 1,
+            "decode_responses": True,
+            "socket_timeout": 3,
+            "socket_connect_timeout": 5,
+            "health_check_interval": 30,
+            "host": "redis-host",
+            "port": 6379,
+        }
+
+    def test_pool_kwargs_unix_socket(self):
+        config = redis_pool.RedisPoolConfig(
+            host="redis-host", unix_socket_path="/run/redis.sock"
+        )
+
+        kwargs = config.pool_kwargs(0, False)
+
+        assert kwargs["path"] == "/run/redis.sock"
+        assert "host" not in kwargs
+        assert "port" not in kwargs
+
+
+class TestRedisPools:
+    def test_pool_and_client(self):
+        pools = redis_pool.RedisPools(redis_pool.RedisPoolConfig("redis"))
+
+        pool = pools.pool(1, decode_responses=True)
+
+        assert pools.pool(1, decode_responses=True) is pool
+        assert pools.pool(1) is not pool
+        assert isinstance(pool, redis_pool.MeteredBlockingConnectionPool)
+        assert pool.name == "db1"
+        assert pool.max_connections == 50
+        assert pool.connection_kwargs["host"] == "redis"
+        assert pool.connection_kwargs["decode_responses"] is True
+        client = pools.client(1, decode_responses=True)
+        assert client.connection_pool is pool
+        assert pools.client(1, decode_responses=True) is client
+
+    def test_pool_unix_socket(self):
+        pools = redis_pool.RedisPools(
+            redis_pool.RedisPoolConfig("redis", unix_socket_path="/redis.sock")
+        )
+
+        pool = pools.pool(0)
+
+        assert pool.connection_class is redis.UnixDomainSocketConnection
+        assert pool.connection_kwargs["path"] == "/redis.sock"
+
+    def test_async_client_by_event_loop(self):
+        pools = redis_pool.RedisPools(redis_pool.RedisPoolConfig("redis"))
+
+        async def get_clients():
+            return pools.async_client(0), pools.async_client(0)
+
+        first, second = asyncio.run(get_clients())
+        third, _ = asyncio.run(get_clients())
+
+        assert first is second
+        assert first is not third
+        assert first.connection_pool is not third.connection_pool
+        assert first.connection_pool.name == "db0-async"
+
+
+class TestMeteredBlockingConnectionPool:
+    def test_connections(self):
+        pool = redis_pool.MeteredBlockingConnectionPool(
+            name="test-sync", connection_class=FakeConnection, timeout=0.01
+        )
+
+        first = pool.get_connection()
+        second = pool.get_connection()
+        assert _connections("test-sync", "open") == 2
+        assert _connections("test-sync", "in_use") == 2
+
+        pool.release(first)
+        assert pool.get_connection() is first
+        pool.release(first)
+        pool.release(second)
+        assert _connections("test-sync", "open") == 2
+        assert _connections("test-sync", "in_use") == 0
+
+        pool.reset()
+        assert _connections("test-sync", "open") == 0
+
+    def test_connection_failure(self):
+        pool = redis_pool.MeteredBlockingConnectionPool(
+            name="test-sync-failure",
+            connection_class=FakeConnection,
+            fail=True,
+        )
+
+        with pytest.raises(redis.ConnectionError):
+            pool.get_connection()
+
+        assert _connections("test-sync-failure", "open") == 1
+        # released without being given
+        assert _connections("test-sync-failure", "in_use") is None
+
+    def test_no_connection_available(self):
+        pool = redis_pool.MeteredBlockingConnectionPool(
+            name="test-sync-full",
+            connection_class=FakeConnection,
+            max_connections=1,
+            timeout=0.01,
+        )
+        pool.get_connection()
+
+        with pytest.raises(redis.ConnectionError):
+            pool.get_connection()
+
+        assert _connections("test-sync-full", "in_use") == 1
+        assert (
+            REGISTRY.get_sample_value(
+                "rstuf_api_redis_pool_wait_duration_seconds_count",
+                {"pool": "test-sync-full"},
+            )
+            == 2
+        )
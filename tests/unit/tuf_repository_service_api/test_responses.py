@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+import pretend
+import pytest
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+
+from repository_service_tuf_api import responses
+
+
+class TestResponses:
+    def test_orjson_response(self):
+        pytest.importorskip("orjson")
+
+        response = responses.ORJSONResponse(
+            {"message": "Tasks state.", "data": {1: ["bins-0", None]}}
+        )
+
+        assert response.body == (
+            b'{"message":"Tasks state.","data":{"1":["bins-0",null]}}'
+        )
+        assert response.media_type == "application/json"
+
+    def test_default_response_class(self, monkeypatch):
+        monkeypatch.setattr(responses, "orjson", pretend.stub())
+
+        assert (
+            responses.default_response_class(True) is responses.ORJSONResponse
+        )
+
+    def test_default_response_class_disabled(self, monkeypatch):
+        monkeypatch.setattr(responses, "orjson", pretend.stub())
+
+        result = responses.default_response_class(False)
+
+        assert isinstance(result, DefaultPlaceholder)
+        assert result.value is JSONResponse
+
+    def test_default_response_class_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(responses, "orjson", None)
+        fake_logging = pretend.stub(
+            error=pretend.call_recorder(lambda m: None)
+        )
+        monkeypatch.setattr(responses, "logging", fake_logging)
+
+        result = responses.default_response_class(True)
+
+        assert isinstance(result, DefaultPlaceholder)
+        assert fake_logging.error.calls == [
+            pretend.call("ORJSON responses requires 'orjson', disabled")
+        ]
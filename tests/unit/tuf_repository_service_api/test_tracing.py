@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2026 Repository Service for TUF Contributors
+#
+# SPDX-License-Identifier: MIT
+import json
+
+import pretend
+from fastapi import status
+
+import repository_service_tuf_api
+from repository_service_tuf_api import tracing
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+class TestTracing:
+    def test_trace_context_propagated_to_task(self, monkeypatch, test_client):
+        with open("tests/data_examples/artifacts/add_payload.json") as f:
+            payload = json.load(f)
+
+        monkeypatch.setattr(
+            "repository_service_tuf_api.artifacts.bootstrap_state",
+            lambda *a: pretend.stub(bootstrap=True),
+        )
+        mocked_apply_async = pretend.call_recorder(
+            lambda self, args=None, kwargs=None, **options: None
+        )
+        monkeypatch.setattr(
+            repository_service_tuf_api.Task, "apply_async", mocked_apply_async
+        )
+
+        response = test_client.post(
+            "/api/v1/artifacts/",
+            json=payload,
+            headers={"traceparent": TRACEPARENT},
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert len(mocked_apply_async.calls) == 1
+        headers = mocked_apply_async.calls[0].kwargs["headers"]
+        assert headers["traceparent"].split("-")[1] == TRACE_ID
+
+    def test_publish_span_without_trace(self):
+        options = {"task_id": "id"}
+
+        with tracing.publish_span("task", "add_artifacts", options):
+            pass
+
+        assert options == {"task_id": "id"}
+
+    def test_publish_span_keeps_headers(self, monkeypatch):
+        monkeypatch.setattr(
+            tracing.propagate,
+            "inject",
+            lambda carrier: carrier.update({"traceparent": TRACEPARENT}),
+        )
+        options = {"headers": {"custom": "value"}}
+
+        with tracing.publish_span("task", "add_artifacts", options):
+            pass
+
+        assert options == {
+            "headers": {"custom": "value", "traceparent": TRACEPARENT}
+        }
+
+    def test_configure_tracing_disabled(self):
+        assert tracing.configure_tracing(None, "spans.json") is False
+
+    def test_configure_tracing_without_sdk(self, monkeypatch):
+        import builtins
+
+        real_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name.startswith("opentelemetry.sdk"):
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+
+        assert tracing.configure_tracing("file", "spans.json") is False